@@ -3,25 +3,35 @@
 # Description: Heart disease prediction page using a trained model with standardized input form and consistent UI design.
 
 import streamlit as st
-import numpy as np
-import joblib
-import os
+from model_registry import load_disease_artifacts, missing_artifacts
+import drift_monitor
+import metrics
+from attributions import show_attributions
+from batch_scoring import show_batch_scoring
+from fast_pipeline import get_pipeline
+from feature_schema import HEART_SCHEMA
+from fragments import cached_prediction, fragment, last_submission, remember_submission
+from prediction_history import record_prediction
+from scoring_executor import ExecutorBusy, get_executor, local_artifacts
+from what_if import show_what_if
+
+# Prediction step of the page (imputer, scaler and model in one pass); runs on the scoring executor
+def predict_heart_disease(input_data, artifacts=None):
+    artifacts = artifacts or load_disease_artifacts("heart")
+    labels, probabilities = get_pipeline(artifacts).predict(input_data)
+    return int(labels[0]), probabilities
 
 def show_heart_disease_page():
     # Check for model, scaler, and imputer files
-    model_path = "C:/Users/91787/Downloads/heart_disease_model.pkl"
-    scaler_path = "C:/Users/91787/Downloads/scaler_heart.pkl"
-    imputer_path = "C:/Users/91787/Downloads/imputer.pkl"
-    
-    if not all(os.path.exists(path) for path in [model_path, scaler_path, imputer_path]):
+    if missing_artifacts("heart"):
         st.error("⚠️ Model, scaler, or imputer file not found. Please ensure files are in the 'models' directory.")
         return
     
-    # Load model, scaler, and imputer
+    # Load model, scaler, and imputer (shared across sessions, loaded once per file version)
     try:
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
-        imputer = joblib.load(imputer_path)
+        with metrics.span("heart.load"):
+            artifacts = load_disease_artifacts("heart")
+        get_pipeline(artifacts)
     except Exception as e:
         st.error(f"Error loading model, scaler, or imputer: {str(e)}")
         return
@@ -30,55 +40,84 @@ def show_heart_disease_page():
     st.markdown("<h1 style='text-align: center; color: #2E86C1;'>Heart Disease Prediction</h1>", unsafe_allow_html=True)
 
 
-    # Input form
-    with st.form(key="heart_disease_form"):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            age = st.number_input("Age (years)", min_value=0, max_value=120, value=50, help="Age in years")
-            sex = st.selectbox("Gender", [0, 1], format_func=lambda x: "Female" if x == 0 else "Male", help="Biological sex")
-            cp = st.selectbox("Chest Pain Type", [0, 1, 2, 3], format_func=lambda x: ["None", "Typical Angina", "Atypical Angina", "Asymptomatic"][x], help="Type of chest pain")
-            trestbps = st.number_input("Resting Blood Pressure (mm Hg)", min_value=0, value=120, help="Resting blood pressure")
-            chol = st.number_input("Cholesterol (mg/dl)", min_value=0, value=200, help="Serum cholesterol")
-            fbs = st.selectbox("Fasting Blood Sugar", [0, 1], format_func=lambda x: "Normal" if x == 0 else "High (>120 mg/dl)", help="Fasting blood sugar level")
-            restecg = st.selectbox("Resting ECG Result", [0, 1, 2], format_func=lambda x: ["Normal", "ST-T Wave Abnormality", "Left Ventricular Hypertrophy"][x], help="Electrocardiogram result")
-     
-        with col2:
-            thalach = st.number_input("Max Heart Rate", min_value=0, value=150, help="Maximum heart rate achieved")
-            exang = st.selectbox("Exercise-Induced Chest Pain", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", help="Chest pain during exercise")
-            oldpeak = st.number_input("ST Depression", min_value=0.0, max_value=10.0, value=1.0, step=0.1, help="ST depression induced by exercise")
-            slope = st.selectbox("ST Segment Slope", [0, 1, 2], format_func=lambda x: ["Upsloping", "Flat", "Downsloping"][x], help="Slope of the peak exercise ST segment")
-            ca = st.number_input("Major Vessels Blocked (0-4)", min_value=0, max_value=4, value=0, help="Number of major vessels colored by fluoroscopy")
-            thal = st.selectbox("Thalassemia Result", [0, 1, 2, 3], format_func=lambda x: ["Not Tested", "Normal", "Fixed Defect", "Reversible Defect"][x], help="Thalassemia test result")
-        
-        submit = st.form_submit_button("🔍 Predict", use_container_width=True)
+    # Form, result and what-if panel rerun on their own when submitted or adjusted
+    show_heart_disease_prediction()
+    
+    # Bulk scoring for many patient records at once
+    show_batch_scoring("heart", artifacts)
+
+@fragment
+def show_heart_disease_prediction():
+    with metrics.span("heart.fragment"):
+        # Loaded here rather than passed in: a fragment-only rerun after a model reload uses the new model throughout
+        try:
+            artifacts = load_disease_artifacts("heart")
+        except Exception as e:
+            st.error(f"Error loading model, scaler, or imputer: {str(e)}")
+            return
+        result = None
+        # Input form
+        with st.form(key="heart_disease_form"):
+            # Widgets, categorical codes and column order all come from the feature schema
+            values = HEART_SCHEMA.render_form(n_columns=2, key_prefix="heart_")
+            
+            submit = st.form_submit_button("🔍 Predict", use_container_width=True)
+            
+            if submit:
+                remember_submission("heart")
+                errors = HEART_SCHEMA.validate(values)
+                if errors:
+                    st.error(" ".join(errors))
+                else:
+                    try:
+                        input_data = HEART_SCHEMA.to_array(values)
+                        with metrics.span("heart.predict"), st.spinner("⏳ Scoring..."):
+                            result = cached_prediction("heart", artifacts, input_data, get_executor().run, predict_heart_disease, input_data, local_artifacts(artifacts))
+                        metrics.increment("heart.prediction")
+                        # Saved by the background history writer, off the request path
+                        record_prediction(st.session_state.get("username"), "heart", values, result[0], result[1][0])
+                        drift_monitor.observe("heart", artifacts, input_data)
+                        remember_submission("heart", input_data)
+                    except ExecutorBusy as e:
+                        st.warning(f"⏳ {str(e)}")
+                    except Exception as e:
+                        st.error(f"Prediction error: {str(e)}")
         
-        if submit:
+        # Result of the last submission; other reruns redraw it from the result cache
+        input_data = last_submission("heart")
+        if input_data is not None:
             try:
-                input_data = np.array([[age, sex, cp, trestbps, chol, fbs, restecg, thalach, exang, oldpeak, slope, ca, thal]])
-                input_data_imputed = imputer.transform(input_data)
-                input_data_scaled = scaler.transform(input_data_imputed)
-                prediction = model.predict(input_data_scaled)[0]
-                probability = model.predict_proba(input_data_scaled)[0][prediction] * 100
-                result = "🟥 High Risk (Heart Disease)" if prediction == 1 else "🟩 Low Risk (No Heart Disease)"
-                color = "#C0392B" if prediction == 1 else "#27AE60"
-                
-                st.markdown(
-                    f"<div style='text-align: center; margin-top: 20px;'>"
-                    f"<h3 style='color: {color};'>Prediction: {result}</h3>"
-                    f"<p style='font-size: 18px;'>Confidence: <strong>{probability:.1f}%</strong></p>"
-                    "</div>",
-                    unsafe_allow_html=True
-                )
-                
-                with st.expander("🔎 What This Means"):
-                    if prediction == 1:
-                        st.error("High risk of heart disease. Please consult a cardiologist.")
-                    else:
-                        st.success("Low risk of heart disease. Maintain a healthy lifestyle.")
-                
-                with st.expander("📊 Detailed Probabilities"):
-                    st.write(f"Probability of No Heart Disease: **{model.predict_proba(input_data_scaled)[0][0]*100:.1f}%**")
-                    st.write(f"Probability of Heart Disease: **{model.predict_proba(input_data_scaled)[0][1]*100:.1f}%**")
+                if result is None:
+                    result = cached_prediction("heart", artifacts, input_data, get_executor().run, predict_heart_disease, input_data, local_artifacts(artifacts))
+                show_heart_disease_result(artifacts, input_data, *result)
+            except ExecutorBusy as e:
+                st.warning(f"⏳ {str(e)}")
             except Exception as e:
-                st.error(f"Prediction error: {str(e)}")
\ No newline at end of file
+                st.error(f"Prediction error: {str(e)}")
+        
+        # What-if sweeps around the last submitted input
+        show_what_if("heart", artifacts)
+
+def show_heart_disease_result(artifacts, input_data, prediction, probabilities):
+    probability = probabilities[0][prediction] * 100
+    result = "🟥 High Risk (Heart Disease)" if prediction == 1 else "🟩 Low Risk (No Heart Disease)"
+    color = "#C0392B" if prediction == 1 else "#27AE60"
+    
+    st.markdown(
+        f"<div style='text-align: center; margin-top: 20px;'>"
+        f"<h3 style='color: {color};'>Prediction: {result}</h3>"
+        f"<p style='font-size: 18px;'>Confidence: <strong>{probability:.1f}%</strong></p>"
+        "</div>",
+        unsafe_allow_html=True
+    )
+    
+    with st.expander("🔎 What This Means"):
+        if prediction == 1:
+            st.error("High risk of heart disease. Please consult a cardiologist.")
+        else:
+            st.success("Low risk of heart disease. Maintain a healthy lifestyle.")
+        show_attributions("heart", artifacts, input_data)
+    
+    with st.expander("📊 Detailed Probabilities"):
+        st.write(f"Probability of No Heart Disease: **{probabilities[0][0]*100:.1f}%**")
+        st.write(f"Probability of Heart Disease: **{probabilities[0][1]*100:.1f}%**")
@@ -1,82 +1,39 @@
 import streamlit as st
-import sqlite3
-import hashlib
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 import re
+from account_store import get_store
+from email_outbox import enqueue, get_worker
+import metrics
 
-# Database initialization
+# Database initialization (also starts the outbox worker that sends queued emails)
 def init_db():
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS users 
-                 (username TEXT PRIMARY KEY, email TEXT UNIQUE, password TEXT)''')
-    conn.commit()
-    conn.close()
-
-# Hash password
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    get_worker()
+    return get_store()
 
 # Validate email format
 def is_valid_email(email):
     pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     return re.match(pattern, email) is not None
 
-# Send email notification
-def send_email(to_email, username):
-    sender_email = "prajapatinikhil201@gmail.com"  # Replace with your email
-    sender_password = "Nikhil@201"  # Replace with your app-specific password
-    
+# Queue email notification (sent by the outbox worker; SMTP settings live in email_outbox.py)
+def send_email(conn, to_email, username):
     subject = "Welcome to Our Platform!"
     body = f"Dear {username},\n\nThank you for registering with us!\nYour account has been successfully created.\n\nBest regards,\nThe Team"
-    
-    msg = MIMEMultipart()
-    msg['From'] = sender_email
-    msg['To'] = to_email
-    msg['Subject'] = subject
-    msg.attach(MIMEText(body, 'plain'))
-    
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        server.send_message(msg)
-        server.quit()
-        return True
-    except Exception as e:
-        st.error(f"Failed to send email: {str(e)}")
-        return False
+    enqueue(conn, to_email, subject, body)
 
-# Register user
+# Register user (account and welcome email commit together, then the worker is woken)
 def register_user(username, email, password):
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    
-    try:
-        c.execute("INSERT INTO users (username, email, password) VALUES (?, ?, ?)",
-                 (username, email, hash_password(password)))
-        conn.commit()
-        send_email(email, username)
-        return True
-    except sqlite3.IntegrityError:
+    worker = get_worker()
+    with metrics.span("auth.register"):
+        created = get_store().create_user(username, password, email, after_insert=lambda conn: send_email(conn, email, username))
+    if not created:
         return False
-    finally:
-        conn.close()
+    worker.notify()
+    return True
 
 # Login user
 def login_user(username, password):
-    conn = sqlite3.connect('users.db')
-    c = conn.cursor()
-    
-    c.execute("SELECT password FROM users WHERE username = ?", (username,))
-    result = c.fetchone()
-    conn.close()
-    
-    if result and result[0] == hash_password(password):
-        return True
-    return False
+    with metrics.span("auth.login"):
+        return get_store().verify_login(username, password)
 
 # Main Streamlit app
 def main():
@@ -118,7 +75,7 @@ def main():
                     st.error("Password must be at least 6 characters long")
                 else:
                     if register_user(new_username, new_email, new_password):
-                        st.success("Registration successful! Email notification sent.")
+                        st.success("Registration successful! A confirmation email is on its way.")
                         st.info("Please login to continue")
                     else:
                         st.error("Username or email already exists")
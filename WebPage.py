@@ -1,14 +1,20 @@
-
-import streamlit as st
+import time
+_script_start = time.perf_counter()
 import json
-import hashlib
 import os
-from main import show_diabetes_page
-from Heart_Disease.Heart_Disease import show_heart_disease_page
-from Parkinsons import show_parkinsons_page
+import streamlit as st
+from account_store import get_store
+import metrics
+import page_registry
+from prediction_history import FIRST_PAGE, get_history
+
+# Disease pages (and pandas/numpy/sklearn) are imported on first use through page_registry
+clock = page_registry.PhaseClock(_script_start)
+clock.lap("imports")
 
 # Streamlit configuration
 st.set_page_config(page_title="Disease Prediction System", layout="wide", page_icon="🏥")
+clock.lap("page config")
 
 # Initialize session state
 if 'logged_in' not in st.session_state:
@@ -16,22 +22,14 @@ if 'logged_in' not in st.session_state:
 if 'username' not in st.session_state:
     st.session_state.username = ""
 
-# Users file setup
-USER_FILE = "users.json"
-if not os.path.exists(USER_FILE):
-    with open(USER_FILE, "w") as f:
-        json.dump({}, f)
-
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def load_users():
-    with open(USER_FILE, "r") as f:
-        return json.load(f)
+# Account store (shared with Register.py; imports users.json on first run)
+store = get_store()
+clock.lap("account store")
 
-def save_users(users):
-    with open(USER_FILE, "w") as f:
-        json.dump(users, f)
+# Admin users (comma-separated DPS_ADMIN_USERS) can see the metrics and drift panels
+ADMIN_USERS = {name.strip() for name in os.environ.get("DPS_ADMIN_USERS", "").split(",") if name.strip()}
+is_admin = st.session_state.logged_in and st.session_state.username in ADMIN_USERS
+metrics.start_http_server()
 
 # Sidebar navigation
 with st.sidebar:
@@ -44,7 +42,11 @@ with st.sidebar:
             st.success("Logged out successfully!")
     else:
         st.info("🔓 Please log in to access all features.")
-    menu = st.radio("📋 Navigation", ["🏠 Home", "👤 Profile", "🔬 Disease Prediction"])
+    menu_options = ["🏠 Home", "👤 Profile", "🔬 Disease Prediction", "📜 History"]
+    if is_admin:
+        menu_options += ["📈 Metrics", "📉 Drift"]
+    menu = st.radio("📋 Navigation", menu_options)
+clock.lap("sidebar")
 
 # Home page
 if menu == "🏠 Home":
@@ -66,8 +68,9 @@ elif menu == "👤 Profile":
         login_user = st.text_input("👤 Username", key="login_user")
         login_pass = st.text_input("🔒 Password", type="password", key="login_pass")
         if st.button("Login"):
-            users = load_users()
-            if login_user in users and users[login_user] == hash_password(login_pass):
+            with metrics.span("auth.login"):
+                valid_login = store.verify_login(login_user, login_pass)
+            if valid_login:
                 st.session_state.logged_in = True
                 st.session_state.username = login_user
                 st.success("✅ Login successful!")
@@ -79,33 +82,161 @@ elif menu == "👤 Profile":
         new_user = st.text_input("👤 Choose Username", key="register_user")
         new_pass = st.text_input("🔒 Choose Password", type="password", key="register_pass")
         if st.button("Register"):
-            users = load_users()
-            if new_user in users:
-                st.warning("⚠️ Username already exists.")
-            else:
-                users[new_user] = hash_password(new_pass)
-                save_users(users)
+            with metrics.span("auth.register"):
+                created = store.create_user(new_user, new_pass)
+            if created:
                 st.success("✅ Registration successful! You can now log in.")
+            else:
+                st.warning("⚠️ Username already exists.")
 
 # Disease prediction page
 elif menu == "🔬 Disease Prediction":
     if st.session_state.logged_in:
         st.markdown("## 🧠 Disease Prediction Tool")
         st.markdown("Select a disease and enter your health data to assess risk.")
-        disease = st.sidebar.radio("Select Disease", ["Diabetes", "Heart Disease", "Parkinson's"], key="disease_select")
+        disease = st.sidebar.radio("Select Disease", list(page_registry.PAGES), key="disease_select")
         
-        if disease == "Diabetes":
-            show_diabetes_page()
-        elif disease == "Heart Disease":
-            show_heart_disease_page()
-        elif disease == "Parkinson's":
-            show_parkinsons_page()
+        show_page = page_registry.get_page(disease)
+        clock.lap(f"load {disease} page")
+        with metrics.span(f"page.{disease}"):
+            show_page()
     else:
         st.warning("⚠️ Please log in to use the prediction tool.")
 
+# Prediction history (newest first, one page at a time)
+elif menu == "📜 History":
+    if st.session_state.logged_in:
+        st.markdown("## 📜 Prediction History")
+        history_filters = {"All": None, "Diabetes": "diabetes", "Heart Disease": "heart", "Parkinson's": "parkinsons"}
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            history_filter = st.selectbox("Disease", list(history_filters), key="history_filter")
+        with col2:
+            page_size = st.selectbox("Rows per page", [10, 20, 50], index=1, key="history_page_size")
+        
+        # Cursors of the pages visited so far; reset whenever the filter changes
+        view = (st.session_state.username, history_filter, page_size)
+        if st.session_state.get("history_view") != view:
+            st.session_state.history_view = view
+            st.session_state.history_cursors = [FIRST_PAGE]
+        cursors = st.session_state.history_cursors
+        
+        # Rows reach the database within DPS_HISTORY_FLUSH_SECONDS of the prediction
+        entries, next_cursor = get_history().page(st.session_state.username, history_filters[history_filter], cursors[-1], page_size)
+        if entries:
+            st.dataframe(
+                [
+                    {
+                        "Time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(entry["created_at"])),
+                        "Disease": entry["disease"],
+                        "Result": "🟥 At Risk" if entry["prediction"] == 1 else "🟩 Low Risk",
+                        "Confidence (%)": round(entry["probability"] * 100, 1) if entry["probability"] is not None else None,
+                        "Model Version": entry["model_version"],
+                        "Inputs": json.dumps(entry["inputs"]),
+                    }
+                    for entry in entries
+                ],
+                use_container_width=True, hide_index=True
+            )
+        else:
+            st.info("No predictions recorded yet.")
+        
+        col1, col2, col3 = st.columns([1, 1, 3])
+        with col1:
+            if st.button("⬅️ Newer", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+        with col2:
+            if st.button("Older ➡️", disabled=next_cursor is None):
+                cursors.append(next_cursor)
+                st.rerun()
+        with col3:
+            st.caption(f"Page {len(cursors)}")
+    else:
+        st.warning("⚠️ Please log in to view your prediction history.")
+
+# Metrics panel (admins only)
+elif menu == "📈 Metrics" and is_admin:
+    st.markdown("## 📈 Metrics")
+    if not metrics.ENABLED:
+        st.info("Metrics are disabled. Start the app with DPS_METRICS=1 to collect them.")
+    else:
+        st.markdown("### Stage Timings")
+        st.dataframe(metrics.summary(), use_container_width=True, hide_index=True)
+        st.markdown("### Counters")
+        st.json(metrics.counters())
+        with st.expander("Prometheus Text Format"):
+            st.code(metrics.render_prometheus(), language="text")
+    with st.expander("⏱️ Startup Report"):
+        for phase, seconds in page_registry.startup_report().items():
+            st.write(f"{phase}: **{seconds * 1000:.1f} ms**")
+
+# Input drift per model (admins only)
+elif menu == "📉 Drift" and is_admin:
+    # Imported here: the drift monitor pulls in numpy and the model code
+    import drift_monitor
+    st.markdown("## 📉 Input Drift")
+    st.caption(
+        f"Inputs seen since the model was loaded, compared with the mean and standard deviation of its training data. "
+        f"A feature is flagged after {drift_monitor.MIN_ROWS} rows when its mean moves more than "
+        f"{drift_monitor.MEAN_SHIFT_LIMIT} standard deviations, its spread leaves "
+        f"{drift_monitor.STD_RATIO_LIMITS[0]}–{drift_monitor.STD_RATIO_LIMITS[1]}× the training one, "
+        f"or more than {drift_monitor.MISSING_RATE_LIMIT:.0%} of values are missing."
+    )
+    drift_names = {"diabetes": "Diabetes", "heart": "Heart Disease", "parkinsons": "Parkinson's"}
+    # This app's live statistics, then the last snapshots of the inference service and bulk-scoring CLI if present
+    drift_sources = {None: None, "service": "Inference service", "batch": "Bulk scoring CLI"}
+    for disease, name in drift_names.items():
+        st.markdown(f"### {name}")
+        for source, source_name in drift_sources.items():
+            drift = drift_monitor.report(disease, source)
+            if source is not None and (drift is None or not drift["rows"]):
+                continue
+            if source_name:
+                st.markdown(f"**{source_name}**")
+            if drift is None or not drift["rows"]:
+                st.info("No inputs observed yet.")
+                continue
+            if drift["drifted_features"]:
+                st.warning(f"⚠️ Drift in: {', '.join(drift['drifted_features'])}")
+            else:
+                st.success("🟩 No drift detected.")
+            updated = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(drift["updated_at"])) if drift["updated_at"] else "—"
+            st.caption(f"{drift['rows']} rows • last update {updated}")
+            st.dataframe(
+                [
+                    {
+                        "Feature": entry["feature"],
+                        "Status": "⚠️ Drift" if entry["drifted"] else "OK",
+                        "Drift Score": entry["drift_score"],
+                        "Mean Shift (σ)": entry["mean_shift"],
+                        "Std Ratio": entry["std_ratio"],
+                        "Missing (%)": round(entry["missing_rate"] * 100, 1),
+                        "Mean": entry["mean"],
+                        "Fitted Mean": entry["reference_mean"],
+                        **{quantile.upper(): value for quantile, value in (entry["quantiles"] or {}).items()},
+                    }
+                    for entry in sorted(drift["features"], key=lambda entry: -(entry["drift_score"] or 0))
+                ],
+                use_container_width=True, hide_index=True
+            )
+    if st.button("💾 Write Snapshots Now"):
+        drift_monitor.write_snapshots()
+        st.success(f"Snapshots written to {os.path.abspath(drift_monitor.SNAPSHOT_DIR)}")
+
 # Footer
 st.markdown("---")
 st.markdown(
     "<p style='text-align:center; color: gray;'>© 2025 Disease Prediction System • Built with ❤️ using Streamlit</p>",
     unsafe_allow_html=True
-)
\ No newline at end of file
+)
+clock.lap(f"render {menu}")
+
+# Startup-time report (set DPS_STARTUP_REPORT=1 to show it)
+if os.environ.get("DPS_STARTUP_REPORT") == "1":
+    with st.sidebar.expander("⏱️ Startup Report"):
+        for phase, seconds in page_registry.startup_report().items():
+            st.write(f"{phase}: **{seconds * 1000:.1f} ms**")
+
+# Pre-import the disease pages and load models once the first page has been sent
+page_registry.start_warm_up()
\ No newline at end of file
@@ -0,0 +1,112 @@
+# Personal Code: DPS-AUTH-011
+# Author: [Your Name]
+# Description: Shared SQLite account store (WAL mode, per-thread connections) used by WebPage.py and Register.py.
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+DB_PATH = os.environ.get("DPS_USER_DB", "users.db")
+LEGACY_USER_FILE = "users.json"
+
+# Statements are constants so sqlite3's per-connection statement cache reuses the prepared form
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS users (username TEXT PRIMARY KEY, email TEXT UNIQUE, password TEXT)",
+    "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)",
+]
+_SELECT_PASSWORD = "SELECT password FROM users WHERE username = ?"
+_INSERT_USER = "INSERT INTO users (username, email, password) VALUES (?, ?, ?)"
+_SELECT_META = "SELECT value FROM store_meta WHERE key = ?"
+_UPSERT_META = "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)"
+
+_stores = {}
+_stores_lock = threading.Lock()
+_log = logging.getLogger(__name__)
+
+
+def hash_password(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+class AccountStore:
+    def __init__(self, path=DB_PATH, legacy_user_file=LEGACY_USER_FILE):
+        self.path = path
+        self._local = threading.local()
+        conn = self.connection()
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        self.migrate_json(legacy_user_file)
+
+    def connection(self):
+        # One connection per thread; Streamlit runs each session's script on its own thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def migrate_json(self, legacy_user_file):
+        # One-time import of the old users.json accounts (username -> password hash)
+        conn = self.connection()
+        if conn.execute(_SELECT_META, ("users_json_migrated",)).fetchone() or not os.path.exists(legacy_user_file):
+            return 0
+        with open(legacy_user_file, "r") as f:
+            users = json.load(f)
+        with conn:
+            # Usernames already taken with a different password are not imported; they are kept
+            # in <users.json>.conflicts.json and logged so no account disappears silently
+            existing = dict(conn.execute("SELECT username, password FROM users").fetchall())
+            conflicts = {name: password for name, password in users.items() if name in existing and existing[name] != password}
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (username, email, password) VALUES (?, NULL, ?)",
+                list(users.items()),
+            )
+            migrated = conn.total_changes - before
+            conn.execute(_UPSERT_META, ("users_json_migrated", str(migrated)))
+            if conflicts:
+                conn.execute(_UPSERT_META, ("users_json_conflicts", json.dumps(sorted(conflicts))))
+        if conflicts:
+            conflict_file = f"{legacy_user_file}.conflicts.json"
+            with open(conflict_file, "w") as f:
+                json.dump(conflicts, f, indent=2)
+            _log.warning(
+                "users.json migration skipped %d account(s) whose username already exists with another password: %s (saved to %s)",
+                len(conflicts), ", ".join(sorted(conflicts)), conflict_file,
+            )
+        return migrated
+
+    def create_user(self, username, password, email=None, after_insert=None):
+        # after_insert(conn) runs in the same transaction, e.g. to queue a welcome email
+        try:
+            with self.connection() as conn:
+                conn.execute(_INSERT_USER, (username, email, hash_password(password)))
+                if after_insert is not None:
+                    after_insert(conn)
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def user_exists(self, username):
+        return self.connection().execute(_SELECT_PASSWORD, (username,)).fetchone() is not None
+
+    def verify_login(self, username, password):
+        row = self.connection().execute(_SELECT_PASSWORD, (username,)).fetchone()
+        return row is not None and row[0] == hash_password(password)
+
+
+def get_store(path=DB_PATH):
+    store = _stores.get(path)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(path)
+            if store is None:
+                store = _stores[path] = AccountStore(path)
+    return store
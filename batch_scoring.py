@@ -0,0 +1,202 @@
+# Personal Code: DPS-CORE-007
+# Author: [Your Name]
+# Description: Bulk CSV/Parquet scoring for the disease predictors, usable from the Streamlit pages and the command line.
+
+import argparse
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import streamlit as st
+import drift_monitor
+from model_registry import DISEASE_ARTIFACTS, load_disease_artifacts
+from attributions import BATCH_BACKGROUND_ROWS, get_explainer
+from fast_pipeline import get_pipeline
+from fragments import fragment
+from scoring import feature_columns, predict_batch
+
+DEFAULT_CHUNKSIZE = 10000
+# Larger results are not offered in the page, where the download is held in memory; use the command line
+MAX_DOWNLOAD_MB = float(os.environ.get("DPS_BATCH_DOWNLOAD_MB", "200"))
+RESULT_COLUMNS = ["prediction", "probability_no_disease", "probability_disease"]
+
+
+def detect_format(name):
+    extension = os.path.splitext(str(name))[1].lower()
+    if extension in (".parquet", ".pq"):
+        return "parquet"
+    if extension == ".csv":
+        return "csv"
+    raise ValueError(f"Unsupported file type '{extension}'. Use a .csv or .parquet file.")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet support requires the 'pyarrow' package.")
+    return pyarrow
+
+
+def iter_input_chunks(source, fmt, chunksize=DEFAULT_CHUNKSIZE):
+    if fmt == "csv":
+        yield from pd.read_csv(source, chunksize=chunksize)
+    else:
+        pyarrow = _require_pyarrow()
+        parquet_file = pyarrow.parquet.ParquetFile(source)
+        for batch in parquet_file.iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+def validate_columns(frame, expected):
+    missing = [column for column in expected if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Input is missing required column(s): {', '.join(missing)}")
+    # Empty cells read as NaN and keep a column numeric; any text does not
+    non_numeric = [column for column in expected if not pd.api.types.is_numeric_dtype(frame[column])]
+    if non_numeric:
+        raise ValueError(f"Column(s) must contain only numbers: {', '.join(non_numeric)}")
+
+
+def effect_columns(expected):
+    return [f"effect_{column}" for column in expected]
+
+
+def score_chunk(disease, chunk, artifacts, expected, explain=False):
+    X = chunk[expected].to_numpy(dtype=np.float64)
+    result = chunk.copy()
+    for column in RESULT_COLUMNS + (effect_columns(expected) if explain else []):
+        result[column] = np.nan
+
+    # Only the heart model has an imputer; other rows with gaps are left unscored
+    valid = np.ones(len(X), dtype=bool) if get_pipeline(artifacts).handles_missing else ~np.isnan(X).any(axis=1)
+    if valid.any():
+        labels, probabilities = predict_batch(artifacts, X[valid])
+        result.loc[valid, "prediction"] = labels
+        result.loc[valid, "probability_no_disease"] = probabilities[:, 0]
+        result.loc[valid, "probability_disease"] = probabilities[:, 1]
+        if explain:
+            # Per-feature effects on the disease risk, against a smaller reference sample than the pages use
+            effects = get_explainer(disease, artifacts).explain(X[valid], background_rows=BATCH_BACKGROUND_ROWS)
+            result.loc[valid, effect_columns(expected)] = effects
+    return result
+
+
+class _CsvWriter:
+    def __init__(self, destination):
+        self.destination = destination
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.destination, mode="w" if self.header else "a", header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        pass
+
+
+class _ParquetWriter:
+    def __init__(self, destination):
+        self.pyarrow = _require_pyarrow()
+        self.destination = destination
+        self.writer = None
+
+    def write(self, frame):
+        table = self.pyarrow.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.destination, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def score_file(disease, source, destination, input_format=None, output_format=None, chunksize=DEFAULT_CHUNKSIZE, artifacts=None, explain=False):
+    input_format = input_format or detect_format(getattr(source, "name", source))
+    output_format = output_format or detect_format(destination)
+    artifacts = artifacts or load_disease_artifacts(disease)
+    expected = feature_columns(disease, artifacts)
+
+    # Written next to the destination and renamed over it, so a failed run never leaves a partial file behind
+    directory = os.path.dirname(os.path.abspath(destination))
+    fd, staging = tempfile.mkstemp(prefix=".scores-", dir=directory)
+    os.close(fd)
+    # Chunks are read, scored and written one at a time so memory stays bounded
+    writer = _ParquetWriter(staging) if output_format == "parquet" else _CsvWriter(staging)
+    rows = 0
+    try:
+        try:
+            for chunk in iter_input_chunks(source, input_format, chunksize):
+                validate_columns(chunk, expected)
+                writer.write(score_chunk(disease, chunk, artifacts, expected, explain))
+                # Every row counts towards drift statistics, including rows left unscored for missing values
+                drift_monitor.observe(disease, artifacts, chunk[expected].to_numpy(dtype=np.float64))
+                rows += len(chunk)
+        finally:
+            writer.close()
+        os.replace(staging, destination)
+    except BaseException:
+        if os.path.exists(staging):
+            os.remove(staging)
+        raise
+    return rows
+
+
+# Uploads and the score button rerun only this panel
+@fragment
+def show_batch_scoring(disease, artifacts):
+    with st.expander("📂 Bulk Scoring (CSV / Parquet)"):
+        expected = feature_columns(disease, artifacts)
+        st.markdown(f"Upload a file with the columns: `{', '.join(expected)}`")
+        uploaded = st.file_uploader("Patient records", type=["csv", "parquet"], key=f"{disease}_batch_file")
+        explain = st.checkbox("Include per-feature effects", key=f"{disease}_batch_explain", help="Adds an effect_<feature> column for every input feature")
+        if uploaded is not None and st.button("📊 Score File", key=f"{disease}_batch_submit"):
+            output_format = detect_format(uploaded.name)
+            suffix = ".parquet" if output_format == "parquet" else ".csv"
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as output:
+                output_path = output.name
+            try:
+                rows = score_file(disease, uploaded, output_path, output_format=output_format, artifacts=artifacts, explain=explain)
+            except Exception as e:
+                os.remove(output_path)
+                st.error(f"Bulk scoring error: {str(e)}")
+                return
+            st.success(f"✅ Scored {rows} records.")
+            size_mb = os.path.getsize(output_path) / (1024 * 1024)
+            if size_mb > MAX_DOWNLOAD_MB:
+                os.remove(output_path)
+                st.warning(f"⚠️ The results are {size_mb:.0f} MB, over the {MAX_DOWNLOAD_MB:.0f} MB in-page limit. Score this file with `python batch_scoring.py` instead.")
+                return
+            with open(output_path, "rb") as f:
+                st.download_button(
+                    "⬇️ Download Results", f, file_name=f"{disease}_predictions{suffix}",
+                    mime="text/csv" if suffix == ".csv" else "application/octet-stream", key=f"{disease}_batch_download"
+                )
+            os.remove(output_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV or Parquet file of patient records.")
+    parser.add_argument("disease", choices=sorted(DISEASE_ARTIFACTS))
+    parser.add_argument("input", help="Input .csv or .parquet file")
+    parser.add_argument("output", help="Output .csv or .parquet file")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Rows scored per chunk")
+    parser.add_argument("--explain", action="store_true", help="Add effect_<feature> columns with per-feature attributions")
+    args = parser.parse_args(argv)
+
+    # Drift snapshots of its own, so a run next to the app does not overwrite the app's
+    drift_monitor.use_source("batch")
+    try:
+        rows = score_file(args.disease, args.input, args.output, chunksize=args.chunksize, explain=args.explain)
+    except (FileNotFoundError, ValueError, ImportError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Scored {rows} records -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+# Personal Code: DPS-BENCH-014
+# Author: [Your Name]
+# Description: Benchmarks for model loading, single-row latency and batch throughput using synthetic models.
+# Run with: python -m benchmarks.run_benchmarks --output results.json
@@ -0,0 +1,19 @@
+# Personal Code: DPS-BENCH-037
+# Author: [Your Name]
+# Description: Streamlit entry point for the load-test server: WebPage.py served against the synthetic models.
+# Started by benchmarks/load_test.py as: streamlit run benchmarks/load_server.py
+
+import json
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import model_registry
+
+# Artifact paths written by the load test; the registry keeps them for the life of the server
+model_registry.DISEASE_ARTIFACTS.update(json.loads(os.environ["DPS_LOAD_TEST_ARTIFACTS"]))
+runpy.run_path(os.path.join(ROOT, "WebPage.py"), run_name="__main__")
@@ -0,0 +1,388 @@
+# Personal Code: DPS-BENCH-017
+# Author: [Your Name]
+# Description: Load test that serves WebPage.py from one Streamlit server and drives many concurrent browser-like sessions against it.
+# Run with: python -m benchmarks.load_test --concurrency 1 4 16 --output load.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "WebPage.py")
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "load_server.py")
+CONCURRENCY = [1, 2, 4, 8, 16]
+PASSWORD = "load-test-password"
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _latency_summary(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {"runs": 0}
+    return {
+        "runs": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": _percentile(ordered, 0.50) * 1000,
+        "p95_ms": _percentile(ordered, 0.95) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _current_rss(pid="self"):
+    # Resident set size of a process in bytes; 0 where /proc is unavailable
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+class RssSampler:
+    # Polls a process's RSS in the background so each concurrency level gets its own peak
+    def __init__(self, pid="self", interval=0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self):
+        while not self.stopping.is_set():
+            self.peak = max(self.peak, _current_rss(self.pid))
+            self.stopping.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = _current_rss(self.pid)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopping.set()
+        self.thread.join()
+        self.peak = max(self.peak, _current_rss(self.pid))
+        return False
+
+
+def prepare_environment(workdir, paths=None, warm=True):
+    # Isolated databases, drift snapshots and synthetic models; must run before any app module is imported.
+    # The load-test server inherits the environment and gets the artifact paths from load_server.py.
+    os.environ["DPS_USER_DB"] = os.path.join(workdir, "users.db")
+    os.environ["DPS_HISTORY_DB"] = os.path.join(workdir, "history.db")
+    os.environ["DPS_BUNDLE_DIR"] = os.path.join(workdir, "bundles")
+    os.environ["DPS_DRIFT_DIR"] = os.path.join(workdir, "drift")
+    import model_registry
+    if paths is None:
+        from benchmarks.synthetic import build_artifacts
+        paths = build_artifacts(os.path.join(workdir, "models"))
+    model_registry.DISEASE_ARTIFACTS.update(paths)
+    if warm:
+        model_registry.warm_up(background=False)
+    return paths
+
+
+def create_users(count):
+    from account_store import get_store
+    store = get_store()
+    usernames = [f"loadtest{i}" for i in range(count)]
+    for username in usernames:
+        if not store.user_exists(username):
+            store.create_user(username, PASSWORD)
+    return usernames
+
+
+class ServerSession:
+    # One browser tab against the running server. It speaks Streamlit's websocket protocol: widget states go up
+    # in a rerun request, and the reply's messages are parsed with AppTest's element tree so widgets can be found
+    # by key or label. Widget values persist client-side, as in a browser, and widgets inside a fragment rerun only
+    # that fragment.
+    def __init__(self, url, username, iterations, timeout, seed):
+        self.url = url
+        self.username = username
+        self.iterations = iterations
+        self.timeout = timeout
+        self.seed = seed
+        self.latencies = {}
+        self.errors = 0
+        self.predictions = 0
+        self.started = None
+        self.socket = None
+        self.page_hash = ""
+        self.messages = {}
+        self.cache = {}
+        self.fragments = {}
+        self.states = {}
+        self.triggers = []
+        self.tree = None
+
+    async def _receive_run(self):
+        # Messages of the run started by the last request, up to its script_finished
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        messages = []
+        while True:
+            msg = ForwardMsg()
+            msg.ParseFromString(await self.socket.recv())
+            if msg.WhichOneof("type") == "ref_hash":
+                # Repeated large message: the server sends its hash and the client reuses its copy
+                cached = self.cache[msg.ref_hash]
+                cached.metadata.CopyFrom(msg.metadata)
+                msg = cached
+            elif msg.hash:
+                self.cache[msg.hash] = msg
+            kind = msg.WhichOneof("type")
+            if kind == "new_session":
+                self.page_hash = self.page_hash or msg.new_session.page_script_hash
+                messages = []
+            elif kind == "delta":
+                messages.append(msg)
+            elif kind == "script_finished":
+                if msg.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    # st.rerun(): the follow-up run's messages replace these
+                    messages = []
+                    continue
+                return messages, msg.script_finished
+
+    async def _rerun(self, action=None, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.testing.v1.element_tree import parse_tree_from_messages
+        request = BackMsg()
+        request.rerun_script.query_string = ""
+        request.rerun_script.page_script_hash = self.page_hash
+        request.rerun_script.fragment_id = fragment_id
+        request.rerun_script.widget_states.widgets.extend([*self.states.values(), *self.triggers])
+        self.triggers = []
+        start = time.perf_counter()
+        await self.socket.send(request.SerializeToString())
+        messages, status = await asyncio.wait_for(self._receive_run(), self.timeout)
+        if action is not None:
+            self.latencies.setdefault(action, []).append(time.perf_counter() - start)
+
+        # A fragment run only resends the fragment's elements; everything else stays as drawn
+        if status != ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY:
+            self.messages = {}
+        for msg in messages:
+            self.messages[tuple(msg.metadata.delta_path)] = msg
+            element = msg.delta.new_element
+            kind = element.WhichOneof("type") if msg.delta.WhichOneof("type") == "new_element" else None
+            widget_id = getattr(getattr(element, kind), "id", "") if kind else ""
+            if widget_id:
+                self.fragments[widget_id] = msg.delta.fragment_id
+            if kind == "exception":
+                self.errors += 1
+        if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+            self.errors += 1
+        self.tree = parse_tree_from_messages(list(self.messages.values()))
+        return messages
+
+    def _set(self, widget, value):
+        # What a browser sends for a changed radio (option label), text input or number input
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        state = WidgetState(id=widget.id)
+        if isinstance(value, str):
+            state.string_value = value
+        else:
+            state.double_value = float(value)
+        self.states[widget.id] = state
+
+    async def _click(self, label, action):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        button = next(button for button in self.tree.button if button.label == label)
+        self.triggers.append(WidgetState(id=button.id, trigger_value=True))
+        return await self._rerun(action, self.fragments.get(button.id, ""))
+
+    async def _navigate(self, option):
+        self._set(next(radio for radio in self.tree.sidebar.radio if radio.label == "📋 Navigation"), option)
+        await self._rerun("navigate")
+
+    def _fill_parkinsons(self, row):
+        from feature_schema import PARKINSONS_SCHEMA
+        for name, value in zip(PARKINSONS_SCHEMA.names, row):
+            self._set(self.tree.number_input(key=f"parkinsons_{name}"), abs(float(value)))
+
+    async def run(self):
+        import page_registry
+        import websockets
+        from benchmarks.synthetic import sample_rows
+        self.started = time.time()
+        async with websockets.connect(self.url, subprotocols=["streamlit"], max_size=None) as self.socket:
+            await self._rerun("load")
+            await self._navigate("👤 Profile")
+            self._set(self.tree.text_input(key="login_user"), self.username)
+            self._set(self.tree.text_input(key="login_pass"), PASSWORD)
+            await self._click("Login", "login")
+            await self._navigate("🔬 Disease Prediction")
+
+            voice_rows = sample_rows("parkinsons", self.iterations, seed=self.seed)
+            for iteration in range(self.iterations):
+                for page, (_, _, key) in page_registry.PAGES.items():
+                    if key is None:
+                        continue
+                    self._set(self.tree.radio(key="disease_select"), page)
+                    await self._rerun("switch_page")
+                    if page == "Parkinson's":
+                        self._fill_parkinsons(voice_rows[iteration])
+                    messages = await self._click("🔍 Predict", "submit")
+                    if any("Prediction:" in msg.delta.new_element.markdown.body for msg in messages):
+                        self.predictions += 1
+                    else:
+                        self.errors += 1
+
+
+def _free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class AppServer:
+    # One `streamlit run` process serving WebPage.py (through load_server.py) to every simulated tab
+    def __init__(self, workdir, paths, timeout):
+        self.port = _free_port()
+        self.url = f"ws://127.0.0.1:{self.port}/_stcore/stream"
+        self.log_path = os.path.join(workdir, "server.log")
+        self.timeout = timeout
+        self.env = {**os.environ, "DPS_LOAD_TEST_ARTIFACTS": json.dumps(paths)}
+        self.process = None
+
+    def __enter__(self):
+        command = [
+            sys.executable, "-m", "streamlit", "run", SERVER_PATH,
+            "--server.headless", "true", "--server.address", "127.0.0.1", "--server.port", str(self.port),
+            "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false",
+        ]
+        self.log = open(self.log_path, "w")
+        self.process = subprocess.Popen(command, env=self.env, stdout=self.log, stderr=subprocess.STDOUT)
+        deadline = time.time() + self.timeout
+        while time.time() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/_stcore/health", timeout=1) as response:
+                    if response.status == 200:
+                        return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        with open(self.log_path) as f:
+            raise RuntimeError(f"Streamlit server did not start:\n{f.read()[-2000:]}")
+
+    def __exit__(self, *exc):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.log.close()
+        return False
+
+
+async def _run_sessions(url, usernames, iterations, timeout, seed=0):
+    sessions = [ServerSession(url, username, iterations, timeout, seed + i) for i, username in enumerate(usernames)]
+    outcomes = await asyncio.gather(*(session.run() for session in sessions), return_exceptions=True)
+    failures = [repr(outcome) for outcome in outcomes if isinstance(outcome, BaseException)]
+    return sessions, failures
+
+
+def run_level(server, usernames, iterations, timeout):
+    # All N tabs connect at once to the one server, so they share its GIL, caches and scoring executor
+    baseline = _current_rss(server.process.pid)
+    with RssSampler(server.process.pid) as rss:
+        started = time.time()
+        sessions, failures = asyncio.run(_run_sessions(server.url, usernames, iterations, timeout))
+        elapsed = time.time() - started
+    by_action = {}
+    for session in sessions:
+        for action, samples in session.latencies.items():
+            by_action.setdefault(action, []).extend(samples)
+    all_reruns = [sample for samples in by_action.values() for sample in samples]
+    predictions = sum(session.predictions for session in sessions)
+    return {
+        "sessions": len(usernames),
+        "elapsed_s": elapsed,
+        "reruns": len(all_reruns),
+        "reruns_per_second": len(all_reruns) / elapsed if elapsed else 0.0,
+        "predictions": predictions,
+        "predictions_per_second": predictions / elapsed if elapsed else 0.0,
+        "errors": sum(session.errors for session in sessions) + len(failures),
+        "failures": failures[:5],
+        # The one server process: resident memory before the level and its peak while the tabs ran
+        "baseline_rss_mb": baseline / (1024 * 1024) if baseline else None,
+        "peak_rss_mb": rss.peak / (1024 * 1024) if rss.peak else None,
+        "rerun_latency": _latency_summary(all_reruns),
+        "by_action": {action: _latency_summary(samples) for action, samples in sorted(by_action.items())},
+    }
+
+
+def run(concurrency=CONCURRENCY, iterations=3, timeout=60, workdir=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = workdir or tmp
+        paths = prepare_environment(workdir, warm=False)
+        usernames = create_users(max(concurrency))
+        levels = {}
+        with AppServer(workdir, paths, timeout) as server:
+            # One unmeasured tab loads the models and page modules, as on a server that has been up a while
+            _, failures = asyncio.run(_run_sessions(server.url, usernames[:1], 1, timeout))
+            if failures:
+                raise RuntimeError(f"Warm-up session failed: {failures[0]}")
+            for sessions in concurrency:
+                levels[str(sessions)] = run_level(server, usernames[:sessions], iterations, timeout)
+                _print_level(levels[str(sessions)])
+    import streamlit
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "iterations": iterations,
+            "scoring_executor": os.environ.get("DPS_SCORING_EXECUTOR", "inline"),
+        },
+        "levels": levels,
+    }
+
+
+def _print_level(level):
+    latency = level["rerun_latency"]
+    print(
+        f"{level['sessions']:>4} sessions  {level['reruns_per_second']:8.1f} reruns/s  "
+        f"p50 {latency.get('p50_ms', 0):7.1f} ms  p95 {latency.get('p95_ms', 0):7.1f} ms  p99 {latency.get('p99_ms', 0):7.1f} ms  "
+        f"server RSS {level['baseline_rss_mb'] or 0:7.1f} -> {level['peak_rss_mb'] or 0:7.1f} MB  errors {level['errors']}",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the Streamlit app with concurrent headless sessions.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=CONCURRENCY, help="Session counts to run, one level each")
+    parser.add_argument("--iterations", type=int, default=3, help="Rounds of page switch + submit per disease per session")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds allowed for a single rerun")
+    parser.add_argument("--output", help="Write results JSON to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = run(args.concurrency, args.iterations, args.timeout)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if any(level["errors"] for level in results["levels"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+# Personal Code: DPS-BENCH-028
+# Author: [Your Name]
+# Description: Measures how much of each disease-page rerun the prediction fragments no longer re-execute.
+# Run with: python -m benchmarks.rerun_work --iterations 20 --output reruns.json
+#
+# Each interaction is driven through a full AppTest run, which is what every interaction cost before the
+# fragments. AppTest cannot trigger a fragment-only rerun, so no real fragment rerun is timed: the
+# "<disease>.fragment" span inside the full run stands in for it, and full minus span is an estimate of the
+# work saved. A real fragment rerun also pays Streamlit's per-rerun overhead, so the estimate is an upper bound.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from benchmarks.load_test import APP_PATH, PASSWORD, _latency_summary, create_users, prepare_environment
+
+DISEASE_PAGES = {"diabetes": "Diabetes", "heart": "Heart Disease", "parkinsons": "Parkinson's"}
+METHOD = (
+    "Estimate: fragment reruns are not measured directly. fragment_span is the time inside the fragment during a "
+    "full-script AppTest run; estimated_saved is full_rerun minus fragment_span and excludes Streamlit's per-rerun overhead."
+)
+
+
+def _span_total(stage):
+    import metrics
+    for row in metrics.summary():
+        if row["stage"] == stage:
+            return row["total_s"]
+    return 0.0
+
+
+class RerunProbe:
+    def __init__(self, timeout):
+        from streamlit.testing.v1 import AppTest
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.samples = {}
+        self.errors = 0
+
+    def rerun(self, disease=None, action=None):
+        fragment_before = _span_total(f"{disease}.fragment")
+        start = time.perf_counter()
+        self.app.run()
+        full = time.perf_counter() - start
+        fragment = _span_total(f"{disease}.fragment") - fragment_before
+        if len(self.app.exception):
+            self.errors += 1
+        if action is not None:
+            self.samples.setdefault(disease, {}).setdefault(action, []).append((full, fragment))
+
+    def login(self, username):
+        self.rerun()
+        self.navigate("👤 Profile")
+        self.app.text_input(key="login_user").input(username)
+        self.app.text_input(key="login_pass").input(PASSWORD)
+        self.button("Login").click()
+        self.rerun()
+        self.navigate("🔬 Disease Prediction")
+
+    def navigate(self, option):
+        next(radio for radio in self.app.sidebar.radio if radio.label == "📋 Navigation").set_value(option)
+        self.rerun()
+
+    def button(self, label):
+        return next(button for button in self.app.button if button.label == label)
+
+    def fill(self, disease, row):
+        # Form values from a synthetic patient, clipped to the widget bounds
+        from feature_schema import schema_for
+        for feature, value in zip(schema_for(disease).features, row):
+            key = f"{disease}_{feature.name}"
+            if feature.options is not None:
+                self.app.selectbox(key=key).set_value(int(value))
+                continue
+            value = abs(float(value)) if disease == "parkinsons" else float(value)
+            value = max(value, feature.min_value or 0.0)
+            if feature.max_value is not None:
+                value = min(value, feature.max_value)
+            self.app.number_input(key=key).set_value(feature.cast(value))
+
+    def run_page(self, disease, iterations, seed):
+        from benchmarks.synthetic import sample_rows
+        from feature_schema import schema_for
+        self.app.radio(key="disease_select").set_value(DISEASE_PAGES[disease])
+        self.rerun(disease, "switch_page")
+        labels = [feature.label for feature in schema_for(disease).sweepable()]
+        rows = sample_rows(disease, iterations, seed=seed)
+        for iteration in range(iterations):
+            # New values: scored through the executor
+            self.fill(disease, rows[iteration])
+            self.button("🔍 Predict").click()
+            self.rerun(disease, "submit_new_input")
+            # Same values again: the result comes from the per-input cache
+            self.button("🔍 Predict").click()
+            self.rerun(disease, "submit_same_input")
+            # What-if panel adjustments rerun the prediction fragment only
+            if disease != "parkinsons" and len(labels) > 1:
+                chosen = labels[:2] if iteration % 2 == 0 else labels[1:2]
+                self.app.multiselect(key=f"{disease}_what_if_features").set_value(chosen)
+                self.rerun(disease, "adjust_what_if")
+
+
+def _action_summary(samples):
+    full = [sample[0] for sample in samples]
+    fragment = [sample[1] for sample in samples]
+    full_median, fragment_median = statistics.median(full), statistics.median(fragment)
+    return {
+        "full_rerun": _latency_summary(full),
+        "fragment_span": _latency_summary(fragment),
+        "estimated_saved_ms_p50": (full_median - fragment_median) * 1000,
+        "estimated_saved_fraction_p50": 1.0 - fragment_median / full_median if full_median else 0.0,
+    }
+
+
+def run(iterations=20, timeout=60, workdir=None, seed=0):
+    # Fragment spans are read from the in-process metrics, so they must be on before any app import
+    os.environ["DPS_METRICS"] = "1"
+    with tempfile.TemporaryDirectory() as tmp:
+        prepare_environment(workdir or tmp)
+        probe = RerunProbe(timeout)
+        probe.login(create_users(1)[0])
+        for disease in DISEASE_PAGES:
+            probe.run_page(disease, iterations, seed)
+    import streamlit
+    pages = {}
+    for disease, actions in probe.samples.items():
+        # Switching pages is a full rerun either way; it is kept as the baseline
+        pages[disease] = {action: _action_summary(samples) for action, samples in actions.items() if action != "switch_page"}
+        pages[disease]["switch_page"] = {"full_rerun": _latency_summary([sample[0] for sample in actions["switch_page"]])}
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "fragments": hasattr(streamlit, "fragment") or hasattr(streamlit, "experimental_fragment"),
+            "machine": platform.machine(),
+            "iterations": iterations,
+            "scoring_executor": os.environ.get("DPS_SCORING_EXECUTOR", "inline"),
+            "method": METHOD,
+        },
+        "errors": probe.errors,
+        "pages": pages,
+    }
+
+
+def _print_pages(pages):
+    for disease, actions in pages.items():
+        for action, summary in actions.items():
+            if "fragment_span" not in summary:
+                continue
+            print(
+                f"{disease:>11} {action:<18} full p50 {summary['full_rerun']['p50_ms']:8.1f} ms  "
+                f"fragment span p50 {summary['fragment_span']['p50_ms']:8.1f} ms  "
+                f"est. saved {summary['estimated_saved_ms_p50']:8.1f} ms ({summary['estimated_saved_fraction_p50']:.0%})",
+                file=sys.stderr,
+            )
+    print(METHOD, file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare full-script reruns with prediction-fragment reruns on the disease pages.")
+    parser.add_argument("--iterations", type=int, default=20, help="Submissions per disease page")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds allowed for a single rerun")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic patients")
+    parser.add_argument("--output", help="Write results JSON to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = run(args.iterations, args.timeout, seed=args.seed)
+    _print_pages(results["pages"])
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 1 if results["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+# Personal Code: DPS-BENCH-016
+# Author: [Your Name]
+# Description: Measures cold artifact load, page prediction latency and batch throughput; writes JSON for run-to-run comparison.
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+import model_registry
+from attributions import BATCH_BACKGROUND_ROWS, get_explainer
+from fast_pipeline import get_pipeline
+from scoring import predict_batch
+from benchmarks.synthetic import PARKINSONS_FEATURES, build_artifacts, sample_rows
+
+DISEASES = ["diabetes", "heart", "parkinsons"]
+BATCH_SIZES = [1, 16, 256, 4096]
+# Per-submit explanation must stay within this p95 (it runs on every form submit)
+ATTRIBUTION_BUDGET_MS = 50.0
+
+
+def _timings(fn, repeat, warmup=3):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _summary(samples):
+    ordered = sorted(samples)
+    return {
+        "runs": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "min_ms": ordered[0] * 1000,
+    }
+
+
+def page_prediction(disease):
+    # The prediction step each show_*_page runs on submit (imported lazily: the page modules need streamlit)
+    if disease == "diabetes":
+        from main import predict_diabetes
+        return lambda artifacts, row: predict_diabetes(row, artifacts)
+    if disease == "heart":
+        from Heart_Disease import predict_heart_disease
+        return lambda artifacts, row: predict_heart_disease(row, artifacts)
+    from Parkinsons import predict_parkinsons
+    return lambda artifacts, row: predict_parkinsons(dict(zip(PARKINSONS_FEATURES, row[0])), artifacts)
+
+
+def legacy_prediction(disease, paths, row):
+    # What the pages did on every rerun before the registry: unpickle everything, then one sklearn call per value shown
+    def run():
+        artifacts = {name: joblib.load(path) for name, path in paths.items()}
+        X = row
+        if disease == "parkinsons":
+            X = pd.DataFrame([dict(zip(artifacts["feature_names"], row[0]))], columns=artifacts["feature_names"])
+        if "imputer" in artifacts:
+            X = artifacts["imputer"].transform(X)
+        X = artifacts["scaler"].transform(X)
+        prediction = artifacts["model"].predict(X)[0]
+        if disease != "diabetes":
+            for _ in range(3):
+                artifacts["model"].predict_proba(X)
+        return prediction
+    return run
+
+
+def bench_disease(disease, paths, repeat, batch_sizes):
+    results = {}
+
+    # Cold load: empty registry, unpickle every artifact and compile the pipeline
+    def cold_load():
+        model_registry.clear()
+        get_pipeline(model_registry.load_disease_artifacts(disease, paths))
+    results["cold_load"] = _summary(_timings(cold_load, max(3, repeat // 20), warmup=1))
+
+    artifacts = model_registry.load_disease_artifacts(disease, paths)
+    get_pipeline(artifacts)
+    results["warm_fetch"] = _summary(_timings(lambda: model_registry.load_disease_artifacts(disease, paths), repeat))
+
+    # Single row through the page's own prediction step, including the registry lookup
+    row = sample_rows(disease, 1)
+    predict = page_prediction(disease)
+    results["page_prediction"] = _summary(_timings(lambda: predict(model_registry.load_disease_artifacts(disease, paths), row), repeat))
+    results["legacy_page_prediction"] = _summary(_timings(legacy_prediction(disease, paths, row), max(3, repeat // 20), warmup=1))
+
+    # Feature attributions: one row as on the pages, and a bulk-scoring chunk
+    explainer = get_explainer(disease, artifacts)
+    results["attribution"] = _summary(_timings(lambda: explainer.explain(row), repeat))
+    chunk = sample_rows(disease, 256, seed=256)
+    results["batch_attribution_256"] = _summary(
+        _timings(lambda: explainer.explain(chunk, background_rows=BATCH_BACKGROUND_ROWS), max(3, repeat // 20), warmup=1)
+    )
+
+    # Batch throughput through the shared vectorized scorer
+    throughput = {}
+    for size in batch_sizes:
+        X = sample_rows(disease, size, seed=size)
+        samples = _timings(lambda: predict_batch(artifacts, X), max(3, repeat // max(1, size // 64)))
+        summary = _summary(samples)
+        summary["rows_per_second"] = size / statistics.median(samples)
+        throughput[str(size)] = summary
+    results["batch"] = throughput
+    return results
+
+
+def run(repeat=200, batch_sizes=BATCH_SIZES, diseases=DISEASES, workdir=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        all_paths = build_artifacts(workdir or tmp)
+        results = {disease: bench_disease(disease, all_paths[disease], repeat, batch_sizes) for disease in diseases}
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sklearn": sklearn.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def _flatten(results, prefix=""):
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and "p50_ms" in value:
+            yield name, value["p50_ms"]
+        elif isinstance(value, dict):
+            yield from _flatten(value, f"{name}.")
+
+
+def compare(current, baseline, tolerance):
+    # Metrics whose median got slower by more than the tolerance
+    previous = dict(_flatten(baseline["results"]))
+    regressions = []
+    for name, value in _flatten(current["results"]):
+        if name in previous and previous[name] > 0 and value > previous[name] * (1 + tolerance):
+            regressions.append((name, previous[name], value))
+    return regressions
+
+
+def over_budget(results, budget_ms):
+    # Diseases whose single-row attribution p95 exceeds the budget
+    return [
+        (disease, values["attribution"]["p95_ms"])
+        for disease, values in results["results"].items()
+        if values["attribution"]["p95_ms"] > budget_ms
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark model loading, prediction latency and batch throughput.")
+    parser.add_argument("--output", help="Write results JSON to this file (default: stdout)")
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per single-row measurement")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=BATCH_SIZES)
+    parser.add_argument("--disease", choices=DISEASES, action="append", help="Limit to one or more diseases")
+    parser.add_argument("--compare", help="Baseline results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before a metric counts as a regression")
+    parser.add_argument("--attribution-budget-ms", type=float, default=ATTRIBUTION_BUDGET_MS, help="Maximum p95 for one per-submit explanation")
+    args = parser.parse_args(argv)
+
+    results = run(args.repeat, args.batch_sizes, args.disease or DISEASES)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    status = 0
+    for disease, p95 in over_budget(results, args.attribution_budget_ms):
+        print(f"OVER BUDGET {disease}.attribution: p95 {p95:.3f} ms > {args.attribution_budget_ms:.3f} ms", file=sys.stderr)
+        status = 1
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before:.3f} ms -> {after:.3f} ms", file=sys.stderr)
+        if regressions:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# Personal Code: DPS-BENCH-015
+# Author: [Your Name]
+# Description: Synthetic sklearn models, scalers and imputers shaped like the real disease artifacts.
+
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+from feature_schema import PARKINSONS_SCHEMA
+from scoring import FEATURE_COLUMNS
+
+PARKINSONS_FEATURES = list(PARKINSONS_SCHEMA.names)
+
+# Rough per-feature mean and spread of the public datasets the real models were trained on
+DIABETES_STATS = (
+    [3.8, 120.9, 69.1, 20.5, 79.8, 32.0, 0.47, 33.2],
+    [3.4, 32.0, 19.4, 16.0, 115.2, 7.9, 0.33, 11.8],
+)
+HEART_STATS = (
+    [54.4, 0.68, 0.97, 131.6, 246.3, 0.15, 0.53, 149.6, 0.33, 1.04, 1.40, 0.73, 2.31],
+    [9.1, 0.47, 1.03, 17.5, 51.8, 0.36, 0.53, 22.9, 0.47, 1.16, 0.62, 1.02, 0.61],
+)
+PARKINSONS_STATS = (
+    [154.2, 197.1, 116.3, 0.0062, 0.00004, 0.0033, 0.0034, 0.0099, 0.0297, 0.282, 0.0157, 0.0179, 0.0241, 0.047,
+     0.0248, 21.9, 0.499, 0.718, -5.68, 0.227, 2.38, 0.207],
+    [41.4, 91.5, 43.5, 0.0048, 0.00003, 0.0030, 0.0028, 0.0089, 0.0189, 0.195, 0.0102, 0.0120, 0.0169, 0.0305,
+     0.0405, 4.4, 0.104, 0.055, 1.09, 0.083, 0.38, 0.090],
+)
+# Integer-coded / categorical heart columns
+HEART_DISCRETE = {"sex": 1, "cp": 3, "fbs": 1, "restecg": 2, "exang": 1, "slope": 2, "ca": 4, "thal": 3}
+
+
+def sample_features(stats, n_rows, rng, non_negative=True):
+    mean, std = (np.asarray(values) for values in stats)
+    X = mean + rng.standard_normal((n_rows, len(mean))) * std
+    return np.abs(X) if non_negative else X
+
+
+def _labels(X, rng):
+    # Noisy linear rule on standardized features so every model has signal to learn
+    Z = (X - np.nanmean(X, axis=0)) / (np.nanstd(X, axis=0) + 1e-12)
+    weights = rng.standard_normal(X.shape[1])
+    score = np.nan_to_num(Z) @ weights + rng.standard_normal(len(X)) * 0.5
+    return (score > 0).astype(int)
+
+
+def sample_heart(n_rows, rng):
+    X = sample_features(HEART_STATS, n_rows, rng)
+    for position, column in enumerate(FEATURE_COLUMNS["heart"]):
+        if column in HEART_DISCRETE:
+            X[:, position] = np.clip(np.round(X[:, position]), 0, HEART_DISCRETE[column])
+    return X
+
+
+def sample_parkinsons(n_rows, rng):
+    X = sample_features(PARKINSONS_STATS, n_rows, rng, non_negative=False)
+    # Only spread1 is negative in the real data
+    spread1 = PARKINSONS_FEATURES.index("spread1")
+    keep = [i for i in range(X.shape[1]) if i != spread1]
+    X[:, keep] = np.abs(X[:, keep])
+    return X
+
+
+def sample_rows(disease, n_rows, seed=1):
+    rng = np.random.default_rng(seed)
+    if disease == "diabetes":
+        return sample_features(DIABETES_STATS, n_rows, rng)
+    if disease == "heart":
+        return sample_heart(n_rows, rng)
+    return sample_parkinsons(n_rows, rng)
+
+
+def build_artifacts(directory, seed=0, train_rows=None):
+    # Writes one set of pickles per disease and returns paths in model_registry.DISEASE_ARTIFACTS layout
+    os.makedirs(directory, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    train_rows = train_rows or {"diabetes": 768, "heart": 303, "parkinsons": 195}
+    paths = {}
+
+    # Diabetes: StandardScaler + KNN, 8 features
+    X = sample_features(DIABETES_STATS, train_rows["diabetes"], rng)
+    y = _labels(X, rng)
+    scaler = StandardScaler().fit(X)
+    model = KNeighborsClassifier(n_neighbors=5).fit(scaler.transform(X), y)
+    paths["diabetes"] = {
+        "model": os.path.join(directory, "knn_diabetes_model.pkl"),
+        "scaler": os.path.join(directory, "scaler.pkl"),
+    }
+    joblib.dump(model, paths["diabetes"]["model"])
+    joblib.dump(scaler, paths["diabetes"]["scaler"])
+
+    # Heart: SimpleImputer + StandardScaler + random forest, 13 features with gaps
+    X = sample_heart(train_rows["heart"], rng)
+    X[rng.random(X.shape) < 0.02] = np.nan
+    y = _labels(X, rng)
+    imputer = SimpleImputer(strategy="mean").fit(X)
+    scaler = StandardScaler().fit(imputer.transform(X))
+    model = RandomForestClassifier(n_estimators=100, random_state=seed).fit(scaler.transform(imputer.transform(X)), y)
+    paths["heart"] = {
+        "model": os.path.join(directory, "heart_disease_model.pkl"),
+        "scaler": os.path.join(directory, "scaler_heart.pkl"),
+        "imputer": os.path.join(directory, "imputer.pkl"),
+    }
+    joblib.dump(model, paths["heart"]["model"])
+    joblib.dump(scaler, paths["heart"]["scaler"])
+    joblib.dump(imputer, paths["heart"]["imputer"])
+
+    # Parkinson's: StandardScaler fitted on named columns + probability SVC, 22 features
+    X = pd.DataFrame(sample_parkinsons(train_rows["parkinsons"], rng), columns=PARKINSONS_FEATURES)
+    y = _labels(X.to_numpy(), rng)
+    scaler = StandardScaler().fit(X)
+    model = SVC(probability=True, random_state=seed).fit(scaler.transform(X), y)
+    paths["parkinsons"] = {
+        "model": os.path.join(directory, "parkinsons_model.pkl"),
+        "scaler": os.path.join(directory, "parkinsons_scaler.pkl"),
+        "feature_names": os.path.join(directory, "parkinsons_feature_names.pkl"),
+    }
+    joblib.dump(model, paths["parkinsons"]["model"])
+    joblib.dump(scaler, paths["parkinsons"]["scaler"])
+    joblib.dump(list(PARKINSONS_FEATURES), paths["parkinsons"]["feature_names"])
+    return paths
@@ -0,0 +1,14 @@
+# Personal Code: DPS-TEST-029
+# Author: [Your Name]
+# Description: Makes the top-level app modules importable from tests/ when pytest runs from the repository root.
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# App state read from the environment at import time goes to a scratch directory, not the working tree
+_state_dir = tempfile.mkdtemp(prefix="dps-tests-")
+for name, default in [("DPS_USER_DB", "users.db"), ("DPS_HISTORY_DB", "history.db"), ("DPS_BUNDLE_DIR", "bundles"), ("DPS_DRIFT_DIR", "drift")]:
+    os.environ.setdefault(name, os.path.join(_state_dir, default))
@@ -0,0 +1,330 @@
+# Personal Code: DPS-CORE-026
+# Author: [Your Name]
+# Description: Constant-memory streaming statistics per model feature, compared with the training data to score input drift.
+#
+# Per feature: count, running mean and M2 (Welford, merged batch-wise with Chan's formula), missing count,
+# and a fixed-bin histogram of standardized values used as the quantile sketch. Memory does not grow with traffic.
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+import metrics
+from feature_schema import schema_for
+
+# Snapshots go to <DPS_DRIFT_DIR>/<source>-<disease>.json every DPS_DRIFT_SNAPSHOT_SECONDS. Each kind of process
+# keeps its own file so they never overwrite one another's counts: the app writes <disease>.json, the inference
+# service and bulk-scoring CLI call use_source(); DPS_DRIFT_SOURCE overrides all of them
+SNAPSHOT_DIR = os.environ.get("DPS_DRIFT_DIR", "drift")
+SNAPSHOT_SOURCE = os.environ.get("DPS_DRIFT_SOURCE", "app")
+SNAPSHOT_INTERVAL = float(os.environ.get("DPS_DRIFT_SNAPSHOT_SECONDS", "60"))
+# Histogram over standardized values: HISTOGRAM_BINS bins across +-HISTOGRAM_RANGE, plus one overflow bin each side
+HISTOGRAM_RANGE = 5.0
+HISTOGRAM_BINS = 100
+QUANTILES = (0.05, 0.5, 0.95)
+# A feature is flagged once MIN_ROWS rows are seen and any of these limits is exceeded
+MIN_ROWS = 30
+MEAN_SHIFT_LIMIT = 0.5
+STD_RATIO_LIMITS = (0.5, 2.0)
+MISSING_RATE_LIMIT = 0.1
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+_writer = None
+
+
+def reference_stats(artifacts):
+    # Training-data mean and standard deviation per feature, in original units; None if neither is recorded
+    saved = artifacts.get("reference_stats")
+    if saved is not None:
+        return np.asarray(saved["mean"], dtype=np.float64), np.asarray(saved["std"], dtype=np.float64)
+    # Only a StandardScaler stores them; other scalers' center and scale (median/IQR, range) are not a mean and std
+    scaler = artifacts.get("scaler")
+    if isinstance(scaler, StandardScaler) and scaler.mean_ is not None and scaler.scale_ is not None:
+        return np.asarray(scaler.mean_, dtype=np.float64), np.asarray(scaler.scale_, dtype=np.float64)
+    return None
+
+
+class FeatureMonitor:
+    def __init__(self, disease, names, reference=None):
+        d = len(names)
+        self.disease = disease
+        self.names = list(names)
+        self.lock = threading.Lock()
+        if reference is None:
+            self.ref_mean, self.ref_std = np.full(d, np.nan), np.full(d, np.nan)
+        else:
+            self.ref_mean = np.asarray(reference[0], dtype=np.float64)
+            self.ref_std = np.where(reference[1] > 0, reference[1], 1.0)
+        self.rows = 0
+        self.count = np.zeros(d, dtype=np.int64)
+        self.missing = np.zeros(d, dtype=np.int64)
+        self.mean = np.zeros(d)
+        self.m2 = np.zeros(d)
+        self.histogram = np.zeros((d, HISTOGRAM_BINS + 2), dtype=np.int64)
+        self.updated_at = None
+        # Whether the last snapshot showed drift, so an alert is counted once per episode
+        self.alerting = False
+
+    def matches(self, names, reference):
+        if list(names) != self.names:
+            return False
+        if reference is None:
+            return bool(np.isnan(self.ref_mean).all())
+        return np.allclose(self.ref_mean, reference[0]) and np.allclose(self.ref_std, np.where(reference[1] > 0, reference[1], 1.0))
+
+    def _center(self):
+        return np.where(np.isnan(self.ref_mean), 0.0, self.ref_mean)
+
+    def _spread(self):
+        return np.where(np.isnan(self.ref_std), 1.0, self.ref_std)
+
+    def update(self, X):
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        missing = np.isnan(X)
+        present = ~missing
+        n_b = present.sum(axis=0)
+        safe_n = np.maximum(n_b, 1)
+        mean_b = np.where(present, X, 0.0).sum(axis=0) / safe_n
+        m2_b = np.where(present, (X - mean_b) ** 2, 0.0).sum(axis=0)
+
+        # Bin standardized values; without reference statistics the raw values are binned
+        z = (np.where(present, X, 0.0) - self._center()) / self._spread()
+        bins = np.clip(np.floor((z + HISTOGRAM_RANGE) / (2 * HISTOGRAM_RANGE) * HISTOGRAM_BINS).astype(np.int64) + 1, 0, HISTOGRAM_BINS + 1)
+        flat = (bins + np.arange(len(self.names)) * (HISTOGRAM_BINS + 2))[present]
+        counts = np.bincount(flat, minlength=self.histogram.size).reshape(self.histogram.shape)
+
+        with self.lock:
+            # Chan et al. merge of the batch moments into the running ones
+            n_a = self.count
+            total = n_a + n_b
+            safe_total = np.maximum(total, 1)
+            delta = mean_b - self.mean
+            self.mean = np.where(total > 0, self.mean + delta * n_b / safe_total, self.mean)
+            self.m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / safe_total
+            self.count = total
+            self.missing += missing.sum(axis=0)
+            self.rows += len(X)
+            self.histogram += counts
+            self.updated_at = time.time()
+
+    def _quantiles(self, histogram, count):
+        # Linear interpolation inside the bin holding each quantile, mapped back to original units
+        edges = np.linspace(-HISTOGRAM_RANGE, HISTOGRAM_RANGE, HISTOGRAM_BINS + 1)
+        width = edges[1] - edges[0]
+        cumulative = np.cumsum(histogram)
+        values = []
+        for q in QUANTILES:
+            target = q * count
+            index = int(np.searchsorted(cumulative, target))
+            if index == 0:
+                z = -HISTOGRAM_RANGE
+            elif index >= HISTOGRAM_BINS + 1:
+                z = HISTOGRAM_RANGE
+            else:
+                before = cumulative[index - 1]
+                z = edges[index - 1] + width * (target - before) / max(histogram[index], 1)
+            values.append(z)
+        return values
+
+    def report(self):
+        with self.lock:
+            rows, count, missing = self.rows, self.count.copy(), self.missing.copy()
+            mean, m2, histogram = self.mean.copy(), self.m2.copy(), self.histogram.copy()
+        features = []
+        for j, name in enumerate(self.names):
+            n = int(count[j])
+            std = float(np.sqrt(m2[j] / (n - 1))) if n > 1 else None
+            missing_rate = float(missing[j] / rows) if rows else 0.0
+            has_reference = not np.isnan(self.ref_mean[j])
+            entry = {
+                "feature": name,
+                "count": n,
+                "missing_rate": missing_rate,
+                "mean": float(mean[j]) if n else None,
+                "std": std,
+                "reference_mean": float(self.ref_mean[j]) if has_reference else None,
+                "reference_std": float(self.ref_std[j]) if has_reference else None,
+                "mean_shift": None,
+                "std_ratio": None,
+                "quantiles": None,
+                "drift_score": None,
+                "drifted": False,
+            }
+            if n:
+                center, spread = self._center()[j], self._spread()[j]
+                entry["quantiles"] = {f"p{int(q * 100):02d}": float(center + z * spread) for q, z in zip(QUANTILES, self._quantiles(histogram[j], n))}
+            if has_reference and n:
+                # Mean shift in reference standard deviations, spread as a ratio; the score is the larger deviation
+                entry["mean_shift"] = float((mean[j] - self.ref_mean[j]) / self.ref_std[j])
+                if std is not None:
+                    entry["std_ratio"] = std / float(self.ref_std[j])
+                log_ratio = abs(np.log(entry["std_ratio"])) if entry["std_ratio"] else 0.0
+                entry["drift_score"] = float(max(abs(entry["mean_shift"]), log_ratio))
+            shifted = n >= MIN_ROWS and (
+                (entry["mean_shift"] is not None and abs(entry["mean_shift"]) > MEAN_SHIFT_LIMIT)
+                or (entry["std_ratio"] is not None and not STD_RATIO_LIMITS[0] <= entry["std_ratio"] <= STD_RATIO_LIMITS[1])
+            )
+            entry["drifted"] = bool(shifted or (rows >= MIN_ROWS and missing_rate > MISSING_RATE_LIMIT))
+            features.append(entry)
+        return {
+            "disease": self.disease,
+            "rows": rows,
+            "updated_at": self.updated_at,
+            "drifted_features": [entry["feature"] for entry in features if entry["drifted"]],
+            "features": features,
+        }
+
+    def state(self):
+        # Everything needed to resume after a restart
+        with self.lock:
+            return {
+                "names": self.names,
+                "reference_mean": self.ref_mean.tolist(),
+                "reference_std": self.ref_std.tolist(),
+                "rows": self.rows,
+                "count": self.count.tolist(),
+                "missing": self.missing.tolist(),
+                "mean": self.mean.tolist(),
+                "m2": self.m2.tolist(),
+                "histogram": self.histogram.tolist(),
+                "updated_at": self.updated_at,
+            }
+
+    def restore(self, state):
+        with self.lock:
+            self.rows = state["rows"]
+            self.count = np.asarray(state["count"], dtype=np.int64)
+            self.missing = np.asarray(state["missing"], dtype=np.int64)
+            self.mean = np.asarray(state["mean"], dtype=np.float64)
+            self.m2 = np.asarray(state["m2"], dtype=np.float64)
+            self.histogram = np.asarray(state["histogram"], dtype=np.int64)
+            self.updated_at = state["updated_at"]
+
+
+def get_monitor(disease, artifacts):
+    # One monitor per disease; new reference statistics or reordered features start a fresh one
+    names = schema_for(disease, artifacts).names
+    reference = reference_stats(artifacts)
+    monitor = _monitors.get(disease)
+    if monitor is not None and monitor.matches(names, reference):
+        return monitor
+    with _monitors_lock:
+        monitor = _monitors.get(disease)
+        if monitor is None or not monitor.matches(names, reference):
+            if monitor is not None:
+                # Keep the retired model's statistics on disk before they are dropped
+                try:
+                    _write_snapshot(monitor)
+                except OSError:
+                    metrics.increment("drift.snapshot_error")
+            monitor = FeatureMonitor(disease, names, reference)
+            _resume(monitor)
+            _monitors[disease] = monitor
+        _start_writer()
+    return monitor
+
+
+def observe(disease, artifacts, X):
+    # Called with every scored row or batch (model feature order); never breaks a prediction
+    try:
+        with metrics.span("drift.observe"):
+            monitor = get_monitor(disease, artifacts)
+            monitor.update(X)
+    except Exception:
+        metrics.increment("drift.observe_error")
+
+
+def use_source(source):
+    # Called by a process's entry point before its first observation
+    global SNAPSHOT_SOURCE
+    if "DPS_DRIFT_SOURCE" not in os.environ:
+        SNAPSHOT_SOURCE = source
+
+
+def report(disease, source=None):
+    # Live statistics from this process, else the last snapshot on disk (e.g. another source's, or before a restart)
+    monitor = _monitors.get(disease)
+    if monitor is not None and source in (None, SNAPSHOT_SOURCE):
+        return monitor.report()
+    try:
+        with open(snapshot_path(disease, source=source)) as f:
+            return json.load(f)["report"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def reports():
+    with _monitors_lock:
+        monitors = list(_monitors.values())
+    return {monitor.disease: monitor.report() for monitor in monitors}
+
+
+def snapshot_path(disease, directory=None, source=None):
+    source = source or SNAPSHOT_SOURCE
+    name = f"{disease}.json" if source == "app" else f"{source}-{disease}.json"
+    return os.path.join(directory or SNAPSHOT_DIR, name)
+
+
+def _write_snapshot(monitor):
+    path = snapshot_path(monitor.disease)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    result = monitor.report()
+    payload = {"written_at": time.time(), "report": result, "state": monitor.state()}
+    fd, staging = tempfile.mkstemp(prefix=".drift-", dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f)
+        os.replace(staging, path)
+    except BaseException:
+        if os.path.exists(staging):
+            os.remove(staging)
+        raise
+    # Counts each move into the drifted state, not every snapshot taken while drift lasts
+    drifted = bool(result["drifted_features"])
+    if drifted and not monitor.alerting:
+        metrics.increment(f"drift.{monitor.disease}.drift_alert")
+    monitor.alerting = drifted
+
+
+def _resume(monitor):
+    # Continue from the last snapshot when it was taken against the same features and reference statistics
+    try:
+        with open(snapshot_path(monitor.disease)) as f:
+            state = json.load(f)["state"]
+    except (OSError, ValueError, KeyError):
+        return
+    reference = np.asarray(state["reference_mean"], dtype=np.float64), np.asarray(state["reference_std"], dtype=np.float64)
+    same_reference = np.allclose(reference[0], monitor.ref_mean, equal_nan=True) and np.allclose(reference[1], monitor.ref_std, equal_nan=True)
+    if state["names"] == monitor.names and same_reference:
+        monitor.restore(state)
+
+
+def write_snapshots():
+    with _monitors_lock:
+        monitors = list(_monitors.values())
+    for monitor in monitors:
+        if monitor.updated_at is not None:
+            try:
+                _write_snapshot(monitor)
+            except OSError:
+                metrics.increment("drift.snapshot_error")
+
+
+def _snapshot_loop():
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        write_snapshots()
+
+
+def _start_writer():
+    # Caller holds _monitors_lock
+    global _writer
+    if _writer is None:
+        _writer = threading.Thread(target=_snapshot_loop, name="drift-snapshots", daemon=True)
+        _writer.start()
+        atexit.register(write_snapshots)
@@ -0,0 +1,196 @@
+# Personal Code: DPS-AUTH-012
+# Author: [Your Name]
+# Description: Persistent email outbox drained by a background worker over one reused SMTP connection.
+
+import os
+import smtplib
+import threading
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from account_store import get_store
+
+# SMTP settings (point SMTP_HOST/SMTP_PORT at a local stand-in and set SMTP_STARTTLS=0 for testing)
+SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMTP_PORT", "587"))
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "1") == "1"
+# Credentials come only from the environment; without them the server is used without login
+SMTP_USER = os.environ.get("SMTP_USER", "")
+SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
+SENDER_EMAIL = os.environ.get("SMTP_SENDER", SMTP_USER)
+
+BATCH_SIZE = 20
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 30.0
+BACKOFF_MAX = 3600.0
+# A claimed message is retried by another worker if not finished within this time
+LEASE_SECONDS = 300.0
+# The SMTP connection is closed after this long without mail to send
+IDLE_DISCONNECT = 60.0
+POLL_INTERVAL = 5.0
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        to_email TEXT NOT NULL,
+        subject TEXT NOT NULL,
+        body TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt_at REAL NOT NULL,
+        lease_until REAL NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL,
+        sent_at REAL,
+        failed INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT)""",
+    "CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (next_attempt_at) WHERE sent_at IS NULL AND failed = 0",
+]
+_INSERT = "INSERT INTO outbox (to_email, subject, body, next_attempt_at, created_at) VALUES (?, ?, ?, ?, ?)"
+_SELECT_DUE = (
+    "SELECT id, to_email, subject, body, attempts FROM outbox "
+    "WHERE sent_at IS NULL AND failed = 0 AND next_attempt_at <= ? AND lease_until <= ? ORDER BY next_attempt_at LIMIT ?"
+)
+_CLAIM = "UPDATE outbox SET lease_until = ? WHERE id = ?"
+_MARK_SENT = "UPDATE outbox SET sent_at = ?, attempts = attempts + 1, last_error = NULL WHERE id = ?"
+_MARK_RETRY = "UPDATE outbox SET attempts = ?, next_attempt_at = ?, lease_until = 0, failed = ?, last_error = ? WHERE id = ?"
+
+
+def ensure_schema(conn):
+    with conn:
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+
+def enqueue(conn, to_email, subject, body):
+    # Runs inside the caller's transaction so the message commits together with the account
+    now = time.time()
+    conn.execute(_INSERT, (to_email, subject, body, now, now))
+
+
+def backoff_delay(attempts):
+    return min(BACKOFF_BASE * (2 ** (attempts - 1)), BACKOFF_MAX)
+
+
+def build_message(sender, to_email, subject, body):
+    msg = MIMEMultipart()
+    msg['From'] = sender
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def default_smtp_factory():
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+    if SMTP_STARTTLS:
+        server.starttls()
+    if SMTP_USER and SMTP_PASSWORD:
+        server.login(SMTP_USER, SMTP_PASSWORD)
+    return server
+
+
+class OutboxWorker:
+    def __init__(self, store=None, smtp_factory=default_smtp_factory, sender=SENDER_EMAIL, batch_size=BATCH_SIZE):
+        self.store = store or get_store()
+        self.smtp_factory = smtp_factory
+        self.sender = sender
+        self.batch_size = batch_size
+        self.server = None
+        self.last_used = 0.0
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        ensure_schema(self.store.connection())
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        self.stopping.set()
+        self.wake.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self._disconnect()
+
+    def notify(self):
+        self.wake.set()
+
+    def _claim(self, conn):
+        now = time.time()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(_SELECT_DUE, (now, now, self.batch_size)).fetchall()
+            conn.executemany(_CLAIM, [(now + LEASE_SECONDS, row[0]) for row in rows])
+        return rows
+
+    def _connect(self):
+        if self.server is None:
+            self.server = self.smtp_factory()
+        return self.server
+
+    def _disconnect(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                pass
+            self._drop()
+
+    def _drop(self):
+        # Broken connection: close the socket without a QUIT round trip
+        if self.server is not None:
+            try:
+                self.server.close()
+            except Exception:
+                pass
+            self.server = None
+
+    def drain_once(self):
+        # Send one batch over the shared connection; returns the number of messages handled
+        conn = self.store.connection()
+        rows = self._claim(conn)
+        for message_id, to_email, subject, body, attempts in rows:
+            try:
+                self._connect().send_message(build_message(self.sender, to_email, subject, body))
+            except Exception as e:
+                # Broken connections are closed and reopened on the next attempt; a message the
+                # server rejects (any other SMTPException, itself an OSError) keeps the connection
+                if isinstance(e, smtplib.SMTPServerDisconnected) or (isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)):
+                    self._drop()
+                attempts += 1
+                failed = 1 if attempts >= MAX_ATTEMPTS else 0
+                with conn:
+                    conn.execute(_MARK_RETRY, (attempts, time.time() + backoff_delay(attempts), failed, str(e), message_id))
+                continue
+            with conn:
+                conn.execute(_MARK_SENT, (time.time(), message_id))
+        if rows:
+            self.last_used = time.time()
+        return len(rows)
+
+    def _run(self):
+        while not self.stopping.is_set():
+            try:
+                handled = self.drain_once()
+            except Exception:
+                handled = 0
+            if handled:
+                continue
+            if self.server is not None and time.time() - self.last_used > IDLE_DISCONNECT:
+                self._disconnect()
+            self.wake.wait(POLL_INTERVAL)
+            self.wake.clear()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_worker():
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = OutboxWorker().start()
+        return _worker
@@ -0,0 +1,292 @@
+# Personal Code: DPS-CORE-009
+# Author: [Your Name]
+# Description: Compiles fitted imputer -> scaler -> model objects into a NumPy-only inference kernel without sklearn's per-call validation.
+
+import threading
+import numpy as np
+import metrics
+
+# Kernels are checked against sklearn on these many probe rows before use
+PROBE_ROWS = 64
+PARITY_TOLERANCE = 1e-9
+_CACHE_SIZE = 16
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+
+def _expit(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _contiguous(values, dtype=np.float64):
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+class FusedPipeline:
+    # kind is "linear", "trees" or "boosting"; "sklearn" calls the model as-is after NumPy
+    # preprocessing and "reference" runs the original sklearn objects end to end
+    def __init__(self, kind, classes, arrays, model=None, artifacts=None):
+        self.kind = kind
+        self.classes = np.asarray(classes)
+        self.arrays = arrays
+        self.model = model
+        self.artifacts = artifacts
+        self.n_features = arrays["n_features"]
+        self.model_stage = f"model_{kind}"
+        self.handles_missing = "fill" in arrays or (artifacts is not None and artifacts.get("imputer") is not None)
+
+    def preprocess(self, X):
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if self.kind == "reference":
+            # Same space the model (and a KNN neighbour index) was fitted in
+            if self.artifacts.get("imputer") is not None:
+                X = self.artifacts["imputer"].transform(X)
+            return np.asarray(self.artifacts["scaler"].transform(X), dtype=np.float64)
+        arrays = self.arrays
+
+        # Same operation order as SimpleImputer / StandardScaler / MinMaxScaler / RobustScaler
+        if "fill" in arrays:
+            missing = np.isnan(X) if arrays["missing_is_nan"] else X == arrays["missing_value"]
+            if missing.any():
+                X = np.where(missing, arrays["fill"], X)
+        if "center" in arrays:
+            X -= arrays["center"]
+        if "divisor" in arrays:
+            X /= arrays["divisor"]
+        if "multiplier" in arrays:
+            X *= arrays["multiplier"]
+        if "offset" in arrays:
+            X += arrays["offset"]
+        return X
+
+    def inverse_preprocess(self, Z):
+        # Scaled values back to original units (imputed values are not undone)
+        if self.kind == "reference":
+            return self.artifacts["scaler"].inverse_transform(np.array(Z, dtype=np.float64, ndmin=2))
+        X = np.array(Z, dtype=np.float64, ndmin=2)
+        arrays = self.arrays
+        if "offset" in arrays:
+            X -= arrays["offset"]
+        if "multiplier" in arrays:
+            X /= arrays["multiplier"]
+        if "divisor" in arrays:
+            X *= arrays["divisor"]
+        if "center" in arrays:
+            X += arrays["center"]
+        return X
+
+    def _positive_proba_linear(self, Z):
+        decision = Z @ self.arrays["coef"] + self.arrays["intercept"]
+        return _expit(self.arrays["logit_factor"] * decision)
+
+    def _leaf_values(self, Z):
+        # Walk every tree for every row at once; trees compare on float32 like sklearn
+        arrays = self.arrays
+        Z = Z.astype(np.float32).astype(np.float64)
+        node = np.broadcast_to(arrays["roots"], (len(Z), len(arrays["roots"]))).copy()
+        rows = np.arange(len(Z))[:, None]
+        for _ in range(arrays["max_depth"]):
+            left = arrays["left"][node]
+            internal = left != -1
+            if not internal.any():
+                break
+            go_left = Z[rows, arrays["feature"][node]] <= arrays["threshold"][node]
+            node = np.where(internal, np.where(go_left, left, arrays["right"][node]), node)
+        return arrays["value"][node]
+
+    def predict_proba(self, X):
+        if self.kind == "reference":
+            with metrics.span(self.model_stage):
+                return _reference_proba(self.artifacts, np.array(X, dtype=np.float64, ndmin=2))
+        # Imputation and scaling
+        with metrics.span("preprocess"):
+            Z = self.preprocess(X)
+        with metrics.span(self.model_stage):
+            return self.model_proba(Z)
+
+    def model_proba(self, Z):
+        # Class probabilities for rows that are already imputed and scaled
+        if self.kind == "linear":
+            positive = self._positive_proba_linear(Z)
+            return np.column_stack([1.0 - positive, positive])
+        if self.kind == "trees":
+            return self._leaf_values(Z).mean(axis=1)
+        if self.kind == "boosting":
+            raw = self.arrays["init_raw"] + self.arrays["learning_rate"] * self._leaf_values(Z)[:, :, 0].sum(axis=1)
+            positive = _expit(raw)
+            return np.column_stack([1.0 - positive, positive])
+        if self.kind == "reference":
+            return self.artifacts["model"].predict_proba(Z)
+        return self.model.predict_proba(Z)
+
+    def predict(self, X):
+        # Label and both class probabilities from a single pass
+        probabilities = self.predict_proba(X)
+        return self.classes[np.argmax(probabilities, axis=1)], probabilities
+
+
+def _preprocessing_arrays(imputer, scaler, n_features):
+    arrays = {"n_features": n_features}
+    if imputer is not None:
+        if type(imputer).__name__ != "SimpleImputer" or getattr(imputer, "add_indicator", False):
+            raise TypeError(f"Unsupported imputer: {type(imputer).__name__}")
+        fill = _contiguous(imputer.statistics_)
+        if len(fill) != n_features or np.isnan(fill).any():
+            raise TypeError("Imputer drops empty features")
+        missing_value = imputer.missing_values
+        arrays["fill"] = fill
+        arrays["missing_is_nan"] = missing_value is None or (isinstance(missing_value, float) and np.isnan(missing_value))
+        arrays["missing_value"] = missing_value
+
+    name = type(scaler).__name__
+    # mean_ is fitted even with with_mean=False, so the flags decide what transform() applies
+    if name == "StandardScaler":
+        if scaler.with_mean and getattr(scaler, "mean_", None) is not None:
+            arrays["center"] = _contiguous(scaler.mean_)
+        if scaler.with_std and getattr(scaler, "scale_", None) is not None:
+            arrays["divisor"] = _contiguous(scaler.scale_)
+    elif name == "RobustScaler":
+        if scaler.with_centering and getattr(scaler, "center_", None) is not None:
+            arrays["center"] = _contiguous(scaler.center_)
+        if scaler.with_scaling and getattr(scaler, "scale_", None) is not None:
+            arrays["divisor"] = _contiguous(scaler.scale_)
+    elif name == "MinMaxScaler" and not getattr(scaler, "clip", False):
+        arrays["multiplier"] = _contiguous(scaler.scale_)
+        arrays["offset"] = _contiguous(scaler.min_)
+    else:
+        raise TypeError(f"Unsupported scaler: {name}")
+    return arrays
+
+
+def _pack_trees(trees, n_classes, normalize):
+    # Concatenate every tree into one set of node arrays with per-tree root offsets
+    left, right, feature, threshold, value, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        t = tree.tree_
+        internal = t.children_left != -1
+        left.append(np.where(internal, t.children_left + offset, -1))
+        right.append(np.where(internal, t.children_right + offset, -1))
+        feature.append(np.where(internal, t.feature, 0))
+        threshold.append(t.threshold)
+        leaf = t.value[:, 0, :n_classes].astype(np.float64)
+        if normalize:
+            totals = leaf.sum(axis=1, keepdims=True)
+            leaf = np.divide(leaf, totals, out=np.zeros_like(leaf), where=totals > 0)
+        value.append(leaf)
+        roots.append(offset)
+        offset += t.node_count
+        max_depth = max(max_depth, t.max_depth)
+    return {
+        "left": _contiguous(np.concatenate(left), np.intp),
+        "right": _contiguous(np.concatenate(right), np.intp),
+        "feature": _contiguous(np.concatenate(feature), np.intp),
+        "threshold": _contiguous(np.concatenate(threshold)),
+        "value": _contiguous(np.concatenate(value)),
+        "roots": _contiguous(roots, np.intp),
+        "max_depth": max_depth,
+    }
+
+
+def _model_arrays(model, n_features):
+    name = type(model).__name__
+    classes = model.classes_
+    if len(classes) != 2:
+        raise TypeError("Only binary classifiers are compiled")
+
+    if name in ("LogisticRegression", "LogisticRegressionCV"):
+        return "linear", {
+            "coef": _contiguous(model.coef_[0]),
+            "intercept": float(model.intercept_[0]),
+            # Binary multinomial models apply softmax to [-d, d], i.e. sigmoid(2d)
+            "logit_factor": 2.0 if getattr(model, "multi_class", "auto") == "multinomial" else 1.0,
+        }
+    if name in ("DecisionTreeClassifier", "ExtraTreeClassifier"):
+        return "trees", _pack_trees([model], 2, normalize=True)
+    if name in ("RandomForestClassifier", "ExtraTreesClassifier"):
+        return "trees", _pack_trees(model.estimators_, 2, normalize=True)
+    if name == "GradientBoostingClassifier" and getattr(model, "loss", None) in ("log_loss", "deviance"):
+        if model.init_ == "zero":
+            init_raw = 0.0
+        else:
+            init_raw = float(model._raw_predict_init(np.zeros((1, n_features)))[0, 0])
+        arrays = _pack_trees(model.estimators_[:, 0], 1, normalize=False)
+        arrays["init_raw"] = init_raw
+        arrays["learning_rate"] = float(model.learning_rate)
+        return "boosting", arrays
+    raise TypeError(f"Unsupported model: {name}")
+
+
+def _probe_rows(pipeline, n_features, seed=0):
+    # Rows spread around the scaler's fitted range, with gaps when an imputer is present
+    rng = np.random.default_rng(seed)
+    arrays = pipeline.arrays
+    center = arrays.get("center", np.zeros(n_features))
+    spread = arrays.get("divisor", np.ones(n_features))
+    if "multiplier" in arrays:
+        spread = 1.0 / np.where(arrays["multiplier"] == 0, 1.0, arrays["multiplier"])
+        center = -arrays["offset"] * spread + spread / 2
+    X = center + rng.standard_normal((PROBE_ROWS, n_features)) * spread
+    if "fill" in arrays and arrays["missing_is_nan"]:
+        X[rng.random(X.shape) < 0.1] = np.nan
+    return X
+
+
+def _reference_proba(artifacts, X):
+    if artifacts.get("imputer") is not None:
+        X = artifacts["imputer"].transform(X)
+    return artifacts["model"].predict_proba(artifacts["scaler"].transform(X))
+
+
+def check_parity(pipeline, artifacts, X=None):
+    X = _probe_rows(pipeline, pipeline.n_features) if X is None else np.array(X, dtype=np.float64, ndmin=2)
+    return np.allclose(pipeline.predict_proba(X), _reference_proba(artifacts, X), rtol=0, atol=PARITY_TOLERANCE)
+
+
+def compile_pipeline(artifacts, verify=True):
+    model = artifacts["model"]
+    scaler = artifacts["scaler"]
+    imputer = artifacts.get("imputer")
+    n_features = int(scaler.n_features_in_)
+    try:
+        preprocessing = _preprocessing_arrays(imputer, scaler, n_features)
+    except (TypeError, AttributeError):
+        return FusedPipeline("reference", model.classes_, {"n_features": n_features}, artifacts=artifacts)
+
+    try:
+        kind, model_arrays = _model_arrays(model, n_features)
+        pipeline = FusedPipeline(kind, model.classes_, {**preprocessing, **model_arrays})
+    except (TypeError, AttributeError):
+        # No NumPy kernel for this model; KNN uses its persisted neighbour index when available
+        index = artifacts.get("neighbour_index")
+        pipeline = FusedPipeline("sklearn", model.classes_, preprocessing, model=model if index is None else index)
+
+    # Every kind, including NumPy preprocessing in front of the sklearn model, must match the original
+    # objects on the probe rows; otherwise the original objects are run end to end
+    if verify and not check_parity(pipeline, artifacts):
+        return FusedPipeline("reference", model.classes_, {"n_features": n_features}, artifacts=artifacts)
+    return pipeline
+
+
+def get_pipeline(artifacts):
+    # Model bundles carry an already compiled pipeline
+    if "pipeline" in artifacts:
+        return artifacts["pipeline"]
+    # Compiled once per set of loaded artifact objects; the registry hands out the same objects until a file changes
+    key = tuple(id(artifacts[name]) for name in ("model", "scaler", "imputer", "neighbour_index") if name in artifacts)
+    entry = _compiled.get(key)
+    if entry is not None and entry[0]["model"] is artifacts["model"]:
+        return entry[1]
+    with _compiled_lock:
+        entry = _compiled.get(key)
+        if entry is not None and entry[0]["model"] is artifacts["model"]:
+            return entry[1]
+        pipeline = compile_pipeline(artifacts)
+        if len(_compiled) >= _CACHE_SIZE:
+            _compiled.pop(next(iter(_compiled)))
+        _compiled[key] = (dict(artifacts), pipeline)
+        return pipeline
@@ -0,0 +1,208 @@
+# Personal Code: DPS-CORE-020
+# Author: [Your Name]
+# Description: Declarative feature schemas that drive the input forms, validation and model-ordered feature arrays.
+
+import numpy as np
+
+
+class Feature:
+    # dtype is "int" or "float"; options maps a categorical code to its display label;
+    # sweep is the (low, high) range the what-if panel explores for numeric features
+    def __init__(self, name, label, default, dtype="float", min_value=0.0, max_value=None, step=None, fmt=None, help=None, options=None, sweep=None):
+        self.name = name
+        self.label = label
+        self.default = default
+        self.dtype = dtype
+        self.min_value = min_value
+        self.max_value = max_value
+        self.step = step
+        self.fmt = fmt
+        self.help = help
+        self.options = options
+        self.sweep = sweep
+
+    def cast(self, value):
+        return int(value) if self.dtype == "int" else float(value)
+
+    def sweep_values(self, steps):
+        # Grid the what-if panel scores; every code for categorical features
+        if self.options is not None:
+            return np.array(list(self.options), dtype=np.float64)
+        low, high = self.sweep
+        values = np.linspace(low, high, steps)
+        return np.unique(np.round(values)) if self.dtype == "int" else values
+
+
+class Schema:
+    # Feature order is the model column order
+    def __init__(self, features, require_nonzero=False):
+        self.features = list(features)
+        self.names = [feature.name for feature in self.features]
+        self.positions = {name: position for position, name in enumerate(self.names)}
+        self.require_nonzero = require_nonzero
+
+    def __len__(self):
+        return len(self.features)
+
+    def reordered(self, names):
+        # Schema in the column order stored with a model; unknown columns get a plain numeric field
+        known = {feature.name: feature for feature in self.features}
+        features = [known.get(name) or Feature(name, name, 0.0) for name in names]
+        return Schema(features, self.require_nonzero)
+
+    def validate(self, values):
+        errors = []
+        for feature in self.features:
+            value = values.get(feature.name)
+            if value is None:
+                errors.append(f"{feature.label} is required.")
+            elif feature.options is not None and value not in feature.options:
+                errors.append(f"{feature.label} must be one of {', '.join(map(str, feature.options))}.")
+            elif feature.min_value is not None and value < feature.min_value:
+                errors.append(f"{feature.label} must be at least {feature.min_value}.")
+            elif feature.max_value is not None and value > feature.max_value:
+                errors.append(f"{feature.label} must be at most {feature.max_value}.")
+        if self.require_nonzero and not errors and all(values[name] == 0 for name in self.names):
+            errors.append("Please enter at least one non-zero value.")
+        return errors
+
+    def to_array(self, values, out=None):
+        # Single row written straight into a contiguous float64 buffer in model column order
+        if out is None:
+            out = np.empty((1, len(self.names)), dtype=np.float64)
+        row = out[0]
+        for position, name in enumerate(self.names):
+            row[position] = values[name]
+        return out
+
+    def rows_to_array(self, records, out=None):
+        if out is None:
+            out = np.empty((len(records), len(self.names)), dtype=np.float64)
+        for i, values in enumerate(records):
+            self.to_array(values, out[i:i + 1])
+        return out
+
+    def sweepable(self):
+        return [feature for feature in self.features if feature.options is not None or feature.sweep is not None]
+
+    def defaults(self):
+        return {feature.name: feature.default for feature in self.features}
+
+    def render_form(self, n_columns=2, column_major=True, key_prefix="", blank=False, skip=()):
+        # Streamlit widgets for every feature not in skip; column_major fills the first column before the next.
+        # blank=True starts every widget empty, so unanswered fields come back as None.
+        import streamlit as st
+        features = [feature for feature in self.features if feature.name not in skip]
+        cols = st.columns(n_columns)
+        per_column = -(-len(features) // n_columns)
+        values = {}
+        for idx, feature in enumerate(features):
+            column = idx // per_column if column_major else idx % n_columns
+            with cols[column]:
+                values[feature.name] = render_widget(feature, key=f"{key_prefix}{feature.name}", blank=blank)
+        return values
+
+
+def render_widget(feature, key=None, default=None, blank=False, label=None):
+    import streamlit as st
+    default = feature.default if default is None else default
+    label = label or feature.label
+    if feature.options is not None:
+        codes = list(feature.options)
+        return st.selectbox(
+            label, codes, index=None if blank else codes.index(default), format_func=lambda code: feature.options[code],
+            help=feature.help, key=key
+        )
+    kwargs = {}
+    if feature.step is not None:
+        kwargs["step"] = feature.cast(feature.step)
+    if feature.fmt is not None:
+        kwargs["format"] = feature.fmt
+    return st.number_input(
+        label,
+        min_value=None if feature.min_value is None else feature.cast(feature.min_value),
+        max_value=None if feature.max_value is None else feature.cast(feature.max_value),
+        value=None if blank else feature.cast(default), help=feature.help, key=key, **kwargs
+    )
+
+
+DIABETES_SCHEMA = Schema([
+    Feature("Pregnancies", "Number of Pregnancies", 0, "int", 0, 20, help="Number of times pregnant", sweep=(0, 15)),
+    Feature("Glucose", "Glucose (mg/dl)", 100.0, help="Plasma glucose concentration", sweep=(50, 250)),
+    Feature("BloodPressure", "Blood Pressure (mm Hg)", 70.0, help="Diastolic blood pressure", sweep=(40, 130)),
+    Feature("SkinThickness", "Skin Thickness (mm)", 20.0, help="Triceps skin fold thickness", sweep=(0, 70)),
+    Feature("Insulin", "Insulin (mu U/ml)", 80.0, help="2-Hour serum insulin", sweep=(0, 600)),
+    Feature("BMI", "BMI", 30.0, help="Body mass index (kg/m²)", sweep=(15, 60)),
+    Feature("DiabetesPedigreeFunction", "Diabetes Pedigree Function", 0.5, help="Family history of diabetes", sweep=(0.05, 2.5)),
+    Feature("Age", "Age (years)", 30, "int", 0, 120, help="Age in years", sweep=(20, 85)),
+])
+
+HEART_SCHEMA = Schema([
+    Feature("age", "Age (years)", 50, "int", 0, 120, help="Age in years", sweep=(25, 85)),
+    Feature("sex", "Gender", 0, "int", options={0: "Female", 1: "Male"}, help="Biological sex"),
+    Feature("cp", "Chest Pain Type", 0, "int", options={0: "None", 1: "Typical Angina", 2: "Atypical Angina", 3: "Asymptomatic"}, help="Type of chest pain"),
+    Feature("trestbps", "Resting Blood Pressure (mm Hg)", 120, "int", 0, help="Resting blood pressure", sweep=(90, 200)),
+    Feature("chol", "Cholesterol (mg/dl)", 200, "int", 0, help="Serum cholesterol", sweep=(120, 450)),
+    Feature("fbs", "Fasting Blood Sugar", 0, "int", options={0: "Normal", 1: "High (>120 mg/dl)"}, help="Fasting blood sugar level"),
+    Feature("restecg", "Resting ECG Result", 0, "int", options={0: "Normal", 1: "ST-T Wave Abnormality", 2: "Left Ventricular Hypertrophy"}, help="Electrocardiogram result"),
+    Feature("thalach", "Max Heart Rate", 150, "int", 0, help="Maximum heart rate achieved", sweep=(70, 210)),
+    Feature("exang", "Exercise-Induced Chest Pain", 0, "int", options={0: "No", 1: "Yes"}, help="Chest pain during exercise"),
+    Feature("oldpeak", "ST Depression", 1.0, "float", 0.0, 10.0, step=0.1, help="ST depression induced by exercise", sweep=(0, 6)),
+    Feature("slope", "ST Segment Slope", 0, "int", options={0: "Upsloping", 1: "Flat", 2: "Downsloping"}, help="Slope of the peak exercise ST segment"),
+    Feature("ca", "Major Vessels Blocked (0-4)", 0, "int", 0, 4, help="Number of major vessels colored by fluoroscopy", sweep=(0, 4)),
+    Feature("thal", "Thalassemia Result", 0, "int", options={0: "Not Tested", 1: "Normal", 2: "Fixed Defect", 3: "Reversible Defect"}, help="Thalassemia test result"),
+])
+
+PARKINSONS_LABELS = {
+    'MDVP:Fo(Hz)': 'Average Voice Frequency (Hz)',
+    'MDVP:Fhi(Hz)': 'Highest Voice Frequency (Hz)',
+    'MDVP:Flo(Hz)': 'Lowest Voice Frequency (Hz)',
+    'MDVP:Jitter(%)': 'Voice Frequency Variation (%)',
+    'MDVP:Jitter(Abs)': 'Absolute Voice Frequency Variation (ms)',
+    'MDVP:RAP': 'Rapid Voice Frequency Variation',
+    'MDVP:PPQ': 'Voice Frequency Stability',
+    'Jitter:DDP': 'Detailed Voice Frequency Variation',
+    'MDVP:Shimmer': 'Voice Amplitude Variation',
+    'MDVP:Shimmer(dB)': 'Voice Amplitude Variation (dB)',
+    'Shimmer:APQ3': 'Short-Term Voice Amplitude Variation 1',
+    'Shimmer:APQ5': 'Short-Term Voice Amplitude Variation 2',
+    'MDVP:APQ': 'Long-Term Voice Amplitude Variation',
+    'Shimmer:DDA': 'Detailed Voice Amplitude Variation',
+    'NHR': 'Noise-to-Harmonics Ratio',
+    'HNR': 'Harmonics-to-Noise Ratio',
+    'RPDE': 'Voice Complexity Measure 1',
+    'DFA': 'Voice Complexity Measure 2',
+    'spread1': 'Voice Spread Measure 1',
+    'spread2': 'Voice Spread Measure 2',
+    'D2': 'Voice Dynamics Measure',
+    'PPE': 'Voice Pitch Entropy'
+}
+
+# Default order; the page reorders to the feature names stored with the model
+PARKINSONS_SCHEMA = Schema(
+    [
+        Feature(name, label, 0.0, step=0.0001, fmt="%.6f", help="Enter a non-negative value")
+        for name, label in PARKINSONS_LABELS.items()
+    ],
+    require_nonzero=True,
+)
+
+SCHEMAS = {
+    "diabetes": DIABETES_SCHEMA,
+    "heart": HEART_SCHEMA,
+    "parkinsons": PARKINSONS_SCHEMA,
+}
+
+_reordered = {}
+
+
+def schema_for(disease, artifacts=None):
+    # Parkinson's column order comes from the feature names stored with the model
+    schema = SCHEMAS[disease]
+    if disease == "parkinsons" and artifacts is not None and "feature_names" in artifacts:
+        names = tuple(artifacts["feature_names"])
+        if list(names) != schema.names:
+            if names not in _reordered:
+                _reordered[names] = schema.reordered(names)
+            return _reordered[names]
+    return schema
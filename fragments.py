@@ -0,0 +1,67 @@
+# Personal Code: DPS-CORE-027
+# Author: [Your Name]
+# Description: Fragment decorator and per-input result cache so a form submission reruns only its own panel.
+
+import threading
+import numpy as np
+import streamlit as st
+import metrics
+from fast_pipeline import get_pipeline
+
+_CACHE_SIZE = 256
+
+# Widgets inside a fragment rerun only that function, not WebPage.py from the top.
+# st.fragment needs Streamlit 1.37+; older versions fall back to experimental_fragment or a full rerun.
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda function: function)
+
+# (disease, pipeline id, input row) -> (pipeline, prediction result, attributions or None until first shown)
+_results = {}
+_results_lock = threading.Lock()
+
+
+def _result_key(disease, artifacts, input_data):
+    pipeline = get_pipeline(artifacts)
+    return pipeline, (disease, id(pipeline), tuple(float(value) for value in np.asarray(input_data, dtype=np.float64).ravel()))
+
+
+def cached_prediction(disease, artifacts, input_data, predict, *args):
+    # Resubmitting the same values, or redrawing the last result, reuses the scored result
+    pipeline, key = _result_key(disease, artifacts, input_data)
+    entry = _results.get(key)
+    if entry is not None and entry[0] is pipeline:
+        metrics.increment(f"{disease}.result_cache_hit")
+        return entry[1]
+    result = predict(*args)
+    with _results_lock:
+        if len(_results) >= _CACHE_SIZE:
+            _results.pop(next(iter(_results)))
+        _results[key] = (pipeline, result, None)
+    return result
+
+
+def cached_attributions(disease, artifacts, input_data, explain):
+    # Kept with the cached result, so redrawing it does not explain the same input again
+    pipeline, key = _result_key(disease, artifacts, input_data)
+    entry = _results.get(key)
+    if entry is not None and entry[0] is pipeline and entry[2] is not None:
+        metrics.increment(f"{disease}.attribution_cache_hit")
+        return entry[2]
+    effects = explain()
+    with _results_lock:
+        entry = _results.get(key)
+        if entry is not None and entry[0] is pipeline:
+            _results[key] = (pipeline, entry[1], effects)
+    return effects
+
+
+def remember_submission(disease, input_data=None):
+    # Input whose result the panel shows on later reruns; None clears it (failed or invalid submission)
+    if input_data is None:
+        st.session_state.pop(f"{disease}_submitted", None)
+    else:
+        st.session_state[f"{disease}_submitted"] = [float(value) for value in np.asarray(input_data, dtype=np.float64).ravel()]
+
+
+def last_submission(disease):
+    row = st.session_state.get(f"{disease}_submitted")
+    return None if row is None else np.asarray(row, dtype=np.float64)[None, :]
@@ -0,0 +1,242 @@
+# Personal Code: DPS-CORE-008
+# Author: [Your Name]
+# Description: Headless ASGI inference service that micro-batches concurrent prediction requests per disease.
+# Run with: uvicorn inference_service:app --port 8000
+
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import drift_monitor
+import metrics
+from fast_pipeline import get_pipeline
+from model_registry import DISEASE_ARTIFACTS, load_disease_artifacts
+from scoring import feature_columns, predict_batch
+
+# Batching limits (override with environment variables)
+MAX_BATCH_SIZE = int(os.environ.get("DPS_BATCH_MAX_SIZE", "32"))
+MAX_WAIT_MS = float(os.environ.get("DPS_BATCH_MAX_WAIT_MS", "5"))
+
+ROUTES = {f"/predict/{disease}": disease for disease in DISEASE_ARTIFACTS}
+
+
+class RequestError(Exception):
+    pass
+
+
+def parse_features(payload, expected, allow_missing=False):
+    features = payload.get("features") if isinstance(payload, dict) else None
+    if isinstance(features, dict):
+        missing = [name for name in expected if name not in features]
+        if missing:
+            raise RequestError(f"Missing feature(s): {', '.join(missing)}")
+        values = [features[name] for name in expected]
+    elif isinstance(features, list):
+        if len(features) != len(expected):
+            raise RequestError(f"Expected {len(expected)} feature values, got {len(features)}")
+        values = features
+    else:
+        raise RequestError("Body must be a JSON object with a 'features' object or list")
+    try:
+        row = np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise RequestError("Feature values must be numeric")
+    # Exactly one flat row: extra rows would be stacked into the batch and shift every other caller's result
+    if row.ndim != 1 or row.shape[0] != len(expected):
+        raise RequestError(f"Expected a flat list of {len(expected)} numeric feature values")
+    # null/NaN only where the model has an imputer; infinities never
+    bad = np.isinf(row) if allow_missing else ~np.isfinite(row)
+    if bad.any():
+        names = [name for name, flag in zip(expected, bad) if flag]
+        raise RequestError(f"Feature value(s) must be finite numbers: {', '.join(names)}")
+    return row
+
+
+def score_rows(artifacts, rows):
+    # Fallback for a failed batch: each row alone, so only the offending request gets the error
+    outcomes = []
+    for row in rows:
+        try:
+            labels, probabilities = predict_batch(artifacts, row[None, :])
+            outcomes.append((labels[0], probabilities[0]))
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
+
+
+class MicroBatcher:
+    # Collects single-row requests into batches bounded by size and wait time
+    def __init__(self, disease, executor, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.disease = disease
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            rows = np.vstack([row for row, _ in batch])
+            try:
+                artifacts = await loop.run_in_executor(self.executor, load_disease_artifacts, self.disease)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            try:
+                # One vectorized imputer/scaler/predict_proba call for the whole batch
+                labels, probabilities = await loop.run_in_executor(self.executor, predict_batch, artifacts, rows)
+                outcomes = list(zip(labels, probabilities))
+                metrics.increment(f"service.{self.disease}.batches")
+            except Exception as e:
+                if len(batch) == 1:
+                    outcomes = [e]
+                else:
+                    metrics.increment(f"service.{self.disease}.batch_fallbacks")
+                    outcomes = await loop.run_in_executor(self.executor, score_rows, artifacts, rows)
+            scored = np.array([not isinstance(outcome, Exception) for outcome in outcomes])
+            metrics.increment(f"service.{self.disease}.rows", int(scored.sum()))
+            for (_, future), outcome in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+            # Not awaited: the next batch is collected while the drift statistics are updated
+            if scored.any():
+                self.executor.submit(drift_monitor.observe, self.disease, artifacts, rows[scored])
+
+    def close(self):
+        self.task.cancel()
+
+
+class InferenceService:
+    def __init__(self, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, workers=None):
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self.batchers = {}
+        # Drift snapshots of its own, next to the app's
+        drift_monitor.use_source("service")
+
+    def _batcher(self, disease):
+        batcher = self.batchers.get(disease)
+        if batcher is None:
+            batcher = self.batchers[disease] = MicroBatcher(disease, self.executor, self.max_batch_size, self.max_wait_ms)
+        return batcher
+
+    async def predict(self, disease, payload):
+        loop = asyncio.get_running_loop()
+        artifacts = await loop.run_in_executor(self.executor, load_disease_artifacts, disease)
+        row = parse_features(payload, feature_columns(disease, artifacts), get_pipeline(artifacts).handles_missing)
+        label, probabilities = await self._batcher(disease).submit(row)
+        return {
+            "disease": disease,
+            "prediction": int(label),
+            "probabilities": {"no_disease": float(probabilities[0]), "disease": float(probabilities[1])},
+        }
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Load whatever artifacts are present before taking traffic
+                loop = asyncio.get_running_loop()
+                for disease in DISEASE_ARTIFACTS:
+                    try:
+                        await loop.run_in_executor(self.executor, load_disease_artifacts, disease)
+                    except Exception:
+                        pass
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for batcher in self.batchers.values():
+                    batcher.close()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_body(self, receive):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                return body
+
+    async def _respond(self, send, status, payload):
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path = scope["path"].rstrip("/")
+        if path == "/health" and scope["method"] == "GET":
+            await self._respond(send, 200, {"status": "ok"})
+            return
+        if path == "/metrics" and scope["method"] == "GET":
+            body = metrics.render_prometheus().encode()
+            await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain; version=0.0.4")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+        disease = ROUTES.get(path)
+        if disease is None:
+            await self._respond(send, 404, {"error": "Not found"})
+            return
+        if scope["method"] != "POST":
+            await self._respond(send, 405, {"error": "Method not allowed"})
+            return
+
+        try:
+            payload = json.loads(await self._read_body(receive) or b"null")
+            result = await self.predict(disease, payload)
+        except (json.JSONDecodeError, RequestError) as e:
+            await self._respond(send, 400, {"error": str(e)})
+            return
+        except FileNotFoundError as e:
+            await self._respond(send, 503, {"error": str(e)})
+            return
+        except Exception as e:
+            await self._respond(send, 500, {"error": f"Prediction error: {str(e)}"})
+            return
+        await self._respond(send, 200, result)
+
+
+app = InferenceService()
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=os.environ.get("DPS_HOST", "127.0.0.1"), port=int(os.environ.get("DPS_PORT", "8000")))
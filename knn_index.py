@@ -0,0 +1,269 @@
+# Personal Code: DPS-CORE-010
+# Author: [Your Name]
+# Description: Persisted, memory-mapped nearest-neighbour index for the KNN diabetes model.
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import joblib
+import numpy as np
+
+# Index type: "kd_tree", "ball_tree" or "brute". A saved index keeps the kind and leaf size it was built with
+# (e.g. by this module's CLI); setting DPS_KNN_INDEX rebuilds any index of another kind on load.
+KIND_OVERRIDE = os.environ.get("DPS_KNN_INDEX")
+DEFAULT_KIND = KIND_OVERRIDE or "kd_tree"
+DEFAULT_LEAF_SIZE = 40
+# Batches at least this large use the blocked matrix search even when a tree exists
+BRUTE_MIN_BATCH = 64
+QUERY_BLOCK = 256
+REFERENCE_BLOCK = 8192
+FORMAT_VERSION = 1
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def index_dir(model_path):
+    return os.path.splitext(model_path)[0] + ".index"
+
+
+def _metric(model):
+    metric = getattr(model, "effective_metric_", model.metric)
+    params = dict(getattr(model, "effective_metric_params_", None) or {})
+    if metric == "minkowski" and params.get("p", 2) == 2:
+        metric = "euclidean"
+    if metric == "minkowski" and params.get("p") == 1:
+        metric = "manhattan"
+    if metric not in ("euclidean", "manhattan", "chebyshev"):
+        raise TypeError(f"Unsupported KNN metric: {metric}")
+    if callable(model.weights) or model.weights not in ("uniform", "distance"):
+        raise TypeError(f"Unsupported KNN weights: {model.weights}")
+    return metric
+
+
+class NeighbourIndex:
+    def __init__(self, reference, labels, classes, n_neighbors, weights, metric, kind, tree=None, sq_norms=None, leaf_size=DEFAULT_LEAF_SIZE):
+        self.reference = reference
+        self.labels = labels
+        self.classes = np.asarray(classes)
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.metric = metric
+        self.kind = kind
+        self.tree = tree
+        self.sq_norms = sq_norms
+        self.leaf_size = leaf_size
+        self.model_version = ""
+
+    @classmethod
+    def build(cls, model, kind=DEFAULT_KIND, leaf_size=DEFAULT_LEAF_SIZE):
+        from sklearn.neighbors import BallTree, KDTree
+        metric = _metric(model)
+        reference = np.ascontiguousarray(model._fit_X, dtype=np.float64)
+        labels = np.ascontiguousarray(np.asarray(model._y).reshape(len(reference)), dtype=np.intp)
+        tree = None
+        if kind == "kd_tree":
+            tree = KDTree(reference, leaf_size=leaf_size, metric=metric)
+        elif kind == "ball_tree":
+            tree = BallTree(reference, leaf_size=leaf_size, metric=metric)
+        elif kind != "brute":
+            raise ValueError(f"Unknown index kind: {kind}")
+        sq_norms = np.einsum("ij,ij->i", reference, reference)
+        return cls(reference, labels, model.classes_, model.n_neighbors, model.weights, metric, kind, tree, sq_norms, leaf_size)
+
+    def save(self, directory, model_version=""):
+        # Written to a fresh versioned directory; `directory` is a symlink switched to it with one rename,
+        # so readers always find a complete index, the old one or the new one
+        directory = os.path.abspath(directory)
+        parent = os.path.dirname(directory)
+        staging = tempfile.mkdtemp(prefix=f".{os.path.basename(directory)}-", dir=parent)
+        np.save(os.path.join(staging, "reference.npy"), self.reference)
+        np.save(os.path.join(staging, "labels.npy"), self.labels)
+        np.save(os.path.join(staging, "sq_norms.npy"), self.sq_norms)
+        np.save(os.path.join(staging, "classes.npy"), self.classes)
+        if self.tree is not None:
+            joblib.dump(self.tree, os.path.join(staging, "tree.joblib"))
+        meta = {
+            "format_version": FORMAT_VERSION,
+            "model_version": model_version,
+            "kind": self.kind,
+            "leaf_size": int(self.leaf_size),
+            "metric": self.metric,
+            "n_neighbors": int(self.n_neighbors),
+            "weights": self.weights,
+        }
+        with open(os.path.join(staging, "meta.json"), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        previous = os.path.realpath(directory) if os.path.islink(directory) else None
+        retired = None
+        if os.path.isdir(directory) and previous is None:
+            # Plain directory from an older save: moved aside once, then replaced by the link
+            retired = staging + ".old"
+            os.replace(directory, retired)
+        link = staging + ".link"
+        try:
+            os.symlink(os.path.basename(staging), link, target_is_directory=True)
+            os.replace(link, directory)
+        except (OSError, NotImplementedError):
+            # No symlinks (e.g. unprivileged Windows): the directory itself is renamed into place
+            if os.path.lexists(link):
+                os.remove(link)
+            if previous is not None:
+                os.remove(directory)
+            os.replace(staging, directory)
+        # Processes that already mapped the old arrays keep them until they reload
+        for old in (previous, retired):
+            if old is not None:
+                shutil.rmtree(old, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory):
+        # Resolved once so every file comes from the same version even if a save switches the link meanwhile
+        directory = os.path.realpath(directory)
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError("Index was written by an incompatible version")
+        # Arrays are memory-mapped so worker processes share the same pages
+        reference = np.load(os.path.join(directory, "reference.npy"), mmap_mode="r")
+        labels = np.load(os.path.join(directory, "labels.npy"), mmap_mode="r")
+        sq_norms = np.load(os.path.join(directory, "sq_norms.npy"), mmap_mode="r")
+        classes = np.load(os.path.join(directory, "classes.npy"), allow_pickle=False)
+        tree_path = os.path.join(directory, "tree.joblib")
+        # Copy-on-write mapping: sklearn trees need writeable buffers but never modify them
+        tree = joblib.load(tree_path, mmap_mode="c") if os.path.exists(tree_path) else None
+        index = cls(
+            reference, labels, classes, meta["n_neighbors"], meta["weights"], meta["metric"], meta["kind"], tree, sq_norms,
+            meta.get("leaf_size", DEFAULT_LEAF_SIZE),
+        )
+        index.model_version = meta.get("model_version", "")
+        return index
+
+    def _brute_kneighbors(self, Z, k):
+        # Blocked search: distance tiles of QUERY_BLOCK x REFERENCE_BLOCK keep memory bounded
+        distances = np.empty((len(Z), k))
+        indices = np.empty((len(Z), k), dtype=np.intp)
+        # Non-euclidean tiles broadcast over features, so use narrower reference blocks
+        step = REFERENCE_BLOCK if self.metric == "euclidean" else max(256, REFERENCE_BLOCK // Z.shape[1])
+        for start in range(0, len(Z), QUERY_BLOCK):
+            queries = Z[start:start + QUERY_BLOCK]
+            best_d = np.full((len(queries), 0), np.inf)
+            best_i = np.empty((len(queries), 0), dtype=np.intp)
+            for ref_start in range(0, len(self.reference), step):
+                block = np.asarray(self.reference[ref_start:ref_start + step])
+                if self.metric == "euclidean":
+                    tile = np.einsum("ij,ij->i", queries, queries)[:, None] - 2.0 * queries @ block.T
+                    tile += self.sq_norms[ref_start:ref_start + len(block)]
+                    np.maximum(tile, 0.0, out=tile)
+                elif self.metric == "manhattan":
+                    tile = np.abs(queries[:, None, :] - block[None, :, :]).sum(axis=2)
+                else:
+                    tile = np.abs(queries[:, None, :] - block[None, :, :]).max(axis=2)
+                candidate_d = np.concatenate([best_d, tile], axis=1)
+                candidate_i = np.concatenate([best_i, np.broadcast_to(np.arange(ref_start, ref_start + len(block)), tile.shape)], axis=1)
+                keep = min(k, candidate_d.shape[1])
+                part = np.argpartition(candidate_d, keep - 1, axis=1)[:, :keep]
+                best_d = np.take_along_axis(candidate_d, part, axis=1)
+                best_i = np.take_along_axis(candidate_i, part, axis=1)
+            order = np.argsort(best_d, axis=1, kind="stable")
+            best_d = np.take_along_axis(best_d, order, axis=1)
+            if self.metric == "euclidean":
+                best_d = np.sqrt(best_d)
+            distances[start:start + len(queries)] = best_d
+            indices[start:start + len(queries)] = np.take_along_axis(best_i, order, axis=1)
+        return distances, indices
+
+    def kneighbors(self, Z, k=None):
+        Z = np.array(Z, dtype=np.float64, ndmin=2)
+        k = k or self.n_neighbors
+        if self.tree is not None and len(Z) < BRUTE_MIN_BATCH:
+            return self.tree.query(Z, k=k)
+        return self._brute_kneighbors(Z, k)
+
+    def proba_from_neighbours(self, distances, indices):
+        neighbour_labels = np.asarray(self.labels)[indices]
+        if self.weights == "distance":
+            # Same rule as sklearn: exact matches take all of the weight
+            with np.errstate(divide="ignore"):
+                weights = 1.0 / distances
+            exact = np.isinf(weights)
+            rows = exact.any(axis=1)
+            weights[rows] = exact[rows].astype(np.float64)
+        else:
+            weights = np.ones_like(distances)
+        proba = np.zeros((len(indices), len(self.classes)))
+        for label in range(len(self.classes)):
+            proba[:, label] = (weights * (neighbour_labels == label)).sum(axis=1)
+        totals = proba.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+        return proba / totals
+
+    def predict_proba(self, Z):
+        return self.proba_from_neighbours(*self.kneighbors(Z))
+
+
+def get_index(model_path, model, model_version, kind=KIND_OVERRIDE):
+    # Load the saved index if it matches this model file, otherwise rebuild and save it.
+    # kind=None keeps whatever kind the saved index has; a rebuild keeps its kind and leaf size too.
+    directory = index_dir(model_path)
+    cached = _indexes.get(directory)
+    if cached is not None and cached.model_version == model_version:
+        return cached
+    with _indexes_lock:
+        cached = _indexes.get(directory)
+        if cached is not None and cached.model_version == model_version:
+            return cached
+        index = None
+        if os.path.exists(os.path.join(directory, "meta.json")):
+            try:
+                index = NeighbourIndex.load(directory)
+            except (OSError, ValueError, KeyError):
+                index = None
+        if index is None or index.model_version != model_version or (kind is not None and index.kind != kind):
+            previous = index
+            index = NeighbourIndex.build(
+                model, kind or (previous.kind if previous is not None else DEFAULT_KIND),
+                previous.leaf_size if previous is not None else DEFAULT_LEAF_SIZE,
+            )
+            try:
+                index.save(directory, model_version)
+                index = NeighbourIndex.load(directory)
+            except OSError:
+                # Read-only location: serve the in-memory index
+                pass
+            index.model_version = model_version
+        _indexes[directory] = index
+        return index
+
+
+def clear():
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the nearest-neighbour index for a fitted KNN model.")
+    parser.add_argument("model", help="Path to the KNN model pickle")
+    parser.add_argument("--kind", choices=["kd_tree", "ball_tree", "brute"], default=DEFAULT_KIND)
+    parser.add_argument("--leaf-size", type=int, default=DEFAULT_LEAF_SIZE)
+    args = parser.parse_args(argv)
+
+    from model_registry import get_artifact, get_artifact_version
+    model = get_artifact(args.model)
+    try:
+        index = NeighbourIndex.build(model, args.kind, args.leaf_size)
+    except (TypeError, AttributeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    index.save(index_dir(args.model), get_artifact_version(args.model))
+    print(f"Wrote {args.kind} index with {len(index.reference)} reference patients -> {index_dir(args.model)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,22 +4,47 @@
 
 import streamlit as st
 import pandas as pd
-import joblib
-import os
+from model_registry import load_disease_artifacts, missing_artifacts
+import drift_monitor
+import metrics
+from attributions import show_attributions
+from batch_scoring import show_batch_scoring
+from fast_pipeline import get_pipeline
+from feature_schema import DIABETES_SCHEMA
+from fragments import cached_prediction, fragment, last_submission, remember_submission
+from prediction_history import record_prediction
+from scoring_executor import ExecutorBusy, get_executor, local_artifacts
+from what_if import show_what_if
+
+# Prediction step of the page; also returns the nearest reference patients when the KNN index is available.
+# Runs on the scoring executor, so it loads artifacts itself when called in a worker.
+def predict_diabetes(input_data, artifacts=None):
+    artifacts = artifacts or load_disease_artifacts("diabetes")
+    pipeline = get_pipeline(artifacts)
+    index = artifacts.get("neighbour_index")
+    if index is None:
+        labels, probabilities = pipeline.predict(input_data)
+        return int(labels[0]), probabilities, None
+    distances, neighbours = index.kneighbors(pipeline.preprocess(input_data))
+    if pipeline.model is index:
+        # One neighbour search gives both the vote and the similar patients
+        probabilities = index.proba_from_neighbours(distances, neighbours)
+        return int(index.classes[probabilities[0].argmax()]), probabilities, (distances[0], neighbours[0])
+    # The index failed the pipeline's parity check: the fallback scores, the index only lists similar patients
+    labels, probabilities = pipeline.predict(input_data)
+    return int(labels[0]), probabilities, (distances[0], neighbours[0])
 
 def show_diabetes_page():
     # Check for model and scaler files
-    model_path = "knn_diabetes_model.pkl"
-    scaler_path = "scaler.pkl"
-    
-    if not os.path.exists(model_path) or not os.path.exists(scaler_path):
+    if missing_artifacts("diabetes"):
         st.error("⚠️ Model or scaler file not found. Please ensure 'knn_diabetes_model.pkl' and 'scaler.pkl' are in the 'models' directory.")
         return
     
-    # Load model and scaler
+    # Load model and scaler (shared across sessions, loaded once per file version)
     try:
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
+        with metrics.span("diabetes.load"):
+            artifacts = load_disease_artifacts("diabetes")
+        get_pipeline(artifacts)
     except Exception as e:
         st.error(f"Error loading model or scaler: {str(e)}")
         return
@@ -27,44 +52,89 @@ def show_diabetes_page():
     # Page header
     st.markdown("<h1 style='text-align: center; color: #2E86C1;'>Diabetes Prediction</h1>", unsafe_allow_html=True)
 
-    # Input form
-    with st.form(key="diabetes_form"):
-        st.markdown("### 🧾 Health Data")
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            pregnancies = st.number_input("Number of Pregnancies ", min_value=0, max_value=20, value=0, help="Number of times pregnant")
-            glucose = st.number_input("Glucose (mg/dl)", min_value=0.0, value=100.0, help="Plasma glucose concentration")
-            blood_pressure = st.number_input("Blood Pressure (mm Hg)", min_value=0.0, value=70.0, help="Diastolic blood pressure")
-            skin_thickness = st.number_input("Skin Thickness (mm)", min_value=0.0, value=20.0, help="Triceps skin fold thickness")
-        
-        with col2:
-            insulin = st.number_input("Insulin (mu U/ml)", min_value=0.0, value=80.0, help="2-Hour serum insulin")
-            bmi = st.number_input("BMI", min_value=0.0, value=30.0, help="Body mass index (kg/m²)")
-            dpf = st.number_input("Diabetes Pedigree Function", min_value=0.0, value=0.5, help="Family history of diabetes")
-            age = st.number_input("Age (years)", min_value=0, max_value=120, value=30, help="Age in years")
-        
-        submit = st.form_submit_button("🔍 Predict", use_container_width=True)
+    # Form, result and what-if panel rerun on their own when submitted or adjusted
+    show_diabetes_prediction()
+    
+    # Bulk scoring for many patient records at once
+    show_batch_scoring("diabetes", artifacts)
+
+@fragment
+def show_diabetes_prediction():
+    with metrics.span("diabetes.fragment"):
+        # Loaded here rather than passed in: a fragment-only rerun after a model reload uses the new model throughout
+        try:
+            artifacts = load_disease_artifacts("diabetes")
+        except Exception as e:
+            st.error(f"Error loading model or scaler: {str(e)}")
+            return
+        result = None
+        # Input form
+        with st.form(key="diabetes_form"):
+            st.markdown("### 🧾 Health Data")
+            # Widgets, bounds and column order all come from the feature schema
+            values = DIABETES_SCHEMA.render_form(n_columns=2, key_prefix="diabetes_")
+            
+            submit = st.form_submit_button("🔍 Predict", use_container_width=True)
+            
+            if submit:
+                remember_submission("diabetes")
+                errors = DIABETES_SCHEMA.validate(values)
+                if errors:
+                    st.error(" ".join(errors))
+                else:
+                    try:
+                        input_data = DIABETES_SCHEMA.to_array(values)
+                        with metrics.span("diabetes.predict"), st.spinner("⏳ Scoring..."):
+                            result = cached_prediction("diabetes", artifacts, input_data, get_executor().run, predict_diabetes, input_data, local_artifacts(artifacts))
+                        metrics.increment("diabetes.prediction")
+                        # Saved by the background history writer, off the request path
+                        record_prediction(st.session_state.get("username"), "diabetes", values, result[0], result[1][0])
+                        drift_monitor.observe("diabetes", artifacts, input_data)
+                        remember_submission("diabetes", input_data)
+                    except ExecutorBusy as e:
+                        st.warning(f"⏳ {str(e)}")
+                    except Exception as e:
+                        st.error(f"Prediction error: {str(e)}")
         
-        if submit:
+        # Result of the last submission; other reruns redraw it from the result cache
+        input_data = last_submission("diabetes")
+        if input_data is not None:
             try:
-                input_data = [[pregnancies, glucose, blood_pressure, skin_thickness, insulin, bmi, dpf, age]]
-                input_scaled = scaler.transform(input_data)
-                prediction = model.predict(input_scaled)[0]
-                result = "🟥 Diabetic" if prediction == 1 else "🟩 Not Diabetic"
-                color = "#C0392B" if prediction == 1 else "#27AE60"
-                
-                st.markdown(
-                    f"<div style='text-align: center; margin-top: 15px;'>"
-                    f"<h3 style='color: {color};'>Prediction: {result}</h3>"
-                    "</div>",
-                    unsafe_allow_html=True
-                )
-                
-                with st.expander("🔎 What This Means"):
-                    if prediction == 1:
-                        st.error("High risk of diabetes. Please consult a doctor.")
-                    else:
-                        st.success("Low risk of diabetes. Maintain a healthy lifestyle.")
+                if result is None:
+                    result = cached_prediction("diabetes", artifacts, input_data, get_executor().run, predict_diabetes, input_data, local_artifacts(artifacts))
+                show_diabetes_result(artifacts, input_data, *result)
+            except ExecutorBusy as e:
+                st.warning(f"⏳ {str(e)}")
             except Exception as e:
-                st.error(f"Prediction error: {str(e)}")
\ No newline at end of file
+                st.error(f"Prediction error: {str(e)}")
+        
+        # What-if sweeps around the last submitted input
+        show_what_if("diabetes", artifacts)
+
+def show_diabetes_result(artifacts, input_data, prediction, probabilities, nearest):
+    result = "🟥 Diabetic" if prediction == 1 else "🟩 Not Diabetic"
+    color = "#C0392B" if prediction == 1 else "#27AE60"
+    
+    st.markdown(
+        f"<div style='text-align: center; margin-top: 15px;'>"
+        f"<h3 style='color: {color};'>Prediction: {result}</h3>"
+        "</div>",
+        unsafe_allow_html=True
+    )
+    
+    with st.expander("🔎 What This Means"):
+        if prediction == 1:
+            st.error("High risk of diabetes. Please consult a doctor.")
+        else:
+            st.success("Low risk of diabetes. Maintain a healthy lifestyle.")
+        show_attributions("diabetes", artifacts, input_data)
+    
+    if nearest is not None:
+        with st.expander("👥 Most Similar Reference Patients"):
+            distances, neighbours = nearest
+            index = artifacts["neighbour_index"]
+            reference = get_pipeline(artifacts).inverse_preprocess(index.reference[neighbours])
+            similar = pd.DataFrame(reference, columns=DIABETES_SCHEMA.names)
+            similar["Outcome"] = ["Diabetic" if index.classes[label] == 1 else "Not Diabetic" for label in index.labels[neighbours]]
+            similar["Distance"] = distances
+            st.dataframe(similar.round(2), use_container_width=True, hide_index=True)
@@ -0,0 +1,163 @@
+# Personal Code: DPS-CORE-017
+# Author: [Your Name]
+# Description: Lightweight timing spans and counters exposed in Prometheus text format.
+# Enable with DPS_METRICS=1; when disabled every span is a shared no-op object.
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("DPS_METRICS", "0") == "1"
+# Optional scrape endpoint for the Streamlit process (e.g. DPS_METRICS_PORT=9105)
+HTTP_PORT = os.environ.get("DPS_METRICS_PORT")
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_histograms = {}
+_counters = {}
+_registry_lock = threading.Lock()
+_http_server = None
+
+
+class Histogram:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        with self.lock:
+            self.buckets[bisect_left(BUCKETS, seconds)] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.buckets), self.count, self.sum
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+def _histogram(stage):
+    histogram = _histograms.get(stage)
+    if histogram is None:
+        with _registry_lock:
+            histogram = _histograms.setdefault(stage, Histogram())
+    return histogram
+
+
+def span(stage):
+    if not ENABLED:
+        return _NOOP
+    return _Span(_histogram(stage))
+
+
+def observe(stage, seconds):
+    if ENABLED:
+        _histogram(stage).observe(seconds)
+
+
+def increment(event, value=1):
+    if not ENABLED:
+        return
+    with _registry_lock:
+        _counters[event] = _counters.get(event, 0) + value
+
+
+def _stages():
+    with _registry_lock:
+        return sorted(_histograms.items())
+
+
+def summary():
+    # Per-stage count, total and mean for the admin panel
+    rows = []
+    for stage, histogram in _stages():
+        _, count, total = histogram.snapshot()
+        rows.append({"stage": stage, "count": count, "total_s": total, "mean_ms": total / count * 1000 if count else 0.0})
+    return rows
+
+
+def counters():
+    with _registry_lock:
+        return dict(_counters)
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus():
+    lines = [
+        "# HELP dps_stage_seconds Time spent in each instrumented stage.",
+        "# TYPE dps_stage_seconds histogram",
+    ]
+    for stage, histogram in _stages():
+        buckets, count, total = histogram.snapshot()
+        label = _escape(stage)
+        cumulative = 0
+        for bound, hits in zip(BUCKETS, buckets):
+            cumulative += hits
+            lines.append(f'dps_stage_seconds_bucket{{stage="{label}",le="{bound}"}} {cumulative}')
+        lines.append(f'dps_stage_seconds_bucket{{stage="{label}",le="+Inf"}} {count}')
+        lines.append(f'dps_stage_seconds_sum{{stage="{label}"}} {total}')
+        lines.append(f'dps_stage_seconds_count{{stage="{label}"}} {count}')
+    lines.append("# HELP dps_events_total Count of instrumented events.")
+    lines.append("# TYPE dps_events_total counter")
+    for event, value in sorted(counters().items()):
+        lines.append(f'dps_events_total{{event="{_escape(event)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_http_server(port=HTTP_PORT, host="127.0.0.1"):
+    # Started once per process; returns None when metrics or the port are not configured
+    global _http_server
+    if not ENABLED or not port:
+        return None
+    with _registry_lock:
+        if _http_server is None:
+            _http_server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+            threading.Thread(target=_http_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _http_server
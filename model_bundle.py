@@ -0,0 +1,279 @@
+# Personal Code: DPS-CORE-018
+# Author: [Your Name]
+# Description: Versioned single-file model bundles (manifest + memory-mapped arrays) with hot reload.
+#
+# Layout: 8-byte magic, 8-byte little-endian manifest length, JSON manifest, then every array
+# aligned to 64 bytes. Arrays are read straight out of one shared read-only memory map, so
+# worker processes on the same host share the pages instead of holding private copies.
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+import drift_monitor
+from fast_pipeline import FusedPipeline, compile_pipeline
+from knn_index import NeighbourIndex
+from scoring import feature_columns
+
+MAGIC = b"DPSBNDL1"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+# Bundle location: <DPS_BUNDLE_DIR>/<disease>.dpsb
+BUNDLE_DIR = os.environ.get("DPS_BUNDLE_DIR", "models")
+# Seconds between checks for a replaced bundle file
+POLL_INTERVAL = float(os.environ.get("DPS_BUNDLE_POLL", "2"))
+
+_bundles = {}
+_signatures = {}
+_bundles_lock = threading.Lock()
+_watcher = None
+
+
+class BundleError(Exception):
+    pass
+
+
+def bundle_path(disease, directory=None):
+    return os.path.join(directory or BUNDLE_DIR, f"{disease}.dpsb")
+
+
+def _align(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _split_arrays(values):
+    # Numeric arrays go into the data region, everything else into the manifest
+    arrays, scalars = {}, {}
+    for name, value in values.items():
+        if isinstance(value, np.ndarray):
+            arrays[name] = value
+        elif isinstance(value, (np.floating, np.integer, np.bool_)):
+            scalars[name] = value.item()
+        else:
+            scalars[name] = value
+    return arrays, scalars
+
+
+def _pickled(obj):
+    return np.frombuffer(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), dtype=np.uint8)
+
+
+def bundle_contents(disease, artifacts):
+    pipeline = compile_pipeline(artifacts)
+    arrays, scalars = _split_arrays(pipeline.arrays)
+    extras = {}
+    if pipeline.kind == "sklearn":
+        index = artifacts.get("neighbour_index")
+        if index is not None and pipeline.model is index:
+            # KNN: keep the reference patients as arrays and search them by brute force after loading
+            arrays["knn_reference"] = np.ascontiguousarray(index.reference, dtype=np.float64)
+            arrays["knn_labels"] = np.ascontiguousarray(index.labels, dtype=np.intp)
+            arrays["knn_sq_norms"] = np.ascontiguousarray(index.sq_norms, dtype=np.float64)
+            extras["knn"] = {"n_neighbors": int(index.n_neighbors), "weights": index.weights, "metric": index.metric}
+        else:
+            arrays["model_pickle"] = _pickled(artifacts["model"])
+    elif pipeline.kind == "reference":
+        arrays["artifacts_pickle"] = _pickled({name: value for name, value in artifacts.items() if name != "neighbour_index"})
+    # Drift monitoring's training-data statistics travel with the model
+    reference = drift_monitor.reference_stats(artifacts)
+    if reference is not None:
+        arrays["reference_mean"] = np.ascontiguousarray(reference[0], dtype=np.float64)
+        arrays["reference_std"] = np.ascontiguousarray(reference[1], dtype=np.float64)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "disease": disease,
+        "kind": pipeline.kind,
+        "classes": pipeline.classes.tolist(),
+        "feature_names": list(feature_columns(disease, artifacts)),
+        "scalars": scalars,
+        **extras,
+    }
+    return manifest, arrays
+
+
+def write_bundle(path, disease, artifacts, version=None):
+    manifest, arrays = bundle_contents(disease, artifacts)
+
+    # Lay out the data region and checksum it
+    entries, offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        offset = _align(offset)
+        entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset, "nbytes": array.nbytes}
+        offset += array.nbytes
+    data_size = _align(offset)
+    sha = hashlib.sha256()
+    data = bytearray(data_size)
+    for name, array in arrays.items():
+        start = entries[name]["offset"]
+        data[start:start + array.nbytes] = array.tobytes()
+    sha.update(data)
+    checksum = sha.hexdigest()
+
+    manifest["arrays"] = entries
+    manifest["checksum"] = checksum
+    manifest["version"] = version or checksum[:12]
+    manifest["created_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    header = json.dumps(manifest).encode()
+    header_size = _align(len(MAGIC) + 8 + len(header))
+
+    # Write next to the target and rename over it so readers only ever see complete bundles
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=".bundle-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            f.write(b"\0" * (header_size - len(MAGIC) - 8 - len(header)))
+            f.write(data)
+        os.replace(staging, path)
+    except BaseException:
+        if os.path.exists(staging):
+            os.remove(staging)
+        raise
+    return manifest
+
+
+class Bundle:
+    def __init__(self, path, manifest, arrays, pipeline, neighbour_index=None):
+        self.path = path
+        self.manifest = manifest
+        self.version = manifest["version"]
+        self.feature_names = manifest["feature_names"]
+        self.arrays = arrays
+        self.pipeline = pipeline
+        # Same shape as model_registry artifacts so pages, batch scoring and the service can use either
+        self.artifacts = {"pipeline": pipeline, "feature_names": self.feature_names, "bundle": self}
+        if neighbour_index is not None:
+            self.artifacts["neighbour_index"] = neighbour_index
+        if "reference_mean" in arrays:
+            self.artifacts["reference_stats"] = {"mean": arrays["reference_mean"], "std": arrays["reference_std"]}
+
+
+def load_bundle(path, verify=True):
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    if bytes(mapped[:len(MAGIC)]) != MAGIC:
+        raise BundleError(f"{path} is not a model bundle")
+    (header_length,) = struct.unpack("<Q", bytes(mapped[len(MAGIC):len(MAGIC) + 8]))
+    manifest = json.loads(bytes(mapped[len(MAGIC) + 8:len(MAGIC) + 8 + header_length]))
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise BundleError(f"{path} uses unsupported bundle format {manifest.get('format_version')}")
+    data = mapped[_align(len(MAGIC) + 8 + header_length):]
+    if verify and hashlib.sha256(data).hexdigest() != manifest["checksum"]:
+        raise BundleError(f"{path} failed its checksum")
+
+    # Zero-copy, read-only views into the shared mapping
+    arrays = {}
+    for name, entry in manifest["arrays"].items():
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(data, dtype=np.dtype(entry["dtype"]), count=count, offset=entry["offset"]).reshape(entry["shape"])
+
+    kind = manifest["kind"]
+    classes = manifest["classes"]
+    pipeline_arrays = {**manifest["scalars"], **{name: value for name, value in arrays.items() if not name.startswith(("knn_", "model_pickle", "artifacts_pickle", "reference_"))}}
+    neighbour_index = None
+    if kind == "reference":
+        artifacts = pickle.loads(arrays["artifacts_pickle"].tobytes())
+        pipeline = FusedPipeline("reference", classes, pipeline_arrays, artifacts=artifacts)
+    elif kind == "sklearn" and "knn" in manifest:
+        knn = manifest["knn"]
+        neighbour_index = NeighbourIndex(
+            arrays["knn_reference"], arrays["knn_labels"], classes, knn["n_neighbors"], knn["weights"], knn["metric"],
+            "brute", sq_norms=arrays["knn_sq_norms"],
+        )
+        neighbour_index.model_version = manifest["version"]
+        pipeline = FusedPipeline("sklearn", classes, pipeline_arrays, model=neighbour_index)
+    elif kind == "sklearn":
+        model = pickle.loads(arrays["model_pickle"].tobytes())
+        pipeline = FusedPipeline("sklearn", classes, pipeline_arrays, model=model)
+    else:
+        pipeline = FusedPipeline(kind, classes, pipeline_arrays)
+    return Bundle(path, manifest, arrays, pipeline, neighbour_index)
+
+
+def _signature(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _refresh(disease):
+    # Swap in a changed bundle; in-flight predictions keep the Bundle object (and its mapping) they already hold
+    path = bundle_path(disease)
+    signature = _signature(path)
+    if signature == _signatures.get(disease):
+        return
+    if signature is None:
+        _bundles.pop(disease, None)
+    else:
+        try:
+            _bundles[disease] = load_bundle(path)
+        except (OSError, ValueError, KeyError, BundleError):
+            # Keep serving the previous bundle if the new file is unreadable
+            return
+    _signatures[disease] = signature
+
+
+def _watch():
+    while True:
+        time.sleep(POLL_INTERVAL)
+        for disease in list(_signatures):
+            with _bundles_lock:
+                _refresh(disease)
+
+
+def get_bundle(disease):
+    global _watcher
+    if disease not in _signatures:
+        with _bundles_lock:
+            if disease not in _signatures:
+                _refresh(disease)
+                _signatures.setdefault(disease, None)
+            if _watcher is None and POLL_INTERVAL > 0:
+                _watcher = threading.Thread(target=_watch, name="bundle-watcher", daemon=True)
+                _watcher.start()
+    return _bundles.get(disease)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect single-file model bundles.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Bundle the current pickled artifacts for a disease")
+    build.add_argument("disease", choices=["diabetes", "heart", "parkinsons"])
+    build.add_argument("--output", help="Bundle path (default: <DPS_BUNDLE_DIR>/<disease>.dpsb)")
+    build.add_argument("--version", help="Version label (default: checksum prefix)")
+    inspect = commands.add_parser("inspect", help="Print a bundle manifest")
+    inspect.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "inspect":
+        try:
+            bundle = load_bundle(args.path)
+        except (OSError, BundleError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps(bundle.manifest, indent=2))
+        return 0
+
+    from model_registry import load_disease_artifacts_from_files
+    output = args.output or bundle_path(args.disease)
+    manifest = write_bundle(output, args.disease, load_disease_artifacts_from_files(args.disease), args.version)
+    print(f"Wrote {args.disease} bundle {manifest['version']} ({manifest['kind']}) -> {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
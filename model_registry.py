@@ -0,0 +1,166 @@
+# Personal Code: DPS-CORE-005
+# Author: [Your Name]
+# Description: Process-wide model registry that loads each model artifact once and shares it across Streamlit sessions and reruns.
+
+import hashlib
+import os
+import threading
+import joblib
+import knn_index
+import metrics
+import model_bundle
+
+# Artifact locations for each disease page
+DISEASE_ARTIFACTS = {
+    "diabetes": {
+        "model": "knn_diabetes_model.pkl",
+        "scaler": "scaler.pkl",
+    },
+    "heart": {
+        "model": "C:/Users/91787/Downloads/heart_disease_model.pkl",
+        "scaler": "C:/Users/91787/Downloads/scaler_heart.pkl",
+        "imputer": "C:/Users/91787/Downloads/imputer.pkl",
+    },
+    "parkinsons": {
+        "model": "C:/Users/91787/Downloads/parkinsons_model.pkl",
+        "scaler": "C:/Users/91787/Downloads/parkinsons_scaler.pkl",
+        "feature_names": "C:/Users/91787/Downloads/parkinsons_feature_names.pkl",
+    },
+}
+
+# Loaded artifacts keyed by absolute path: path -> (signature, digest, artifact)
+_cache = {}
+_cache_lock = threading.Lock()
+_path_locks = {}
+_warm_up_thread = None
+
+
+def _signature(path):
+    # mtime and size are enough to notice a replaced file without reading it
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _lock_for(path):
+    with _cache_lock:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = threading.Lock()
+        return lock
+
+
+def file_digest(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def get_artifact(path):
+    # Cheap path: one stat call and a dict lookup
+    path = os.path.abspath(path)
+    signature = _signature(path)
+    entry = _cache.get(path)
+    if entry is not None and entry[0] == signature:
+        metrics.increment("registry_hit")
+        return entry[2]
+
+    # Only one thread loads a given file; the others wait and reuse its result
+    with _lock_for(path):
+        entry = _cache.get(path)
+        if entry is not None and entry[0] == signature:
+            return entry[2]
+        digest = file_digest(path)
+        if entry is not None and entry[1] == digest:
+            # File was touched but its content did not change
+            artifact = entry[2]
+        else:
+            with metrics.span("joblib_load"):
+                artifact = joblib.load(path)
+            metrics.increment("registry_load")
+        _cache[path] = (signature, digest, artifact)
+        return artifact
+
+
+def get_artifact_version(path):
+    path = os.path.abspath(path)
+    get_artifact(path)
+    return _cache[path][1]
+
+
+def missing_artifacts(disease, paths=None):
+    if paths is None and model_bundle.get_bundle(disease) is not None:
+        return []
+    paths = paths or DISEASE_ARTIFACTS[disease]
+    return [path for path in paths.values() if not os.path.exists(path)]
+
+
+def load_disease_artifacts(disease, paths=None):
+    # A model bundle in DPS_BUNDLE_DIR takes precedence over the separate pickles
+    if paths is None:
+        bundle = model_bundle.get_bundle(disease)
+        if bundle is not None:
+            return bundle.artifacts
+    return load_disease_artifacts_from_files(disease, paths)
+
+
+def reference_stats_path(model_path):
+    # Training-data feature means and standard deviations, written next to the model by train.py
+    return os.path.splitext(model_path)[0] + ".reference.pkl"
+
+
+def load_disease_artifacts_from_files(disease, paths=None):
+    paths = paths or DISEASE_ARTIFACTS[disease]
+    missing = missing_artifacts(disease, paths)
+    if missing:
+        raise FileNotFoundError(f"Missing artifact(s) for {disease}: {', '.join(missing)}")
+    artifacts = {name: get_artifact(path) for name, path in paths.items()}
+    # Drift monitoring compares traffic with these; models trained before they were saved have none
+    reference_path = reference_stats_path(paths["model"])
+    if os.path.exists(reference_path):
+        artifacts["reference_stats"] = get_artifact(reference_path)
+
+    # KNN models are served from a persisted neighbour index saved next to the pickle
+    if type(artifacts["model"]).__name__ == "KNeighborsClassifier":
+        try:
+            artifacts["neighbour_index"] = knn_index.get_index(paths["model"], artifacts["model"], get_artifact_version(paths["model"]))
+        except (TypeError, AttributeError, ValueError):
+            pass
+    return artifacts
+
+
+def model_version(disease, paths=None):
+    if paths is None and model_bundle.get_bundle(disease) is not None:
+        return model_bundle.get_bundle(disease).version
+    paths = paths or DISEASE_ARTIFACTS[disease]
+    return get_artifact_version(paths["model"])[:12]
+
+
+def _warm_up(diseases):
+    for disease in diseases:
+        try:
+            load_disease_artifacts(disease)
+        except Exception:
+            # Pages report missing or broken files when they are opened
+            pass
+
+
+def warm_up(diseases=None, background=True):
+    global _warm_up_thread
+    diseases = list(diseases or DISEASE_ARTIFACTS)
+    if not background:
+        _warm_up(diseases)
+        return None
+    with _cache_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_warm_up, args=(diseases,), name="model-warm-up", daemon=True)
+            _warm_up_thread.start()
+        return _warm_up_thread
+
+
+def clear():
+    with _cache_lock:
+        _cache.clear()
+        _path_locks.clear()
+    knn_index.clear()
@@ -0,0 +1,94 @@
+# Personal Code: DPS-CORE-013
+# Author: [Your Name]
+# Description: Lazy registry of disease pages, optional background warm-up and startup-time report for WebPage.py.
+
+import importlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Disease name -> (module, page function, model registry key; None for pages that use several models)
+PAGES = {
+    "Diabetes": ("main", "show_diabetes_page", "diabetes"),
+    "Heart Disease": ("Heart_Disease", "show_heart_disease_page", "heart"),
+    "Parkinson's": ("Parkinsons", "show_parkinsons_page", "parkinsons"),
+    "Combined Screening": ("screening", "show_screening_page", None),
+}
+
+# Set DPS_WARM_UP=0 to load pages and models only when they are first opened
+WARM_UP_ENABLED = os.environ.get("DPS_WARM_UP", "1") == "1"
+
+PROCESS_START = time.perf_counter()
+_startup_timings = {}
+_timings_lock = threading.Lock()
+_import_lock = threading.Lock()
+_warm_up_thread = None
+
+
+def record_startup(phase, seconds):
+    # Only the first measurement of each phase is kept: that is the cold-start cost
+    with _timings_lock:
+        _startup_timings.setdefault(phase, seconds)
+
+
+@contextmanager
+def startup_phase(phase):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_startup(phase, time.perf_counter() - start)
+
+
+class PhaseClock:
+    # Records the time since the previous lap as a startup phase
+    def __init__(self, start=None):
+        self.last = start if start is not None else time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        record_startup(phase, now - self.last)
+        self.last = now
+
+
+def startup_report():
+    with _timings_lock:
+        return dict(_startup_timings)
+
+
+def _import_page_module(module_name, phase_prefix):
+    # Serialized so the warm-up thread and a session never import the same module twice
+    with _import_lock:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        record_startup(f"{phase_prefix} {module_name}", time.perf_counter() - start)
+    return module
+
+
+def get_page(disease):
+    module_name, function_name, _ = PAGES[disease]
+    return getattr(_import_page_module(module_name, "import"), function_name)
+
+
+def _warm_up():
+    for module_name, _, _ in PAGES.values():
+        try:
+            _import_page_module(module_name, "warm-up import")
+        except Exception:
+            pass
+    with startup_phase("warm-up models"):
+        from model_registry import warm_up
+        warm_up([key for _, _, key in PAGES.values() if key], background=False)
+    record_startup("warm-up finished (since process start)", time.perf_counter() - PROCESS_START)
+
+
+def start_warm_up():
+    global _warm_up_thread
+    if not WARM_UP_ENABLED:
+        return None
+    with _timings_lock:
+        if _warm_up_thread is None:
+            _warm_up_thread = threading.Thread(target=_warm_up, name="page-warm-up", daemon=True)
+            _warm_up_thread.start()
+        return _warm_up_thread
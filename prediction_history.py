@@ -0,0 +1,198 @@
+# Personal Code: DPS-CORE-021
+# Author: [Your Name]
+# Description: Prediction history kept in SQLite through a batched write-behind queue, with keyset-paginated per-user queries.
+
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import metrics
+
+DB_PATH = os.environ.get("DPS_HISTORY_DB", "history.db")
+# Rows are written when this many are queued or FLUSH_INTERVAL seconds after the first one
+FLUSH_BATCH_SIZE = int(os.environ.get("DPS_HISTORY_BATCH", "200"))
+FLUSH_INTERVAL = float(os.environ.get("DPS_HISTORY_FLUSH_SECONDS", "1"))
+# Records beyond this many waiting to be written are dropped rather than blocking a request
+MAX_QUEUED = 10000
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS predictions (
+        id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL,
+        disease TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        prediction INTEGER NOT NULL,
+        probability REAL,
+        probabilities TEXT,
+        inputs TEXT NOT NULL,
+        model_version TEXT)""",
+    # Newest-first pages for one user, optionally narrowed to one disease
+    "CREATE INDEX IF NOT EXISTS predictions_user_time ON predictions (username, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS predictions_user_disease_time ON predictions (username, disease, created_at DESC, id DESC)",
+]
+_INSERT = (
+    "INSERT INTO predictions (username, disease, created_at, prediction, probability, probabilities, inputs, model_version) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_COLUMNS = "id, disease, created_at, prediction, probability, probabilities, inputs, model_version"
+# Keyset pagination: each page starts strictly after the last (created_at, id) of the previous one
+_PAGE_USER = (
+    f"SELECT {_COLUMNS} FROM predictions WHERE username = ? AND (created_at, id) < (?, ?) "
+    "ORDER BY created_at DESC, id DESC LIMIT ?"
+)
+_PAGE_USER_DISEASE = (
+    f"SELECT {_COLUMNS} FROM predictions WHERE username = ? AND disease = ? AND (created_at, id) < (?, ?) "
+    "ORDER BY created_at DESC, id DESC LIMIT ?"
+)
+# Cursor that sorts after every real row
+FIRST_PAGE = (float("inf"), 0)
+# Queued by flush() so the writer stops gathering and writes what it holds straight away
+_FLUSH = object()
+
+_history = None
+_history_lock = threading.Lock()
+
+
+class PredictionHistory:
+    def __init__(self, path=DB_PATH, batch_size=FLUSH_BATCH_SIZE, flush_interval=FLUSH_INTERVAL, max_queued=MAX_QUEUED):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = queue.Queue(max_queued)
+        self._local = threading.local()
+        self.thread = None
+        conn = self.connection()
+        with conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def connection(self):
+        # One connection per thread: the writer thread plus each Streamlit session reading its history
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, cached_statements=64)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="prediction-history", daemon=True)
+            self.thread.start()
+        return self
+
+    def record(self, username, disease, inputs, prediction, probabilities=None, model_version=None):
+        # Only serializes and enqueues; the database write happens on the writer thread
+        probabilities = [float(p) for p in probabilities] if probabilities is not None else None
+        row = (
+            username, disease, time.time(), int(prediction),
+            probabilities[int(prediction)] if probabilities else None,
+            json.dumps(probabilities) if probabilities is not None else None,
+            json.dumps(inputs), model_version,
+        )
+        try:
+            self.pending.put_nowait(row)
+        except queue.Full:
+            metrics.increment("history.dropped")
+            return False
+        return True
+
+    def _take_batch(self):
+        # Block for the first row, then gather more until the batch is full or the interval has passed
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not _FLUSH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        rows = [row for row in batch if row is not _FLUSH]
+        if not rows:
+            return
+        conn = self.connection()
+        with metrics.span("history.flush"), conn:
+            conn.executemany(_INSERT, rows)
+        metrics.increment("history.rows", len(rows))
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            try:
+                self._write(batch)
+            except sqlite3.Error:
+                metrics.increment("history.dropped", sum(row is not _FLUSH for row in batch))
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+
+    def flush(self):
+        # Wait until everything queued so far is on disk, without waiting out the flush interval
+        if self.thread is not None and self.thread.is_alive():
+            self.pending.put(_FLUSH)
+            self.pending.join()
+            return
+        batch = []
+        while True:
+            try:
+                batch.append(self.pending.get_nowait())
+            except queue.Empty:
+                break
+            self.pending.task_done()
+        if batch:
+            self._write(batch)
+
+    def page(self, username, disease=None, after=FIRST_PAGE, limit=20):
+        # Returns (rows, cursor for the next page or None)
+        created_at, row_id = after
+        if disease is None:
+            rows = self.connection().execute(_PAGE_USER, (username, created_at, row_id, limit + 1)).fetchall()
+        else:
+            rows = self.connection().execute(_PAGE_USER_DISEASE, (username, disease, created_at, row_id, limit + 1)).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        entries = [
+            {
+                "id": row[0],
+                "disease": row[1],
+                "created_at": row[2],
+                "prediction": row[3],
+                "probability": row[4],
+                "probabilities": json.loads(row[5]) if row[5] else None,
+                "inputs": json.loads(row[6]),
+                "model_version": row[7],
+            }
+            for row in rows
+        ]
+        cursor = (rows[-1][2], rows[-1][0]) if more else None
+        return entries, cursor
+
+
+def get_history():
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = PredictionHistory().start()
+            atexit.register(_history.flush)
+        return _history
+
+
+def record_prediction(username, disease, inputs, prediction, probabilities=None):
+    # Called by the pages after a result is shown; a history problem never fails the prediction.
+    # model_registry is imported here so the history view does not pull in the model libraries.
+    from model_registry import model_version
+    try:
+        return get_history().record(username or "", disease, inputs, prediction, probabilities, model_version(disease))
+    except (OSError, KeyError, ValueError, TypeError, sqlite3.Error):
+        metrics.increment("history.dropped")
+        return False
@@ -0,0 +1,19 @@
+# Personal Code: DPS-CORE-006
+# Author: [Your Name]
+# Description: Shared feature order and vectorized imputer -> scaler -> model scoring used by the pages and bulk scoring.
+
+from fast_pipeline import get_pipeline
+from feature_schema import SCHEMAS, schema_for
+
+# Model column order for the diseases whose features are fixed in code
+FEATURE_COLUMNS = {disease: SCHEMAS[disease].names for disease in ("diabetes", "heart")}
+
+
+def feature_columns(disease, artifacts):
+    # Parkinson's feature order is stored next to the model
+    return schema_for(disease, artifacts).names
+
+
+def predict_batch(artifacts, X):
+    # Compiled NumPy kernel: labels and class probabilities from one pass
+    return get_pipeline(artifacts).predict(X)
@@ -0,0 +1,87 @@
+# Personal Code: DPS-CORE-019
+# Author: [Your Name]
+# Description: Pluggable executor for prediction work (inline, thread pool or preloaded process pool) with admission control.
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+# DPS_SCORING_EXECUTOR: "inline" (default), "thread" or "process"
+EXECUTOR_KIND = os.environ.get("DPS_SCORING_EXECUTOR", "inline")
+WORKERS = int(os.environ.get("DPS_SCORING_WORKERS", "0")) or os.cpu_count() or 1
+# Submissions beyond this many in flight are refused instead of queued
+MAX_PENDING = int(os.environ.get("DPS_SCORING_MAX_PENDING", "0")) or WORKERS * 4
+TIMEOUT = float(os.environ.get("DPS_SCORING_TIMEOUT", "30"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class ExecutorBusy(Exception):
+    pass
+
+
+def _init_worker():
+    # Each worker process loads every model once, before its first task
+    from model_registry import warm_up
+    warm_up(background=False)
+
+
+class ScoringExecutor:
+    def __init__(self, kind=EXECUTOR_KIND, workers=WORKERS, max_pending=MAX_PENDING):
+        self.kind = kind
+        self.slots = threading.BoundedSemaphore(max_pending)
+        if kind == "thread":
+            self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scoring")
+        elif kind == "process":
+            # Fresh interpreters: forking the multi-threaded Streamlit server is not safe
+            context = multiprocessing.get_context("spawn")
+            self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker)
+        elif kind == "inline":
+            self.pool = None
+        else:
+            raise ValueError(f"Unknown scoring executor: {kind}")
+
+    def submit(self, fn, *args):
+        # fn must be a module-level function so it can be sent to worker processes
+        if not self.slots.acquire(blocking=False):
+            raise ExecutorBusy("Too many predictions in progress. Please try again in a moment.")
+        if self.pool is None:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self.slots.release()
+            return future
+        try:
+            future = self.pool.submit(fn, *args)
+        except Exception:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def run(self, fn, *args, timeout=TIMEOUT):
+        return self.submit(fn, *args).result(timeout)
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ScoringExecutor()
+    return _executor
+
+
+def local_artifacts(artifacts):
+    # Artifacts to hand to a prediction step: the caller's own objects when it runs in this process, so the
+    # result belongs to the model the caller keys it by; worker processes load theirs rather than unpickle models
+    return None if get_executor().kind == "process" else artifacts
@@ -0,0 +1,171 @@
+# Personal Code: DPS-SCREEN-025
+# Author: [Your Name]
+# Description: Combined screening page that collects shared measurements once and scores every complete model concurrently.
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+import streamlit as st
+import drift_monitor
+import metrics
+from feature_schema import DIABETES_SCHEMA, HEART_SCHEMA, Feature, render_widget, schema_for
+from fragments import fragment
+from model_registry import load_disease_artifacts, missing_artifacts
+from prediction_history import record_prediction
+from scoring_executor import TIMEOUT, ExecutorBusy, get_executor
+
+# Measurements asked once and copied into each model's own feature
+SHARED_FIELDS = [
+    (Feature("age", "Age (years)", 50, "int", 0, 120, help="Age in years"), {"diabetes": "Age", "heart": "age"}),
+    (Feature("systolic", "Systolic Blood Pressure (mm Hg)", 120, "int", 0, help="Resting systolic (upper) pressure"), {"heart": "trestbps"}),
+    (Feature("diastolic", "Diastolic Blood Pressure (mm Hg)", 70.0, help="Diastolic (lower) pressure"), {"diabetes": "BloodPressure"}),
+]
+DISEASE_NAMES = {"diabetes": "Diabetes", "heart": "Heart Disease", "parkinsons": "Parkinson's Disease"}
+
+
+def _predictors():
+    # The pages' own prediction steps (imported here so the screening page shares their code paths)
+    from Heart_Disease import predict_heart_disease
+    from main import predict_diabetes
+    from Parkinsons import predict_parkinsons
+    return {"diabetes": predict_diabetes, "heart": predict_heart_disease, "parkinsons": predict_parkinsons}
+
+
+def _score(predict, model_input):
+    # Runs wherever the scoring executor puts it (module-level so worker processes can receive it)
+    start = time.perf_counter()
+    result = predict(model_input)
+    return result[0], result[1], time.perf_counter() - start
+
+
+def _submit_all(jobs):
+    # disease -> future. Pooled executors take the models side by side directly; the inline executor
+    # gets a pool per request, so one session's screening never queues behind another's
+    executor = get_executor()
+    if executor.pool is not None:
+        futures = {}
+        for disease, (predict, model_input) in jobs.items():
+            try:
+                futures[disease] = executor.submit(_score, predict, model_input)
+            except ExecutorBusy as e:
+                futures[disease] = Future()
+                futures[disease].set_exception(e)
+        return futures, None
+    fanout = ThreadPoolExecutor(max_workers=max(1, len(jobs)), thread_name_prefix="screening")
+    return {disease: fanout.submit(executor.run, _score, predict, model_input) for disease, (predict, model_input) in jobs.items()}, fanout
+
+
+def model_inputs(shared, values):
+    # Per-disease value dicts in each schema's names, with the shared answers filled in
+    inputs = {disease: dict(disease_values) for disease, disease_values in values.items()}
+    for feature, targets in SHARED_FIELDS:
+        for disease, name in targets.items():
+            inputs[disease][name] = shared[feature.name]
+    return inputs
+
+
+def score_all(inputs):
+    # Returns disease -> result dict; models with incomplete or invalid inputs are skipped
+    predictors = _predictors()
+    results, jobs, inputs_used = {}, {}, {}
+    for disease, values in inputs.items():
+        if missing_artifacts(disease):
+            results[disease] = {"status": "Model unavailable"}
+            continue
+        # Values are matched by name, so the default Parkinson's order is fine for checking them;
+        # artifacts are loaded inside the concurrent prediction steps
+        schema = schema_for(disease)
+        blank = [feature.label for feature in schema.features if values.get(feature.name) is None]
+        if blank:
+            results[disease] = {"status": f"Skipped: missing {', '.join(blank[:3])}{' …' if len(blank) > 3 else ''}"}
+            continue
+        errors = schema.validate(values)
+        if errors:
+            results[disease] = {"status": f"Skipped: {' '.join(errors)}"}
+            continue
+        jobs[disease] = (predictors[disease], values if disease == "parkinsons" else schema.to_array(values))
+        inputs_used[disease] = values
+
+    futures, fanout = _submit_all(jobs)
+    for disease, future in futures.items():
+        values = inputs_used[disease]
+        try:
+            label, probabilities, seconds = future.result(TIMEOUT)
+        except ExecutorBusy as e:
+            results[disease] = {"status": str(e)}
+            continue
+        except Exception as e:
+            results[disease] = {"status": f"Error: {str(e)}"}
+            continue
+        results[disease] = {"status": "Scored", "prediction": label, "risk": float(probabilities[0][1]), "seconds": seconds}
+        record_prediction(st.session_state.get("username"), disease, values, label, probabilities[0])
+        artifacts = load_disease_artifacts(disease)
+        drift_monitor.observe(disease, artifacts, schema_for(disease, artifacts).to_array(values))
+    if fanout is not None:
+        fanout.shutdown(wait=False)
+    return results
+
+
+def show_screening_page():
+    st.markdown("<h1 style='text-align: center; color: #2E86C1;'>Combined Screening</h1>", unsafe_allow_html=True)
+    st.markdown("Fill in what you know. Each model is scored when all of its inputs are present; the others are skipped.")
+
+    # Form and results rerun on their own when submitted
+    show_screening_form()
+
+
+@fragment
+def show_screening_form():
+    with metrics.span("screening.fragment"):
+        with st.form(key="screening_form"):
+            st.markdown("### 👤 Shared Measurements")
+            shared = {}
+            cols = st.columns(len(SHARED_FIELDS))
+            for col, (feature, _) in zip(cols, SHARED_FIELDS):
+                with col:
+                    shared[feature.name] = render_widget(feature, key=f"screening_{feature.name}", blank=True)
+
+            values = {}
+            st.markdown("### 🩸 Diabetes")
+            values["diabetes"] = DIABETES_SCHEMA.render_form(n_columns=3, key_prefix="screening_diabetes_", blank=True, skip=("Age", "BloodPressure"))
+            st.markdown("### ❤️ Heart Disease")
+            values["heart"] = HEART_SCHEMA.render_form(n_columns=3, key_prefix="screening_heart_", blank=True, skip=("age", "trestbps"))
+            with st.expander("🎙️ Voice Measurements (Parkinson's)"):
+                values["parkinsons"] = schema_for("parkinsons").render_form(n_columns=3, column_major=False, key_prefix="screening_parkinsons_", blank=True)
+
+            submit = st.form_submit_button("🩺 Run Screening", use_container_width=True)
+
+        if not submit:
+            return
+        with metrics.span("screening.predict"), st.spinner("⏳ Scoring all models..."):
+            start = time.perf_counter()
+            results = score_all(model_inputs(shared, values))
+            elapsed = time.perf_counter() - start
+        metrics.increment("screening.run")
+
+        # Combined risk summary
+        scored = {disease: result for disease, result in results.items() if result["status"] == "Scored"}
+        if scored:
+            flagged = [DISEASE_NAMES[disease] for disease, result in scored.items() if result["prediction"] == 1]
+            highest = max(scored, key=lambda disease: scored[disease]["risk"])
+            if flagged:
+                st.error(f"🟥 Elevated risk: {', '.join(flagged)}. Please consult a doctor.")
+            else:
+                st.success("🟩 No elevated risk found in the models that could be scored.")
+            st.markdown(f"Highest predicted risk: **{DISEASE_NAMES[highest]}** ({scored[highest]['risk'] * 100:.1f}%)")
+        else:
+            st.warning("⚠️ No model could be scored. Complete all inputs for at least one disease.")
+
+        st.dataframe(
+            [
+                {
+                    "Disease": DISEASE_NAMES[disease],
+                    "Result": ("🟥 At Risk" if result["prediction"] == 1 else "🟩 Low Risk") if "prediction" in result else "—",
+                    "Risk (%)": round(result["risk"] * 100, 1) if "risk" in result else None,
+                    "Scoring Time (ms)": round(result["seconds"] * 1000, 1) if "seconds" in result else None,
+                    "Status": result["status"],
+                }
+                for disease, result in ((disease, results[disease]) for disease in DISEASE_NAMES)
+            ],
+            use_container_width=True, hide_index=True
+        )
+        st.caption(f"Total time {elapsed * 1000:.1f} ms; models are scored concurrently.")
@@ -0,0 +1,25 @@
+# Personal Code: DPS-TEST-032
+# Author: [Your Name]
+# Description: users.json import keeps accounts whose username is already taken instead of dropping them silently.
+
+import json
+import logging
+from account_store import AccountStore, hash_password
+
+
+def test_migration_reports_conflicting_accounts(tmp_path, caplog):
+    legacy = tmp_path / "users.json"
+    legacy.write_text("{}")
+    store = AccountStore(str(tmp_path / "users.db"), str(legacy))
+    store.create_user("alice", "new-password")
+    store.create_user("bob", "same-password")
+    store.connection().execute("DELETE FROM store_meta")
+
+    legacy.write_text(json.dumps({"alice": hash_password("old-password"), "bob": hash_password("same-password"), "carol": hash_password("pw")}))
+    with caplog.at_level(logging.WARNING, logger="account_store"):
+        assert store.migrate_json(str(legacy)) == 1
+
+    assert store.verify_login("carol", "pw") and store.verify_login("alice", "new-password")
+    conflicts = json.loads((tmp_path / "users.json.conflicts.json").read_text())
+    assert conflicts == {"alice": hash_password("old-password")}
+    assert "alice" in caplog.text and "bob" not in caplog.text
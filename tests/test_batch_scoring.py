@@ -0,0 +1,87 @@
+# Personal Code: DPS-TEST-039
+# Author: [Your Name]
+# Description: Chunked bulk scoring matches the page predictions, and bad input fails without leaving a partial output.
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import model_registry
+from batch_scoring import main, score_file
+from benchmarks.synthetic import build_artifacts, sample_rows
+from feature_schema import schema_for
+from Heart_Disease import predict_heart_disease
+from main import predict_diabetes
+from Parkinsons import predict_parkinsons
+
+PAGE_PREDICTIONS = {
+    "diabetes": lambda row, artifacts: predict_diabetes(row[None, :], artifacts)[:2],
+    "heart": lambda row, artifacts: predict_heart_disease(row[None, :], artifacts),
+    "parkinsons": lambda row, artifacts: predict_parkinsons(dict(zip(schema_for("parkinsons", artifacts).names, row)), artifacts),
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def artifacts(tmp_path_factory):
+    paths = build_artifacts(str(tmp_path_factory.mktemp("models")))
+    saved = dict(model_registry.DISEASE_ARTIFACTS)
+    model_registry.DISEASE_ARTIFACTS.update(paths)
+    yield paths
+    model_registry.DISEASE_ARTIFACTS.clear()
+    model_registry.DISEASE_ARTIFACTS.update(saved)
+
+
+def _write_input(path, disease, rows=25, seed=4):
+    columns = schema_for(disease, model_registry.load_disease_artifacts(disease)).names
+    frame = pd.DataFrame(sample_rows(disease, rows, seed=seed), columns=columns)
+    frame.insert(0, "patient_id", np.arange(rows))
+    frame.to_csv(path, index=False)
+    return frame
+
+
+@pytest.mark.parametrize("disease", sorted(PAGE_PREDICTIONS))
+def test_chunked_scores_match_page_predictions(tmp_path, disease):
+    frame = _write_input(tmp_path / "patients.csv", disease)
+    # Chunks that do not divide the row count, so the last one is short
+    rows = score_file(disease, str(tmp_path / "patients.csv"), str(tmp_path / "scores.csv"), chunksize=7)
+    assert rows == len(frame)
+
+    scored = pd.read_csv(tmp_path / "scores.csv")
+    assert scored["patient_id"].tolist() == frame["patient_id"].tolist()
+    artifacts = model_registry.load_disease_artifacts(disease)
+    columns = schema_for(disease, artifacts).names
+    for row, (_, result) in zip(frame[columns].to_numpy(dtype=np.float64), scored.iterrows()):
+        label, probabilities = PAGE_PREDICTIONS[disease](row, artifacts)
+        assert result["prediction"] == label
+        np.testing.assert_allclose([result["probability_no_disease"], result["probability_disease"]], probabilities[0], rtol=1e-9)
+
+
+def test_missing_column_is_reported_and_leaves_no_output(tmp_path):
+    frame = _write_input(tmp_path / "patients.csv", "diabetes")
+    frame.drop(columns=["Glucose", "BMI"]).to_csv(tmp_path / "patients.csv", index=False)
+    with pytest.raises(ValueError, match="missing required column.*Glucose, BMI"):
+        score_file("diabetes", str(tmp_path / "patients.csv"), str(tmp_path / "scores.csv"))
+    assert sorted(os.listdir(tmp_path)) == ["patients.csv"]
+
+
+def test_non_numeric_column_is_reported_and_keeps_the_previous_output(tmp_path):
+    frame = _write_input(tmp_path / "patients.csv", "heart", rows=30)
+    score_file("heart", str(tmp_path / "patients.csv"), str(tmp_path / "scores.csv"), chunksize=10)
+    before = (tmp_path / "scores.csv").read_bytes()
+
+    # Text in a later chunk: the earlier chunks are already written when it fails
+    frame["chol"] = frame["chol"].astype(object)
+    frame.loc[25, "chol"] = "high"
+    frame.to_csv(tmp_path / "patients.csv", index=False)
+    with pytest.raises(ValueError, match="must contain only numbers: chol"):
+        score_file("heart", str(tmp_path / "patients.csv"), str(tmp_path / "scores.csv"), chunksize=10)
+    assert (tmp_path / "scores.csv").read_bytes() == before
+    assert sorted(os.listdir(tmp_path)) == ["patients.csv", "scores.csv"]
+
+
+def test_command_line_reports_bad_input(tmp_path, capsys):
+    frame = _write_input(tmp_path / "patients.csv", "diabetes")
+    frame.drop(columns=["Age"]).to_csv(tmp_path / "patients.csv", index=False)
+    assert main(["diabetes", str(tmp_path / "patients.csv"), str(tmp_path / "scores.csv")]) == 1
+    assert "missing required column(s): Age" in capsys.readouterr().err
+    assert not (tmp_path / "scores.csv").exists()
@@ -0,0 +1,120 @@
+# Personal Code: DPS-TEST-034
+# Author: [Your Name]
+# Description: Drift reference statistics and alerts, per-process snapshots, and drift updates never holding up the next service batch.
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import joblib
+import numpy as np
+import pytest
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+import drift_monitor
+import inference_service
+import model_registry
+from benchmarks.synthetic import build_artifacts
+from model_bundle import load_bundle, write_bundle
+
+
+def _skewed(n=400, seed=0):
+    # Skewed enough that median/IQR differ clearly from mean/std
+    return np.random.default_rng(seed).lognormal(mean=1.0, sigma=0.8, size=(n, 3))
+
+
+def test_standard_scaler_gives_the_training_mean_and_std():
+    X = _skewed()
+    mean, std = drift_monitor.reference_stats({"scaler": StandardScaler().fit(X)})
+    np.testing.assert_allclose(mean, X.mean(axis=0))
+    np.testing.assert_allclose(std, X.std(axis=0))
+
+
+@pytest.mark.parametrize("scaler", [RobustScaler, MinMaxScaler])
+def test_other_scalers_need_saved_reference_statistics(scaler):
+    X = _skewed()
+    assert drift_monitor.reference_stats({"scaler": scaler().fit(X)}) is None
+    saved = {"mean": X.mean(axis=0), "std": X.std(axis=0, ddof=1)}
+    mean, std = drift_monitor.reference_stats({"scaler": scaler().fit(X), "reference_stats": saved})
+    np.testing.assert_allclose(mean, saved["mean"])
+    np.testing.assert_allclose(std, saved["std"])
+
+
+def test_saved_reference_statistics_reach_the_registry_and_bundles(tmp_path):
+    paths = build_artifacts(str(tmp_path))["heart"]
+    saved = {"mean": np.arange(13.0), "std": np.full(13, 2.0)}
+    joblib.dump(saved, model_registry.reference_stats_path(paths["model"]))
+    artifacts = model_registry.load_disease_artifacts("heart", paths)
+    np.testing.assert_array_equal(drift_monitor.reference_stats(artifacts)[0], saved["mean"])
+
+    write_bundle(str(tmp_path / "heart.dpsb"), "heart", artifacts)
+    mean, std = drift_monitor.reference_stats(load_bundle(str(tmp_path / "heart.dpsb")).artifacts)
+    np.testing.assert_array_equal(mean, saved["mean"])
+    np.testing.assert_array_equal(std, saved["std"])
+
+
+def test_drift_alert_counts_transitions_into_drift(monkeypatch, tmp_path):
+    alerts = []
+    monkeypatch.setattr(drift_monitor, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(drift_monitor.metrics, "increment", lambda name: alerts.append(name) if name.endswith("drift_alert") else None)
+    monitor = drift_monitor.FeatureMonitor("heart", ["a"], (np.zeros(1), np.ones(1)))
+    rng = np.random.default_rng(0)
+
+    monitor.update(rng.normal(5.0, 1.0, size=(40, 1)))
+    for _ in range(3):
+        drift_monitor._write_snapshot(monitor)
+    assert alerts == ["drift.heart.drift_alert"]
+
+    # Enough in-distribution traffic clears the drift; a later shift alerts again
+    monitor.update(rng.normal(0.0, 1.0, size=(20000, 1)))
+    drift_monitor._write_snapshot(monitor)
+    assert not monitor.report()["drifted_features"]
+    monitor.update(rng.normal(8.0, 1.0, size=(20000, 1)))
+    drift_monitor._write_snapshot(monitor)
+    drift_monitor._write_snapshot(monitor)
+    assert alerts == ["drift.heart.drift_alert"] * 2
+
+
+def test_sources_write_separate_snapshots(monkeypatch, tmp_path):
+    monkeypatch.delenv("DPS_DRIFT_SOURCE", raising=False)
+    monkeypatch.setattr(drift_monitor, "SNAPSHOT_SOURCE", "app")
+    paths = {drift_monitor.snapshot_path("heart", str(tmp_path))}
+    for source in ("service", "batch"):
+        drift_monitor.use_source(source)
+        paths.add(drift_monitor.snapshot_path("heart", str(tmp_path)))
+    assert paths == {str(tmp_path / name) for name in ("heart.json", "service-heart.json", "batch-heart.json")}
+
+
+def test_environment_overrides_source(monkeypatch):
+    monkeypatch.setenv("DPS_DRIFT_SOURCE", "app-2")
+    monkeypatch.setattr(drift_monitor, "SNAPSHOT_SOURCE", "app-2")
+    drift_monitor.use_source("service")
+    assert drift_monitor.snapshot_path("heart", "drift").endswith("app-2-heart.json")
+
+
+def test_batcher_does_not_wait_for_drift_statistics(monkeypatch):
+    release = threading.Event()
+    observed = []
+
+    def slow_observe(disease, artifacts, rows):
+        observed.append(len(rows))
+        release.wait(10)
+
+    monkeypatch.setattr(inference_service, "load_disease_artifacts", lambda disease: {})
+    monkeypatch.setattr(inference_service, "predict_batch", lambda artifacts, rows: (np.zeros(len(rows)), np.full((len(rows), 2), 0.5)))
+    monkeypatch.setattr(drift_monitor, "observe", slow_observe)
+
+    async def scenario():
+        batcher = inference_service.MicroBatcher("heart", executor, max_batch_size=1, max_wait_ms=0)
+        try:
+            await batcher.submit(np.zeros(3))
+            # The first batch's drift update is still running; the second request is answered anyway
+            await asyncio.wait_for(batcher.submit(np.ones(3)), 5)
+        finally:
+            batcher.close()
+
+    executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        asyncio.run(scenario())
+        assert not release.is_set() and observed
+    finally:
+        release.set()
+        executor.shutdown()
@@ -0,0 +1,61 @@
+# Personal Code: DPS-TEST-030
+# Author: [Your Name]
+# Description: Outbox worker keeps the SMTP connection on rejected messages and closes it when the connection breaks.
+
+import importlib
+import smtplib
+import pytest
+import email_outbox
+from account_store import AccountStore
+
+
+class FakeServer:
+    def __init__(self, error=None):
+        self.error = error
+        self.closed = False
+        self.sent = 0
+
+    def send_message(self, message):
+        if self.error is not None:
+            raise self.error
+        self.sent += 1
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def _worker(tmp_path, server):
+    worker = email_outbox.OutboxWorker(store=AccountStore(str(tmp_path / "users.db"), str(tmp_path / "users.json")), smtp_factory=lambda: server)
+    conn = worker.store.connection()
+    with conn:
+        email_outbox.enqueue(conn, "patient@example.com", "Welcome", "Hello")
+    return worker
+
+
+def test_no_default_credentials(monkeypatch):
+    for name in ("SMTP_USER", "SMTP_PASSWORD", "SMTP_SENDER"):
+        monkeypatch.delenv(name, raising=False)
+    module = importlib.reload(email_outbox)
+    try:
+        assert module.SMTP_USER == "" and module.SMTP_PASSWORD == ""
+    finally:
+        monkeypatch.undo()
+        importlib.reload(email_outbox)
+
+
+def test_rejected_message_keeps_connection(tmp_path):
+    server = FakeServer(smtplib.SMTPRecipientsRefused({"patient@example.com": (550, b"no such user")}))
+    worker = _worker(tmp_path, server)
+    assert worker.drain_once() == 1
+    assert worker.server is server and not server.closed
+
+
+@pytest.mark.parametrize("error", [smtplib.SMTPServerDisconnected("gone"), ConnectionResetError("reset"), TimeoutError("timed out")])
+def test_broken_connection_is_closed_and_dropped(tmp_path, error):
+    server = FakeServer(error)
+    worker = _worker(tmp_path, server)
+    assert worker.drain_once() == 1
+    assert worker.server is None and server.closed
@@ -0,0 +1,159 @@
+# Personal Code: DPS-TEST-029
+# Author: [Your Name]
+# Description: Parity of the compiled NumPy pipeline with the original sklearn objects, for single rows and batches.
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import MaxAbsScaler, MinMaxScaler, RobustScaler, StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+import fast_pipeline
+from fast_pipeline import _reference_proba, compile_pipeline
+
+SCALERS = {
+    "standard": lambda: StandardScaler(),
+    "standard_no_mean": lambda: StandardScaler(with_mean=False),
+    "standard_no_std": lambda: StandardScaler(with_std=False),
+    "robust": lambda: RobustScaler(),
+    "robust_no_centering": lambda: RobustScaler(with_centering=False),
+    "minmax": lambda: MinMaxScaler(),
+    "maxabs": lambda: MaxAbsScaler(),
+}
+MODELS = {
+    "logistic": lambda: LogisticRegression(max_iter=500),
+    "tree": lambda: DecisionTreeClassifier(max_depth=5, random_state=0),
+    "forest": lambda: RandomForestClassifier(n_estimators=20, random_state=0),
+    "boosting": lambda: GradientBoostingClassifier(n_estimators=20, random_state=0),
+    "knn": lambda: KNeighborsClassifier(n_neighbors=5),
+    "svc": lambda: SVC(probability=True, random_state=0),
+}
+
+
+def _data(rows=200, features=6, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(loc=np.arange(1, features + 1) * 10, scale=np.arange(1, features + 1), size=(rows, features))
+    y = (X[:, 0] - 10 + rng.normal(scale=1.0, size=rows) > 0).astype(int)
+    return X, y
+
+
+def _fit(scaler_name, model_name, imputer=False):
+    X, y = _data()
+    artifacts = {}
+    if imputer:
+        X = X.copy()
+        X[np.random.default_rng(1).random(X.shape) < 0.05] = np.nan
+        artifacts["imputer"] = SimpleImputer(strategy="mean").fit(X)
+        X = artifacts["imputer"].transform(X)
+    artifacts["scaler"] = SCALERS[scaler_name]().fit(X)
+    artifacts["model"] = MODELS[model_name]().fit(artifacts["scaler"].transform(X), y)
+    return artifacts
+
+
+def _rows(n, imputer=False, seed=2):
+    X, _ = _data(rows=n, seed=seed)
+    if imputer:
+        X[np.random.default_rng(seed).random(X.shape) < 0.1] = np.nan
+    return X
+
+
+@pytest.mark.parametrize("imputer", [False, True])
+@pytest.mark.parametrize("model_name", sorted(MODELS))
+@pytest.mark.parametrize("scaler_name", sorted(SCALERS))
+def test_single_row_and_batch_match_sklearn(scaler_name, model_name, imputer):
+    artifacts = _fit(scaler_name, model_name, imputer)
+    pipeline = compile_pipeline(artifacts)
+    batch = _rows(64, imputer)
+    for X in (batch[:1], batch):
+        np.testing.assert_allclose(pipeline.predict_proba(X), _reference_proba(artifacts, X), rtol=0, atol=1e-9)
+        labels, _ = pipeline.predict(X)
+        np.testing.assert_array_equal(labels, artifacts["model"].classes_[_reference_proba(artifacts, X).argmax(axis=1)])
+
+
+@pytest.mark.parametrize("scaler_name", sorted(set(SCALERS) - {"maxabs"}))
+def test_preprocess_matches_sklearn(scaler_name):
+    artifacts = _fit(scaler_name, "logistic", imputer=True)
+    X = _rows(16, imputer=True)
+    pipeline = compile_pipeline(artifacts)
+    np.testing.assert_allclose(pipeline.preprocess(X), artifacts["scaler"].transform(artifacts["imputer"].transform(X)), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("scaler_name", sorted(SCALERS))
+def test_reference_kind_preprocesses_like_sklearn(scaler_name):
+    artifacts = _fit(scaler_name, "logistic", imputer=True)
+    pipeline = fast_pipeline.FusedPipeline("reference", artifacts["model"].classes_, {"n_features": 6}, artifacts=artifacts)
+    X = _rows(16, imputer=True)
+    Z = pipeline.preprocess(X)
+    np.testing.assert_allclose(Z, artifacts["scaler"].transform(artifacts["imputer"].transform(X)), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(pipeline.model_proba(Z), pipeline.predict_proba(X), rtol=0, atol=1e-12)
+    np.testing.assert_allclose(pipeline.inverse_preprocess(Z), artifacts["imputer"].transform(X), rtol=0, atol=1e-9)
+
+
+def test_knn_neighbours_on_reference_kind_use_scaled_inputs():
+    # MaxAbsScaler has no NumPy kernel, so the diabetes page's neighbour search runs on the reference kind
+    from knn_index import NeighbourIndex
+    from main import predict_diabetes
+    artifacts = _fit("maxabs", "knn")
+    artifacts["neighbour_index"] = NeighbourIndex.build(artifacts["model"])
+    X = _rows(8)
+    for row in X:
+        label, probabilities, _ = predict_diabetes(row[None, :], artifacts)
+        expected = artifacts["model"].predict_proba(artifacts["scaler"].transform(row[None, :]))
+        np.testing.assert_allclose(probabilities, expected, rtol=0, atol=1e-12)
+
+
+def test_knn_index_that_fails_parity_only_lists_neighbours():
+    # An index disagreeing with the model is rejected by the parity check; the page must not vote with it
+    from knn_index import NeighbourIndex
+    from main import predict_diabetes
+    artifacts = _fit("standard", "knn")
+    index = NeighbourIndex.build(artifacts["model"])
+    index.labels = 1 - index.labels
+    artifacts["neighbour_index"] = index
+    assert fast_pipeline.get_pipeline(artifacts).model is not index
+    for row in _rows(8):
+        label, probabilities, nearest = predict_diabetes(row[None, :], artifacts)
+        expected = artifacts["model"].predict_proba(artifacts["scaler"].transform(row[None, :]))
+        np.testing.assert_allclose(probabilities, expected, rtol=0, atol=1e-12)
+        assert nearest is not None and len(nearest[1]) == index.n_neighbors
+
+
+def test_standard_scaler_without_mean_is_not_centred():
+    pipeline = compile_pipeline(_fit("standard_no_mean", "logistic"))
+    assert pipeline.kind == "linear"
+    assert "center" not in pipeline.arrays
+
+
+def test_unsupported_scaler_runs_reference():
+    assert compile_pipeline(_fit("maxabs", "forest")).kind == "reference"
+
+
+def test_failed_parity_falls_back_to_reference(monkeypatch):
+    artifacts = _fit("standard", "logistic")
+    compiled = fast_pipeline._model_arrays
+
+    def wrong_coefficients(model, n_features):
+        kind, arrays = compiled(model, n_features)
+        return kind, {**arrays, "coef": arrays["coef"] * 2}
+
+    monkeypatch.setattr(fast_pipeline, "_model_arrays", wrong_coefficients)
+    pipeline = compile_pipeline(artifacts)
+    assert pipeline.kind == "reference"
+    X = _rows(8)
+    np.testing.assert_allclose(pipeline.predict_proba(X), _reference_proba(artifacts, X), rtol=0, atol=1e-12)
+
+
+def test_sklearn_kind_is_parity_checked(monkeypatch):
+    # The KNN model has no NumPy kernel; broken preprocessing in front of it must still be caught
+    artifacts = _fit("standard", "knn")
+    preprocessing = fast_pipeline._preprocessing_arrays
+
+    def off_centre(imputer, scaler, n_features):
+        arrays = preprocessing(imputer, scaler, n_features)
+        return {**arrays, "center": arrays["center"] + 5.0}
+
+    monkeypatch.setattr(fast_pipeline, "_preprocessing_arrays", off_centre)
+    assert compile_pipeline(artifacts).kind == "reference"
@@ -0,0 +1,123 @@
+# Personal Code: DPS-TEST-035
+# Author: [Your Name]
+# Description: Inference service request validation, micro-batching and isolation of a failing request from its batch.
+
+import asyncio
+import json
+import numpy as np
+import pytest
+import inference_service
+import model_registry
+from benchmarks.synthetic import build_artifacts, sample_rows
+from inference_service import InferenceService, RequestError, parse_features
+from scoring import feature_columns
+
+NAMES = ["a", "b", "c"]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def artifacts(tmp_path_factory):
+    paths = build_artifacts(str(tmp_path_factory.mktemp("models")))
+    saved = dict(model_registry.DISEASE_ARTIFACTS)
+    model_registry.DISEASE_ARTIFACTS.update(paths)
+    yield paths
+    model_registry.DISEASE_ARTIFACTS.clear()
+    model_registry.DISEASE_ARTIFACTS.update(saved)
+
+
+async def _post(service, path, payload):
+    # Minimal ASGI client: one request, returns (status, decoded JSON body)
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await service({"type": "http", "path": path, "method": "POST"}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def _diabetes_payload(seed):
+    columns = feature_columns("diabetes", model_registry.load_disease_artifacts("diabetes"))
+    return {"features": dict(zip(columns, (float(value) for value in sample_rows("diabetes", 1, seed=seed)[0])))}
+
+
+def _serve(*payloads, max_wait_ms=50):
+    async def scenario():
+        service = InferenceService(max_wait_ms=max_wait_ms, workers=4)
+        try:
+            return await asyncio.gather(*(_post(service, "/predict/diabetes", payload) for payload in payloads))
+        finally:
+            for batcher in service.batchers.values():
+                batcher.close()
+            service.executor.shutdown(wait=False)
+    return asyncio.run(scenario())
+
+
+def test_parse_features_accepts_objects_and_lists():
+    np.testing.assert_array_equal(parse_features({"features": {"c": 3, "a": 1, "b": 2}}, NAMES), [1, 2, 3])
+    np.testing.assert_array_equal(parse_features({"features": [1, 2, 3]}, NAMES), [1, 2, 3])
+
+
+@pytest.mark.parametrize("payload", [
+    None,
+    {"features": {"a": 1, "b": 2}},
+    {"features": [1, 2]},
+    {"features": [[1, 2, 3], [4, 5, 6], [7, 8, 9]]},
+    {"features": [1, "two", 3]},
+    {"features": [1, None, 3]},
+    {"features": [1, float("nan"), 3]},
+    {"features": [1, float("inf"), 3]},
+])
+def test_parse_features_rejects_bad_payloads(payload):
+    with pytest.raises(RequestError):
+        parse_features(payload, NAMES)
+
+
+def test_missing_values_allowed_only_with_an_imputer():
+    assert np.isnan(parse_features({"features": [1, None, 3]}, NAMES, allow_missing=True)[1])
+    with pytest.raises(RequestError):
+        parse_features({"features": [1, float("inf"), 3]}, NAMES, allow_missing=True)
+
+
+def test_invalid_request_is_a_client_error():
+    (status, body), = _serve({"features": {**_diabetes_payload(0)["features"], "Glucose": None}})
+    assert status == 400 and "Glucose" in body["error"]
+    (status, _), = _serve(b"{not json")
+    assert status == 400
+
+
+def test_concurrent_requests_share_one_batch(monkeypatch):
+    calls = []
+    predict_batch = inference_service.predict_batch
+    monkeypatch.setattr(inference_service, "predict_batch", lambda artifacts, rows: calls.append(len(rows)) or predict_batch(artifacts, rows))
+    payloads = [_diabetes_payload(seed) for seed in range(5)]
+    responses = _serve(*payloads)
+    assert [status for status, _ in responses] == [200] * 5
+    assert calls == [5]
+    # Batched answers match scoring each request alone
+    artifacts = model_registry.load_disease_artifacts("diabetes")
+    columns = feature_columns("diabetes", artifacts)
+    for payload, (_, body) in zip(payloads, responses):
+        labels, probabilities = predict_batch(artifacts, np.array([[payload["features"][name] for name in columns]]))
+        assert body["prediction"] == int(labels[0])
+        assert body["probabilities"]["disease"] == pytest.approx(float(probabilities[0][1]))
+
+
+def test_failing_row_does_not_fail_its_batch(monkeypatch):
+    predict_batch = inference_service.predict_batch
+
+    def fragile(artifacts, rows):
+        if (rows < 0).any():
+            raise ValueError("negative input")
+        return predict_batch(artifacts, rows)
+
+    monkeypatch.setattr(inference_service, "predict_batch", fragile)
+    payloads = [_diabetes_payload(seed) for seed in range(5)]
+    payloads[2]["features"]["Glucose"] = -1.0
+    statuses = [status for status, _ in _serve(*payloads)]
+    assert statuses == [200, 200, 500, 200, 200]
@@ -0,0 +1,78 @@
+# Personal Code: DPS-TEST-036
+# Author: [Your Name]
+# Description: Saved neighbour indexes keep the kind and leaf size they were built with and are swapped in atomically.
+
+import os
+import joblib
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+import knn_index
+from knn_index import NeighbourIndex, get_index, index_dir
+
+
+@pytest.fixture
+def model_path(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 4))
+    model = KNeighborsClassifier(n_neighbors=5).fit(X, (X[:, 0] > 0).astype(int))
+    path = str(tmp_path / "knn.pkl")
+    joblib.dump(model, path)
+    knn_index.clear()
+    yield path
+    knn_index.clear()
+
+
+def _version_dirs(path):
+    parent = os.path.dirname(index_dir(path))
+    return [name for name in os.listdir(parent) if name.startswith(".knn.index-")]
+
+
+def test_cli_kind_and_leaf_size_survive_loading(model_path):
+    assert knn_index.main([model_path, "--kind", "ball_tree", "--leaf-size", "10"]) == 0
+    version = NeighbourIndex.load(index_dir(model_path)).model_version
+    # As the model registry calls it, with DPS_KNN_INDEX unset
+    index = get_index(model_path, joblib.load(model_path), version)
+    assert (index.kind, index.leaf_size) == ("ball_tree", 10)
+
+
+def test_rebuild_for_new_model_keeps_kind_and_leaf_size(model_path):
+    knn_index.main([model_path, "--kind", "ball_tree", "--leaf-size", "10"])
+    index = get_index(model_path, joblib.load(model_path), "retrained", kind=None)
+    assert (index.kind, index.leaf_size, index.model_version) == ("ball_tree", 10, "retrained")
+    assert NeighbourIndex.load(index_dir(model_path)).model_version == "retrained"
+
+
+def test_explicit_kind_forces_a_rebuild(model_path):
+    knn_index.main([model_path, "--kind", "ball_tree", "--leaf-size", "10"])
+    version = NeighbourIndex.load(index_dir(model_path)).model_version
+    index = get_index(model_path, joblib.load(model_path), version, kind="brute")
+    assert index.kind == "brute" and index.tree is None
+    assert index.leaf_size == 10
+
+
+def test_save_switches_a_link_and_removes_the_old_version(model_path):
+    model = joblib.load(model_path)
+    directory = index_dir(model_path)
+    NeighbourIndex.build(model, "kd_tree").save(directory, "v1")
+    first = os.path.realpath(directory)
+    NeighbourIndex.build(model, "brute").save(directory, "v2")
+    assert os.path.islink(directory) and os.path.realpath(directory) != first
+    assert not os.path.exists(first) and len(_version_dirs(model_path)) == 1
+    loaded = NeighbourIndex.load(directory)
+    assert (loaded.kind, loaded.model_version) == ("brute", "v2")
+    queries = np.random.default_rng(1).normal(size=(10, 4))
+    np.testing.assert_allclose(loaded.predict_proba(queries), model.predict_proba(queries), rtol=0, atol=1e-12)
+
+
+def test_save_replaces_a_plain_directory_from_an_older_version(model_path):
+    model = joblib.load(model_path)
+    directory = index_dir(model_path)
+    NeighbourIndex.build(model, "kd_tree").save(directory, "v1")
+    # Lay the index out as an older save did: a plain directory at the index path
+    target = os.path.realpath(directory)
+    os.remove(directory)
+    os.replace(target, directory)
+    NeighbourIndex.build(model, "ball_tree").save(directory, "v2")
+    assert os.path.islink(directory) and len(_version_dirs(model_path)) == 1
+    assert NeighbourIndex.load(directory).kind == "ball_tree"
@@ -0,0 +1,89 @@
+# Personal Code: DPS-TEST-043
+# Author: [Your Name]
+# Description: Prometheus text exposition of the stage histograms and event counters, and the scrape endpoint.
+
+import re
+import socket
+import urllib.error
+import urllib.request
+import pytest
+import metrics
+
+SAMPLE = re.compile(r'^(\w+)\{(\w+)="((?:[^"\\]|\\.)*)"(?:,le="([^"]+)")?\} (\S+)$')
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_counters", {})
+
+
+def _samples(text):
+    samples = []
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        samples.append(match.groups())
+    return samples
+
+
+def test_disabled_metrics_record_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    monkeypatch.setattr(metrics, "_histograms", {})
+    monkeypatch.setattr(metrics, "_counters", {})
+    with metrics.span("heart.predict"):
+        pass
+    metrics.increment("heart.prediction")
+    assert metrics.summary() == [] and metrics.counters() == {}
+    assert metrics.start_http_server(port=9105) is None
+
+
+def test_histograms_are_cumulative_with_sum_and_count(enabled):
+    for seconds in (0.0002, 0.003, 0.003, 0.2, 30.0):
+        metrics.observe("heart.predict", seconds)
+    text = metrics.render_prometheus()
+    assert text.endswith("\n")
+    assert "# TYPE dps_stage_seconds histogram" in text and "# TYPE dps_events_total counter" in text
+
+    buckets = [(le, float(value)) for name, _, stage, le, value in _samples(text) if name == "dps_stage_seconds_bucket"]
+    assert [le for le, _ in buckets] == [str(bound) for bound in metrics.BUCKETS] + ["+Inf"]
+    counts = [value for _, value in buckets]
+    assert counts == sorted(counts)
+    assert dict(buckets)["0.0005"] == 1 and dict(buckets)["0.005"] == 3 and dict(buckets)["0.25"] == 4 and dict(buckets)["+Inf"] == 5
+    values = {name: float(value) for name, _, _, le, value in _samples(text) if le is None}
+    assert values["dps_stage_seconds_count"] == 5
+    assert values["dps_stage_seconds_sum"] == pytest.approx(30.2062)
+
+
+def test_counters_and_label_escaping(enabled):
+    metrics.increment("history.rows", 40)
+    metrics.increment("history.rows", 2)
+    with metrics.span('odd "stage"\nname'):
+        pass
+    samples = _samples(metrics.render_prometheus())
+    assert ("dps_events_total", "event", "history.rows", None, "42") in samples
+    assert {stage for _, label, stage, _, _ in samples if label == "stage"} == {'odd \\"stage\\"\\nname'}
+    assert metrics.summary()[0]["count"] == 1
+
+
+def test_scrape_endpoint(enabled, monkeypatch):
+    monkeypatch.setattr(metrics, "_http_server", None)
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    metrics.increment("diabetes.prediction")
+    server = metrics.start_http_server(port=port)
+    try:
+        assert metrics.start_http_server(port=port) is server
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=10) as response:
+            assert response.headers["Content-Type"] == "text/plain; version=0.0.4"
+            assert 'dps_events_total{event="diabetes.prediction"} 1' in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=10)
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,115 @@
+# Personal Code: DPS-TEST-040
+# Author: [Your Name]
+# Description: Model bundles round-trip every pipeline kind, reject corrupt files and hot-reload safely.
+
+import os
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.preprocessing import MaxAbsScaler, StandardScaler
+from sklearn.svm import SVC
+import model_bundle
+import model_registry
+from benchmarks.synthetic import build_artifacts, sample_rows
+from fast_pipeline import _reference_proba, compile_pipeline
+from knn_index import NeighbourIndex
+from model_bundle import BundleError, bundle_path, load_bundle, write_bundle
+
+# (scaler, model, kind the bundle must keep)
+KINDS = {
+    "linear": (StandardScaler, lambda: LogisticRegression(max_iter=500), "linear"),
+    "trees": (StandardScaler, lambda: RandomForestClassifier(n_estimators=20, random_state=0), "trees"),
+    "knn": (StandardScaler, lambda: KNeighborsClassifier(n_neighbors=5), "sklearn"),
+    "svc": (StandardScaler, lambda: SVC(probability=True, random_state=0), "sklearn"),
+    "reference": (MaxAbsScaler, lambda: RandomForestClassifier(n_estimators=20, random_state=0), "reference"),
+}
+
+
+def _fit(name):
+    scaler_class, model_factory, _ = KINDS[name]
+    X = sample_rows("diabetes", 200, seed=0)
+    y = (X[:, 1] > np.median(X[:, 1])).astype(int)
+    artifacts = {"scaler": scaler_class().fit(X)}
+    artifacts["model"] = model_factory().fit(artifacts["scaler"].transform(X), y)
+    if name == "knn":
+        artifacts["neighbour_index"] = NeighbourIndex.build(artifacts["model"])
+    return artifacts
+
+
+@pytest.fixture
+def bundles(tmp_path, monkeypatch):
+    # Fresh bundle state in its own directory, without the background watcher
+    monkeypatch.setattr(model_bundle, "BUNDLE_DIR", str(tmp_path))
+    monkeypatch.setattr(model_bundle, "POLL_INTERVAL", 0)
+    monkeypatch.setattr(model_bundle, "_bundles", {})
+    monkeypatch.setattr(model_bundle, "_signatures", {})
+    return tmp_path
+
+
+@pytest.mark.parametrize("name", sorted(KINDS))
+def test_round_trip_matches_the_original_predictions(tmp_path, name):
+    artifacts = _fit(name)
+    manifest = write_bundle(str(tmp_path / "diabetes.dpsb"), "diabetes", artifacts, version="v1")
+    bundle = load_bundle(str(tmp_path / "diabetes.dpsb"))
+
+    assert manifest["kind"] == bundle.pipeline.kind == KINDS[name][2]
+    assert bundle.version == "v1"
+    assert ("neighbour_index" in bundle.artifacts) == (name == "knn")
+    X = sample_rows("diabetes", 40, seed=7)
+    labels, probabilities = bundle.pipeline.predict(X)
+    expected_labels, expected = compile_pipeline(artifacts).predict(X)
+    np.testing.assert_array_equal(labels, expected_labels)
+    np.testing.assert_allclose(probabilities, expected, rtol=0, atol=1e-12)
+    np.testing.assert_allclose(probabilities, _reference_proba(artifacts, X), rtol=0, atol=1e-9)
+
+
+def test_corrupt_bundle_fails_its_checksum(tmp_path):
+    path = str(tmp_path / "diabetes.dpsb")
+    write_bundle(path, "diabetes", _fit("linear"))
+    with open(path, "r+b") as f:
+        f.seek(-1, os.SEEK_END)
+        last = f.read(1)
+        f.seek(-1, os.SEEK_END)
+        f.write(bytes([last[0] ^ 0xFF]))
+    with pytest.raises(BundleError, match="checksum"):
+        load_bundle(path)
+
+
+def test_unreadable_replacement_keeps_the_previous_bundle(bundles):
+    path = bundle_path("diabetes")
+    write_bundle(path, "diabetes", _fit("linear"), version="v1")
+    assert model_bundle.get_bundle("diabetes").version == "v1"
+
+    with open(path, "wb") as f:
+        f.write(b"not a bundle")
+    model_bundle._refresh("diabetes")
+    assert model_bundle.get_bundle("diabetes").version == "v1"
+
+    # A good file is picked up on the next check
+    write_bundle(path, "diabetes", _fit("trees"), version="v2")
+    model_bundle._refresh("diabetes")
+    assert model_bundle.get_bundle("diabetes").version == "v2"
+
+
+def test_deleted_bundle_falls_back_to_the_pickles(bundles, tmp_path_factory):
+    paths = build_artifacts(str(tmp_path_factory.mktemp("models")))
+    saved = dict(model_registry.DISEASE_ARTIFACTS)
+    model_registry.DISEASE_ARTIFACTS.update(paths)
+    try:
+        pickled = model_registry.load_disease_artifacts("heart")
+        assert "bundle" not in pickled
+        write_bundle(bundle_path("heart"), "heart", pickled, version="bundled")
+        model_bundle._refresh("heart")
+        assert model_registry.load_disease_artifacts("heart")["bundle"].version == "bundled"
+        assert model_registry.model_version("heart") == "bundled"
+
+        os.remove(bundle_path("heart"))
+        model_bundle._refresh("heart")
+        artifacts = model_registry.load_disease_artifacts("heart")
+        assert "bundle" not in artifacts and artifacts["model"] is pickled["model"]
+        assert model_registry.model_version("heart") == model_registry.get_artifact_version(paths["heart"]["model"])[:12]
+    finally:
+        model_registry.DISEASE_ARTIFACTS.clear()
+        model_registry.DISEASE_ARTIFACTS.update(saved)
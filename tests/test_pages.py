@@ -0,0 +1,80 @@
+# Personal Code: DPS-TEST-038
+# Author: [Your Name]
+# Description: Disease-page fragments score and redraw with the artifacts loaded for that run, including after a model reload.
+
+import pytest
+from streamlit.testing.v1 import AppTest
+import fragments
+import model_registry
+from benchmarks.synthetic import build_artifacts, sample_rows
+from fast_pipeline import get_pipeline
+from feature_schema import schema_for
+
+
+@pytest.fixture
+def registry(tmp_path):
+    saved = dict(model_registry.DISEASE_ARTIFACTS)
+    models = {seed: build_artifacts(str(tmp_path / f"models-{seed}"), seed=seed) for seed in (0, 1)}
+    model_registry.DISEASE_ARTIFACTS.update(models[0])
+    yield models
+    model_registry.DISEASE_ARTIFACTS.clear()
+    model_registry.DISEASE_ARTIFACTS.update(saved)
+
+
+def _heart_fragment():
+    # The fragment on its own, as a fragment-only rerun executes it
+    from Heart_Disease import show_heart_disease_prediction
+    show_heart_disease_prediction()
+
+
+def _submit(app, row):
+    for feature, value in zip(schema_for("heart").features, row):
+        widget = app.selectbox(key=f"heart_{feature.name}") if feature.options is not None else app.number_input(key=f"heart_{feature.name}")
+        widget.set_value(int(value) if feature.options is not None else feature.cast(min(max(float(value), feature.min_value or 0.0), feature.max_value or float(value))))
+    next(button for button in app.button if button.label == "🔍 Predict").click()
+    app.run()
+
+
+def _cached_pipelines():
+    return {key[1] for key in fragments._results if key[0] == "heart"}
+
+
+def test_fragment_rerun_after_reload_uses_the_new_model(registry):
+    app = AppTest.from_function(_heart_fragment, default_timeout=60)
+    app.run()
+    _submit(app, sample_rows("heart", 1, seed=5)[0])
+    assert not app.exception
+    old = get_pipeline(model_registry.load_disease_artifacts("heart"))
+    assert id(old) in _cached_pipelines()
+
+    # Hot reload: the registry now serves another model; redrawing the result must score and key it with that one
+    model_registry.DISEASE_ARTIFACTS.update(registry[1])
+    app.run()
+    assert not app.exception
+    new = get_pipeline(model_registry.load_disease_artifacts("heart"))
+    assert new is not old and id(new) in _cached_pipelines()
+
+
+def _diabetes_fragment():
+    from main import show_diabetes_prediction
+    show_diabetes_prediction()
+
+
+def test_invalid_submission_clears_the_what_if_panel(registry, monkeypatch):
+    app = AppTest.from_function(_diabetes_fragment, default_timeout=60)
+    app.run()
+    features = schema_for("diabetes").features
+    for feature, value in zip(features, sample_rows("diabetes", 1, seed=5)[0]):
+        app.number_input(key=f"diabetes_{feature.name}").set_value(feature.cast(max(float(value), feature.min_value or 0.0)))
+    next(button for button in app.button if button.label == "🔍 Predict").click()
+    app.run()
+    assert not app.exception
+    assert len(app.multiselect) == 1
+
+    # A submission that fails validation: no result, and no what-if sweep around the previous input
+    import main
+    monkeypatch.setattr(main.DIABETES_SCHEMA, "validate", lambda values: ["Glucose is required."])
+    next(button for button in app.button if button.label == "🔍 Predict").click()
+    app.run()
+    assert not app.exception and len(app.error) == 1
+    assert len(app.multiselect) == 0
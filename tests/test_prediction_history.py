@@ -0,0 +1,110 @@
+# Personal Code: DPS-TEST-042
+# Author: [Your Name]
+# Description: Keyset pages of the prediction history, and queued records reaching disk at shutdown.
+
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+import pytest
+import prediction_history
+from prediction_history import PredictionHistory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _all_pages(history, username, disease=None, limit=7):
+    entries, cursor, pages = [], prediction_history.FIRST_PAGE, 0
+    while cursor is not None:
+        page, cursor = history.page(username, disease, after=cursor, limit=limit)
+        entries.extend(page)
+        pages += 1
+    return entries, pages
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    # Several rows share a timestamp, so the id must break ties between pages
+    clock = iter(range(1000))
+    monkeypatch.setattr(prediction_history, "time", SimpleNamespace(time=lambda: float(next(clock) // 3), monotonic=time.monotonic))
+    history = PredictionHistory(str(tmp_path / "history.db"), batch_size=8, flush_interval=60)
+    for i in range(30):
+        history.record("alice", ("diabetes", "heart", "parkinsons")[i % 3], {"row": i}, i % 2, [0.25, 0.75])
+    for i in range(5):
+        history.record("bob", "heart", {"row": i}, 0, [0.9, 0.1])
+    history.flush()
+    return history
+
+
+def test_pages_cover_every_row_newest_first(history):
+    entries, pages = _all_pages(history, "alice")
+    assert pages == 5
+    assert [entry["inputs"]["row"] for entry in entries] == list(range(29, -1, -1))
+    assert entries[0]["probability"] == 0.75 and entries[1]["probabilities"] == [0.25, 0.75]
+
+    heart, _ = _all_pages(history, "alice", "heart", limit=4)
+    assert [entry["inputs"]["row"] for entry in heart] == list(range(28, -1, -3))
+    assert {entry["disease"] for entry in heart} == {"heart"}
+    assert len(_all_pages(history, "bob")[0]) == 5
+    assert history.page("carol") == ([], None)
+
+
+def test_an_exact_last_page_has_no_cursor(history):
+    page, cursor = history.page("alice", "diabetes", limit=10)
+    assert len(page) == 10 and cursor is None
+
+
+@pytest.mark.parametrize("disease, index", [(None, "predictions_user_time"), ("heart", "predictions_user_disease_time")])
+def test_pages_are_read_through_the_user_indexes(history, disease, index):
+    query, params = (
+        (prediction_history._PAGE_USER, ("alice", 1e18, 0, 8)) if disease is None
+        else (prediction_history._PAGE_USER_DISEASE, ("alice", disease, 1e18, 0, 8))
+    )
+    plan = " ".join(str(row[-1]) for row in history.connection().execute("EXPLAIN QUERY PLAN " + query, params))
+    assert index in plan and "TEMP B-TREE" not in plan
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    history = PredictionHistory(str(tmp_path / "history.db"), max_queued=2)
+    assert history.record("alice", "heart", {}, 1)
+    assert history.record("alice", "heart", {}, 1)
+    assert not history.record("alice", "heart", {}, 1)
+    history.flush()
+    assert _count(str(tmp_path / "history.db")) == 2
+
+
+def test_flush_writes_a_partial_batch_without_waiting_for_the_interval(tmp_path):
+    history = PredictionHistory(str(tmp_path / "history.db"), batch_size=1000, flush_interval=60).start()
+    for i in range(50):
+        history.record("alice", "heart", {"row": i}, 0)
+    start = time.monotonic()
+    history.flush()
+    assert _count(str(tmp_path / "history.db")) == 50
+    assert time.monotonic() - start < 10
+    # The writer keeps going afterwards
+    history.record("alice", "heart", {"row": 50}, 0)
+    history.flush()
+    assert _count(str(tmp_path / "history.db")) == 51
+
+
+def test_queued_rows_are_written_at_interpreter_exit(tmp_path):
+    # The batch is neither full nor due when the process exits; the atexit flush must still write it
+    path = str(tmp_path / "history.db")
+    script = (
+        "from prediction_history import get_history\n"
+        "for i in range(40):\n"
+        "    get_history().record('alice', 'heart', {'row': i}, 1, [0.2, 0.8])\n"
+    )
+    env = dict(os.environ, DPS_HISTORY_DB=path, DPS_HISTORY_BATCH="1000", DPS_HISTORY_FLUSH_SECONDS="60")
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, check=True, timeout=60)
+    assert _count(path) == 40
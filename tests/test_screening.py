@@ -0,0 +1,82 @@
+# Personal Code: DPS-TEST-033
+# Author: [Your Name]
+# Description: The combined screening page scores complete models, skips the rest, and fans out per request.
+
+import threading
+import time
+import pytest
+from streamlit.testing.v1 import AppTest
+import model_registry
+import screening
+import scoring_executor
+from benchmarks.synthetic import build_artifacts, sample_rows
+from feature_schema import schema_for
+
+
+@pytest.fixture(scope="module", autouse=True)
+def artifacts(tmp_path_factory):
+    paths = build_artifacts(str(tmp_path_factory.mktemp("models")))
+    saved = dict(model_registry.DISEASE_ARTIFACTS)
+    model_registry.DISEASE_ARTIFACTS.update(paths)
+    yield paths
+    model_registry.DISEASE_ARTIFACTS.clear()
+    model_registry.DISEASE_ARTIFACTS.update(saved)
+
+
+def _page():
+    import screening
+    screening.show_screening_page()
+
+
+def test_page_scores_complete_models_and_skips_the_rest():
+    app = AppTest.from_function(_page, default_timeout=60)
+    app.run()
+    assert not app.exception
+
+    row = dict(zip([feature.name for feature in schema_for("diabetes").features], sample_rows("diabetes", 1, seed=3)[0]))
+    app.number_input(key="screening_age").set_value(int(row["Age"]))
+    app.number_input(key="screening_diastolic").set_value(float(row["BloodPressure"]))
+    for feature in schema_for("diabetes").features:
+        if feature.name not in ("Age", "BloodPressure"):
+            app.number_input(key=f"screening_diabetes_{feature.name}").set_value(feature.cast(max(float(row[feature.name]), feature.min_value or 0.0)))
+    next(button for button in app.button if button.label == "🩺 Run Screening").click()
+    app.run()
+
+    assert not app.exception
+    table = app.dataframe[0].value.set_index("Disease")
+    assert table.loc["Diabetes", "Status"] == "Scored"
+    assert table.loc["Heart Disease", "Status"].startswith("Skipped")
+    assert table.loc["Parkinson's Disease", "Status"].startswith("Skipped")
+
+
+def test_concurrent_requests_do_not_share_a_fanout_pool(monkeypatch):
+    # Six requests of three models each, every model blocking until all eighteen have started:
+    # a shared pool would stall with only a few of them running
+    started, release = [], threading.Event()
+    lock = threading.Lock()
+
+    def blocking(model_input):
+        with lock:
+            started.append(model_input)
+            if len(started) == 18:
+                release.set()
+        assert release.wait(10), "scoring was queued behind other requests"
+        return 0, [[0.5, 0.5]]
+
+    # Enough admission slots for every model; the test is about the fan-out, not admission control
+    monkeypatch.setattr(scoring_executor, "_executor", scoring_executor.ScoringExecutor("inline", max_pending=18))
+    jobs = {disease: (blocking, disease) for disease in screening.DISEASE_NAMES}
+    results = []
+
+    def request():
+        futures, fanout = screening._submit_all(jobs)
+        results.append([future.result(15)[0] for future in futures.values()])
+        fanout.shutdown(wait=False)
+
+    threads = [threading.Thread(target=request) for _ in range(6)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(20)
+    assert len(results) == 6 and time.perf_counter() - start < 10
@@ -0,0 +1,73 @@
+# Personal Code: DPS-TEST-041
+# Author: [Your Name]
+# Description: Training on a small synthetic CSV writes artifacts, bundle and report the pages can serve.
+
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+import model_bundle
+from benchmarks.synthetic import sample_rows
+from fast_pipeline import get_pipeline
+from feature_schema import SCHEMAS
+from model_registry import load_disease_artifacts_from_files, reference_stats_path
+from train import artifact_paths, file_sha256, main, train, write_artifacts
+
+
+def _write_csv(path, rows=150, seed=0):
+    X = sample_rows("diabetes", rows, seed=seed)
+    frame = pd.DataFrame(X, columns=SCHEMAS["diabetes"].names)
+    frame["Outcome"] = (X[:, 1] + X[:, 5] > np.median(X[:, 1] + X[:, 5])).astype(int)
+    frame.to_csv(path, index=False)
+    return frame
+
+
+def test_train_is_reproducible_and_artifacts_match_the_estimator(tmp_path):
+    frame = _write_csv(tmp_path / "diabetes.csv")
+    estimator, feature_names, report = train("diabetes", str(tmp_path / "diabetes.csv"), folds=3, n_jobs=1)
+    again = train("diabetes", str(tmp_path / "diabetes.csv"), folds=3, n_jobs=1)[2]
+    assert report["best_params"] == again["best_params"] and report["cv_roc_auc"] == again["cv_roc_auc"]
+    assert feature_names == SCHEMAS["diabetes"].names
+
+    paths = write_artifacts("diabetes", estimator, feature_names, artifact_paths("diabetes", str(tmp_path / "models")), report["reference"])
+    assert sorted(os.listdir(tmp_path / "models")) == ["knn_diabetes_model.pkl", "knn_diabetes_model.reference.pkl", "scaler.pkl"]
+    artifacts = load_disease_artifacts_from_files("diabetes", paths)
+    X = frame[feature_names].to_numpy(dtype=np.float64)
+    np.testing.assert_allclose(get_pipeline(artifacts).predict_proba(X), estimator.predict_proba(X), rtol=0, atol=1e-12)
+    reference = joblib.load(reference_stats_path(paths["model"]))
+    np.testing.assert_allclose(reference["mean"], report["reference"]["mean"])
+
+
+def test_command_line_writes_artifacts_bundle_and_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_bundle, "BUNDLE_DIR", str(tmp_path / "bundles"))
+    _write_csv(tmp_path / "diabetes.csv")
+    output = str(tmp_path / "models")
+    assert main(["diabetes", "--data", str(tmp_path / "diabetes.csv"), "--output-dir", output, "--folds", "3", "--n-jobs", "1", "--bundle"]) == 0
+
+    with open(os.path.join(output, "diabetes_training_report.json")) as f:
+        report = json.load(f)
+    assert report["data"]["rows"] == 150 and report["data"]["sha256"] == file_sha256(str(tmp_path / "diabetes.csv"))
+    assert report["model"] == "KNeighborsClassifier"
+    assert report["holdout"]["rows"] == 30 and 0.0 <= report["holdout"]["roc_auc"] <= 1.0
+    assert report["candidates"][0]["rank"] == 1 and report["candidates"][0]["params"] == report["best_params"]
+    assert len(report["candidates"]) == 32
+    assert len(report["reference"]["mean"]) == len(report["reference"]["std"]) == 8
+    assert report["artifacts"] == artifact_paths("diabetes", output)
+
+    bundle = model_bundle.load_bundle(report["bundle"]["path"])
+    assert bundle.version == report["bundle"]["version"]
+    X = sample_rows("diabetes", 20, seed=3)
+    artifacts = load_disease_artifacts_from_files("diabetes", report["artifacts"])
+    np.testing.assert_allclose(bundle.pipeline.predict_proba(X), get_pipeline(artifacts).predict_proba(X), rtol=0, atol=1e-12)
+    assert "reference_stats" in bundle.artifacts
+
+
+def test_missing_column_is_an_error(tmp_path, capsys):
+    _write_csv(tmp_path / "diabetes.csv").drop(columns=["BMI", "Outcome"]).to_csv(tmp_path / "diabetes.csv", index=False)
+    with pytest.raises(ValueError, match="missing column\\(s\\): BMI, Outcome"):
+        train("diabetes", str(tmp_path / "diabetes.csv"))
+    assert main(["diabetes", "--data", str(tmp_path / "diabetes.csv"), "--output-dir", str(tmp_path / "models")]) == 1
+    assert "BMI, Outcome" in capsys.readouterr().err
+    assert not os.path.exists(tmp_path / "models")
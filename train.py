@@ -0,0 +1,232 @@
+# Personal Code: DPS-TRAIN-024
+# Author: [Your Name]
+# Description: Reproducible training of the imputer -> scaler -> model pipeline for each disease; writes the artifacts the pages load.
+# Run with: python train.py heart --data heart.csv --output-dir models --bundle
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import accuracy_score, confusion_matrix, f1_score, precision_score, recall_score, roc_auc_score
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+import model_bundle
+from feature_schema import SCHEMAS
+from model_registry import DISEASE_ARTIFACTS, load_disease_artifacts_from_files, reference_stats_path
+
+DEFAULT_SEED = 42
+# Label column in the public datasets the models are trained on
+TARGET_COLUMNS = {"diabetes": "Outcome", "heart": "target", "parkinsons": "status"}
+
+
+def model_spec(disease, seed):
+    # Estimator and search grid per disease; same model families the pages already serve
+    if disease == "diabetes":
+        return KNeighborsClassifier(), {
+            "model__n_neighbors": [3, 5, 7, 9, 11, 15, 21, 25],
+            "model__weights": ["uniform", "distance"],
+            "model__p": [1, 2],
+        }
+    if disease == "heart":
+        # One core per forest: the search already uses every core
+        return RandomForestClassifier(random_state=seed, n_jobs=1), {
+            "model__n_estimators": [200, 400],
+            "model__max_depth": [None, 4, 8],
+            "model__min_samples_leaf": [1, 3, 5],
+        }
+    return SVC(probability=True, random_state=seed), {
+        "model__C": [0.1, 1, 10, 100],
+        "model__gamma": ["scale", 0.01, 0.1],
+    }
+
+
+def build_pipeline(disease, seed, memory=None):
+    # Only the heart page applies an imputer, so only the heart pipeline fits one
+    steps = []
+    if "imputer" in DISEASE_ARTIFACTS[disease]:
+        steps.append(("imputer", SimpleImputer(strategy="mean")))
+    steps.append(("scaler", StandardScaler()))
+    model, grid = model_spec(disease, seed)
+    steps.append(("model", model))
+    return Pipeline(steps, memory=memory), grid
+
+
+def load_dataset(disease, path, target=None):
+    target = target or TARGET_COLUMNS[disease]
+    frame = pd.read_csv(path)
+    columns = SCHEMAS[disease].names
+    missing = [column for column in columns + [target] if column not in frame.columns]
+    if missing:
+        raise ValueError(f"Training data is missing column(s): {', '.join(missing)}")
+    return frame[columns].to_numpy(dtype=np.float64), frame[target].to_numpy(dtype=int), columns
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def holdout_metrics(estimator, X, y):
+    probabilities = estimator.predict_proba(X)[:, 1]
+    predictions = estimator.predict(X)
+    return {
+        "rows": int(len(y)),
+        "accuracy": float(accuracy_score(y, predictions)),
+        "roc_auc": float(roc_auc_score(y, probabilities)),
+        "precision": float(precision_score(y, predictions, zero_division=0)),
+        "recall": float(recall_score(y, predictions, zero_division=0)),
+        "f1": float(f1_score(y, predictions, zero_division=0)),
+        "confusion_matrix": confusion_matrix(y, predictions).tolist(),
+    }
+
+
+def artifact_paths(disease, output_dir=None):
+    # Default: exactly where model_registry loads from; with output_dir, the same file names in that directory
+    paths = DISEASE_ARTIFACTS[disease]
+    if output_dir is None:
+        return dict(paths)
+    return {name: os.path.join(output_dir, os.path.basename(path)) for name, path in paths.items()}
+
+
+def _dump_atomic(value, path):
+    # The registry reloads on mtime/size change, so a file must never be seen half-written
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, staging = tempfile.mkstemp(prefix=".artifact-", dir=directory)
+    os.close(fd)
+    try:
+        joblib.dump(value, staging)
+        os.replace(staging, path)
+    except BaseException:
+        if os.path.exists(staging):
+            os.remove(staging)
+        raise
+
+
+def reference_stats(X):
+    # Per-feature training distribution that drift monitoring compares live inputs with; gaps are skipped
+    return {"mean": np.nanmean(X, axis=0), "std": np.nanstd(X, axis=0, ddof=1)}
+
+
+def write_artifacts(disease, estimator, feature_names, paths, reference=None):
+    steps = estimator.named_steps
+    values = {"model": steps["model"], "scaler": steps["scaler"]}
+    if "imputer" in paths:
+        values["imputer"] = steps["imputer"]
+    if "feature_names" in paths:
+        values["feature_names"] = list(feature_names)
+    for name, path in paths.items():
+        _dump_atomic(values[name], path)
+    if reference is not None:
+        _dump_atomic({"mean": np.asarray(reference["mean"], dtype=np.float64), "std": np.asarray(reference["std"], dtype=np.float64)}, reference_stats_path(paths["model"]))
+    return paths
+
+
+def train(disease, data_path, target=None, seed=DEFAULT_SEED, folds=5, test_size=0.2, n_jobs=-1, cache_dir=None):
+    X, y, feature_names = load_dataset(disease, data_path, target)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, stratify=y, random_state=seed)
+
+    # joblib.Memory caches each fitted imputer/scaler per fold, so model candidates that share
+    # a fold reuse it instead of refitting; search workers share the on-disk cache
+    with tempfile.TemporaryDirectory() as tmp:
+        memory = joblib.Memory(cache_dir or tmp, verbose=0)
+        pipeline, grid = build_pipeline(disease, seed, memory)
+        search = GridSearchCV(
+            pipeline, grid, scoring="roc_auc", n_jobs=n_jobs, refit=True,
+            cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed),
+        )
+        start = time.perf_counter()
+        search.fit(X_train, y_train)
+        search_seconds = time.perf_counter() - start
+        estimator = search.best_estimator_
+        # Detach the cache so the saved steps are plain fitted objects
+        estimator.memory = None
+
+    results = search.cv_results_
+    candidates = [
+        {
+            "params": {name.replace("model__", ""): value for name, value in params.items()},
+            "mean_roc_auc": float(mean),
+            "std_roc_auc": float(std),
+            "rank": int(rank),
+        }
+        for params, mean, std, rank in zip(results["params"], results["mean_test_score"], results["std_test_score"], results["rank_test_score"])
+    ]
+    report = {
+        "disease": disease,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "data": {"path": os.path.abspath(data_path), "sha256": file_sha256(data_path), "rows": int(len(y)), "positive_rate": float(y.mean())},
+        "seed": seed,
+        "folds": folds,
+        "test_size": test_size,
+        "model": type(estimator.named_steps["model"]).__name__,
+        "best_params": {name.replace("model__", ""): value for name, value in search.best_params_.items()},
+        "cv_roc_auc": float(search.best_score_),
+        "holdout": holdout_metrics(estimator, X_test, y_test),
+        "candidates": sorted(candidates, key=lambda candidate: candidate["rank"]),
+        "search_seconds": search_seconds,
+        "reference": {name: values.tolist() for name, values in reference_stats(X_train).items()},
+        "versions": {"python": platform.python_version(), "numpy": np.__version__, "sklearn": sklearn.__version__},
+    }
+    return estimator, feature_names, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the imputer/scaler/model pipeline for a disease and write the served artifacts.")
+    parser.add_argument("disease", choices=sorted(DISEASE_ARTIFACTS))
+    parser.add_argument("--data", required=True, help="Training CSV with the schema columns and a label column")
+    parser.add_argument("--target", help="Label column (default: Outcome / target / status)")
+    parser.add_argument("--output-dir", help="Write artifacts here instead of the paths in model_registry.DISEASE_ARTIFACTS")
+    parser.add_argument("--report", help="Metrics report path (default: <artifact dir>/<disease>_training_report.json)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Parallel search workers (-1: all cores)")
+    parser.add_argument("--cache-dir", help="Keep the fitted-transformer cache here between runs")
+    parser.add_argument("--bundle", action="store_true", help="Also write a model bundle to DPS_BUNDLE_DIR")
+    args = parser.parse_args(argv)
+
+    try:
+        estimator, feature_names, report = train(
+            args.disease, args.data, args.target, args.seed, args.folds, args.test_size, args.n_jobs, args.cache_dir
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    paths = write_artifacts(args.disease, estimator, feature_names, artifact_paths(args.disease, args.output_dir), report["reference"])
+    report["artifacts"] = paths
+    if args.bundle:
+        output = model_bundle.bundle_path(args.disease)
+        manifest = model_bundle.write_bundle(output, args.disease, load_disease_artifacts_from_files(args.disease, paths))
+        report["bundle"] = {"path": output, "version": manifest["version"]}
+
+    report_path = args.report or os.path.join(os.path.dirname(os.path.abspath(paths["model"])), f"{args.disease}_training_report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    holdout = report["holdout"]
+    print(
+        f"{args.disease}: {report['model']} {report['best_params']} cv ROC AUC {report['cv_roc_auc']:.3f}, "
+        f"holdout ROC AUC {holdout['roc_auc']:.3f}, accuracy {holdout['accuracy']:.3f} -> {report_path}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
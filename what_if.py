@@ -0,0 +1,104 @@
+# Personal Code: DPS-CORE-023
+# Author: [Your Name]
+# Description: What-if sweeps over one or two inputs, scored as a single batch and cached per base input.
+
+import threading
+import numpy as np
+import metrics
+from fast_pipeline import get_pipeline
+from feature_schema import schema_for
+
+CURVE_STEPS = 60
+HEATMAP_STEPS = 25
+_CACHE_SIZE = 128
+
+# (pipeline id, base row, swept features, steps) -> (pipeline, grids, risk)
+_sweeps = {}
+_sweeps_lock = threading.Lock()
+
+
+def sweep(pipeline, schema, base_row, names, steps):
+    # Every combination of the swept values over a copy of the base row, scored in one call
+    grids = [schema.features[schema.positions[name]].sweep_values(steps) for name in names]
+    mesh = np.meshgrid(*grids, indexing="ij")
+    X = np.repeat(np.asarray(base_row, dtype=np.float64)[None, :], mesh[0].size, axis=0)
+    for name, values in zip(names, mesh):
+        X[:, schema.positions[name]] = values.ravel()
+    with metrics.span("what_if.sweep"):
+        risk = pipeline.predict_proba(X)[:, 1].reshape(mesh[0].shape)
+    return grids, risk
+
+
+def cached_sweep(disease, artifacts, base_row, names, steps):
+    # Widget changes rerun the page; unchanged (model, input, features) reuse the scored grid
+    pipeline = get_pipeline(artifacts)
+    key = (id(pipeline), tuple(float(value) for value in base_row), tuple(names), steps)
+    entry = _sweeps.get(key)
+    if entry is not None and entry[0] is pipeline:
+        metrics.increment("what_if.cache_hit")
+        return entry[1], entry[2]
+    grids, risk = sweep(pipeline, schema_for(disease, artifacts), base_row, names, steps)
+    with _sweeps_lock:
+        if len(_sweeps) >= _CACHE_SIZE:
+            _sweeps.pop(next(iter(_sweeps)))
+        _sweeps[key] = (pipeline, grids, risk)
+    return grids, risk
+
+
+def _display(feature, value):
+    if feature.options is not None:
+        return feature.options[int(value)]
+    return feature.cast(value) if feature.dtype == "int" else round(float(value), 3)
+
+
+def show_what_if(disease, artifacts):
+    import altair as alt
+    import pandas as pd
+    import streamlit as st
+    from fragments import last_submission
+    # Base input: the submission the result panel shows, so an invalid submission clears both
+    submitted = last_submission(disease)
+    if submitted is None:
+        return
+    base_row = submitted[0]
+    schema = schema_for(disease, artifacts)
+    features = {feature.label: feature for feature in schema.sweepable()}
+    with st.expander("🧪 What-If Analysis", expanded=True):
+        st.caption("Vary one or two values from your last prediction to see how the predicted risk changes.")
+        chosen = st.multiselect(
+            "Values to vary (one or two)", list(features), default=list(features)[:1], max_selections=2, key=f"{disease}_what_if_features"
+        )
+        if not chosen:
+            return
+        names = [features[label].name for label in chosen]
+
+        if len(chosen) == 1:
+            feature = features[chosen[0]]
+            (grid,), risk = cached_sweep(disease, artifacts, base_row, names, CURVE_STEPS)
+            curve = pd.DataFrame({feature.label: [_display(feature, value) for value in grid], "Risk (%)": risk * 100})
+            if feature.options is not None:
+                st.bar_chart(curve, x=feature.label, y="Risk (%)")
+            else:
+                st.line_chart(curve, x=feature.label, y="Risk (%)")
+            # Reading off a point only looks up the cached curve
+            position = st.select_slider(
+                feature.label, options=list(range(len(grid))), value=int(np.abs(grid - base_row[schema.positions[feature.name]]).argmin()),
+                format_func=lambda i: str(_display(feature, grid[i])), key=f"{disease}_what_if_point"
+            )
+            st.write(f"Predicted risk at **{_display(feature, grid[position])}**: **{risk[position] * 100:.1f}%**")
+        else:
+            first, second = features[chosen[0]], features[chosen[1]]
+            (x_grid, y_grid), risk = cached_sweep(disease, artifacts, base_row, names, HEATMAP_STEPS)
+            x_values, y_values = np.meshgrid(x_grid, y_grid, indexing="ij")
+            heatmap = pd.DataFrame({
+                first.label: [_display(first, value) for value in x_values.ravel()],
+                second.label: [_display(second, value) for value in y_values.ravel()],
+                "Risk (%)": risk.ravel() * 100,
+            })
+            chart = alt.Chart(heatmap).mark_rect().encode(
+                x=alt.X(f"{first.label}:O", sort=None),
+                y=alt.Y(f"{second.label}:O", sort="descending" if second.options is None else None),
+                color=alt.Color("Risk (%):Q", scale=alt.Scale(scheme="redyellowgreen", reverse=True, domain=[0, 100])),
+                tooltip=[first.label, second.label, alt.Tooltip("Risk (%):Q", format=".1f")],
+            )
+            st.altair_chart(chart, use_container_width=True)